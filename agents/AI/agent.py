@@ -6,6 +6,8 @@ Handles AI model integration, prompt engineering, and optimization
 from typing import Dict, List, Any, Optional
 import json
 
+from agents.result_cache import pure
+
 class AIExpertAgent:
     def __init__(self):
         self.name = "AI"
@@ -15,7 +17,9 @@ class AIExpertAgent:
             "openai": {"gpt4": "gpt-4", "gpt35": "gpt-3.5-turbo"},
             "anthropic": {"claude3": "claude-3-opus", "claude2": "claude-2.1"}
         }
+        self._chain_executor = None
     
+    @pure
     def create_prompt_template(self, purpose: str) -> str:
         """Generate optimized prompt templates"""
         templates = {
@@ -120,6 +124,7 @@ Provide reasoning for each assessment. Format as JSON.
         
         return templates.get(purpose, "")
     
+    @pure
     def create_prompt_chain(self, task: str) -> List[Dict]:
         """Create multi-step prompt chains for complex tasks"""
         chains = {
@@ -161,6 +166,17 @@ Provide reasoning for each assessment. Format as JSON.
         
         return chains.get(task, [])
     
+    def run_prompt_chain(self, task: str, inputs: Dict, call_fn, max_workers: int = 4) -> Dict:
+        """Execute a prompt chain; steps are memoized across runs with the same call_fn"""
+        from src.ai.chains import PromptChainExecutor
+        
+        if self._chain_executor is None or self._chain_executor.call_fn is not call_fn:
+            # The memo is keyed by prompt alone, so another model's outputs mustn't carry over
+            self._chain_executor = PromptChainExecutor(call_fn, max_workers=max_workers)
+        
+        return self._chain_executor.run(self.create_prompt_chain(task), inputs)
+    
+    @pure
     def create_model_config(self, use_case: str) -> Dict:
         """Generate optimal model configurations"""
         configs = {
@@ -283,72 +299,26 @@ def parse_structured_response(response: str, structure: Dict) -> Dict:
     
     def create_cost_optimizer(self) -> str:
         """Create cost optimization strategies"""
+        # The router is real code now (src/ai/router.py); this returns a usage example.
         return """
-class AIKostOptimizer:
-    def __init__(self):
-        self.model_costs = {
-            'gpt-4': 0.03,           # per 1K tokens
-            'gpt-3.5-turbo': 0.002,  # per 1K tokens
-            'gemini-pro': 0.001,     # per 1K tokens
-            'gemini-flash': 0.0001,  # per 1K tokens
-        }
-        
-        self.cache = {}  # Simple cache
-    
-    def select_model(self, task_complexity: str, speed_required: bool) -> str:
-        \"\"\"Select optimal model based on task\"\"\"
-        if task_complexity == 'simple' and speed_required:
-            return 'gemini-flash'
-        elif task_complexity == 'simple':
-            return 'gpt-3.5-turbo'
-        elif task_complexity == 'complex' and speed_required:
-            return 'gemini-pro'
-        else:
-            return 'gpt-4'
-    
-    def optimize_prompt(self, prompt: str) -> str:
-        \"\"\"Reduce prompt size while maintaining quality\"\"\"
-        # Remove redundant instructions
-        optimized = re.sub(r'\\s+', ' ', prompt)
-        
-        # Use abbreviations for common instructions
-        replacements = {
-            'Please provide': 'Provide',
-            'Make sure to': 'Must',
-            'It is important that': 'Important:',
-            'In your response': 'Response:',
-        }
-        
-        for old, new in replacements.items():
-            optimized = optimized.replace(old, new)
-        
-        return optimized.strip()
-    
-    def should_use_cache(self, prompt_hash: str) -> bool:
-        \"\"\"Check if we can use cached response\"\"\"
-        return prompt_hash in self.cache
-    
-    def batch_requests(self, prompts: List[str]) -> List[str]:
-        \"\"\"Batch multiple prompts for efficiency\"\"\"
-        # Group similar prompts
-        batches = []
-        current_batch = []
-        current_size = 0
-        
-        for prompt in prompts:
-            prompt_size = len(prompt.split())
-            if current_size + prompt_size > 2000:  # Token limit
-                batches.append(current_batch)
-                current_batch = [prompt]
-                current_size = prompt_size
-            else:
-                current_batch.append(prompt)
-                current_size += prompt_size
-        
-        if current_batch:
-            batches.append(current_batch)
-        
-        return batches
+from src.ai.router import ModelRouter
+from src.ai.validator import LeadValidator
+
+# Only route between models the caller can actually execute
+router = ModelRouter(models=['gemini-1.5-flash', 'gemini-1.5-pro'])
+
+# Cheapest capable model that meets the latency SLO, fed by measured calls
+model = router.select_model(task_complexity='simple', latency_slo_ms=2000)
+
+# Cached, instrumented call: call_fn(model, prompt) only runs on a cache miss
+response = router.call(prompt, call_fn, task_complexity='complex')
+
+# Pack prompts into batches under the model's context and output limits
+batches = router.batch_requests(prompts, model='gemini-1.5-flash', max_tokens=2000)
+
+# LeadValidator picks a model per call when given a router
+validator = LeadValidator(router=router, latency_slo_ms=3000)
+print(router.model_stats())
 """
     
     def create_quality_metrics(self) -> str:
@@ -388,17 +358,18 @@ class AIQualityMetrics:
         
         return metrics
     
-    def log_ai_interaction(self, prompt: str, response: str, metrics: Dict):
+    def log_ai_interaction(self, model: str, prompt: str, response: str,
+                           prompt_tokens: int, response_tokens: int, latency_ms: float):
         \"\"\"Log AI interactions for analysis\"\"\"
-        log_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'prompt_length': len(prompt.split()),
-            'response_length': len(response.split()),
-            'quality_metrics': metrics,
-            'model_used': 'gemini-pro',  # Track which model
-            'cost_estimate': len(prompt.split()) * 0.001 / 1000
-        }
-        
-        # Store in database or file
-        return log_entry
+        # Per-call records and aggregate counters live in src/ai/instrumentation.py;
+        # wrap live calls with get_recorder().call(model, fn, prompt) instead.
+        from src.ai.instrumentation import get_recorder
+        return get_recorder().record(
+            model=model,
+            prompt=prompt,
+            response_text=response,
+            prompt_tokens=prompt_tokens,
+            response_tokens=response_tokens,
+            latency_ms=latency_ms,
+        )
 """
\ No newline at end of file
@@ -4,60 +4,131 @@ Handles all API integrations and external service connections
 """
 
 import json
+import os
 from typing import Dict, Any, Optional, List
 
+from agents.result_cache import pure
+from agents.templates import registry
+
+# Requests per minute; the same variables src/config.py reads for the app's limiters
+RATE_LIMITS = {
+    "apify": int(os.getenv('APIFY_RATE_LIMIT', '100')),
+    "contactout": int(os.getenv('CONTACTOUT_RATE_LIMIT', '50')),
+    "gemini": int(os.getenv('GEMINI_RATE_LIMIT', '60')),
+    "vapi": int(os.getenv('VAPI_RATE_LIMIT', '100')),
+}
+
 class APAgent:
-    def __init__(self):
+    def __init__(self, rate_limits: Optional[Dict[str, int]] = None):
+        rate_limits = dict(RATE_LIMITS, **(rate_limits or {}))
         self.name = "AP"
         self.role = "API Expert"
         self.api_configs = {
             "apify": {
                 "base_url": "https://api.apify.com/v2",
                 "auth_type": "token",
-                "rate_limit": 100
+                "rate_limit": rate_limits["apify"]
             },
             "contactout": {
                 "base_url": "https://api.contactout.com/v1",
                 "auth_type": "api_key",
-                "rate_limit": 50
+                "rate_limit": rate_limits["contactout"]
             },
             "gemini": {
                 "base_url": "https://generativelanguage.googleapis.com",
                 "auth_type": "api_key",
-                "rate_limit": 60
+                "rate_limit": rate_limits["gemini"]
             },
             "vapi": {
                 "base_url": "https://api.vapi.ai",
                 "auth_type": "bearer",
-                "rate_limit": 100
+                "rate_limit": rate_limits["vapi"]
             }
         }
     
+    @pure
     def create_api_client(self, service_name: str):
         """Generate an API client for a specific service"""
         config = self.api_configs.get(service_name, {})
         
-        return f"""
+        return API_CLIENT_TEMPLATE.render(
+            service_name=service_name,
+            class_name=service_name.capitalize(),
+            base_url=config.get('base_url', ''),
+            auth_header=self._get_auth_header(config.get('auth_type', 'bearer')),
+            rate_limit=config.get('rate_limit', 60)
+        )
+    
+    @pure
+    def create_webhook_handler(self, webhook_name: str):
+        """Create a webhook handler"""
+        return WEBHOOK_HANDLER_TEMPLATE.render(webhook_name=webhook_name, webhook_lower=webhook_name.lower(),
+                                               webhook_upper=webhook_name.upper())
+    
+    @pure
+    def create_api_integration_test(self, api_name: str):
+        """Create integration tests for an API"""
+        return API_INTEGRATION_TEST_TEMPLATE.render(api_name=api_name, api_lower=api_name.lower(),
+                                                    api_class=api_name.capitalize(), api_upper=api_name.upper())
+    
+    def _get_auth_header(self, auth_type: str) -> str:
+        auth_headers = {
+            "bearer": "`Bearer ${apiKey}`",
+            "api_key": "`API-Key ${apiKey}`",
+            "token": "`${apiKey}`"
+        }
+        return auth_headers.get(auth_type, "`Bearer ${apiKey}`")
+    
+    @pure
+    def generate_api_documentation(self, api_name: str, endpoints: List[Dict]):
+        """Generate API documentation"""
+        doc_content = f"# {api_name.upper()} API Documentation\n\n"
+        
+        doc_content += ''.join(API_DOC_ENDPOINT_TEMPLATE.render_many(
+            {
+                'name': endpoint['name'],
+                'method': endpoint['method'],
+                'path': endpoint['path'],
+                'description': endpoint.get('description', 'No description'),
+                'parameters': self._format_parameters(endpoint.get('parameters', [])),
+                'response_example': json.dumps(endpoint.get('response_example', {}), indent=2)
+            }
+            for endpoint in endpoints
+        ))
+        return doc_content
+    
+    def _format_parameters(self, parameters: List[Dict]) -> str:
+        if not parameters:
+            return "None"
+        
+        formatted = ""
+        for param in parameters:
+            formatted += f"- `{param['name']}` ({param['type']}, {param.get('required', 'optional')}): {param.get('description', '')}\n"
+        
+        return formatted
+
+# Templates compiled once at import
+API_CLIENT_TEMPLATE = registry.register("AP.api_client", """
 // integrations/{service_name}Client.ts
 import axios, {{ AxiosInstance }} from 'axios'
 import {{ RateLimiter }} from 'limiter'
 
-export class {service_name.capitalize()}Client {{
+export class {class_name}Client {{
   private client: AxiosInstance
   private limiter: RateLimiter
   
   constructor(apiKey: string) {{
     this.client = axios.create({{
-      baseURL: '{config.get('base_url', '')}',
+      baseURL: '{base_url}',
       headers: {{
-        'Authorization': {self._get_auth_header(config.get('auth_type', 'bearer'))},
+        'Authorization': {auth_header},
         'Content-Type': 'application/json'
       }}
     }})
     
-    // Rate limiting: {config.get('rate_limit', 60)} requests per minute
+    // Rate limiting: {rate_limit} requests per minute
     this.limiter = new RateLimiter({{
-      tokensPerInterval: {config.get('rate_limit', 60)},
+      tokensPerInterval: {rate_limit},
       interval: 'minute'
     }})
     
@@ -97,12 +168,10 @@ export class {service_name.capitalize()}Client {{
     return response.data
   }}
 }}
-"""
-    
-    def create_webhook_handler(self, webhook_name: str):
-        """Create a webhook handler"""
-        return f"""
-// api/webhooks/{webhook_name.lower()}/route.ts
+""")
+
+WEBHOOK_HANDLER_TEMPLATE = registry.register("AP.webhook_handler", """
+// api/webhooks/{webhook_lower}/route.ts
 import {{ NextRequest, NextResponse }} from 'next/server'
 import crypto from 'crypto'
 
@@ -137,7 +206,7 @@ export async function POST(request: NextRequest) {{
 function verifyWebhookSignature(body: string, signature: string | null): boolean {{
   if (!signature) return false
   
-  const secret = process.env.{webhook_name.upper()}_WEBHOOK_SECRET
+  const secret = process.env.{webhook_upper}_WEBHOOK_SECRET
   const expectedSignature = crypto
     .createHmac('sha256', secret)
     .update(body)
@@ -153,19 +222,17 @@ async function process{webhook_name}Webhook(data: any) {{
   // Implementation specific to webhook type
   console.log('Processing {webhook_name} webhook:', data)
 }}
-"""
-    
-    def create_api_integration_test(self, api_name: str):
-        """Create integration tests for an API"""
-        return f"""
-// tests/integrations/{api_name.lower()}.test.ts
-import {{ {api_name.capitalize()}Client }} from '@/integrations/{api_name}Client'
+""")
 
-describe('{api_name.capitalize()} API Integration', () => {{
-  let client: {api_name.capitalize()}Client
+API_INTEGRATION_TEST_TEMPLATE = registry.register("AP.api_integration_test", """
+// tests/integrations/{api_lower}.test.ts
+import {{ {api_class}Client }} from '@/integrations/{api_name}Client'
+
+describe('{api_class} API Integration', () => {{
+  let client: {api_class}Client
   
   beforeAll(() => {{
-    client = new {api_name.capitalize()}Client(process.env.{api_name.upper()}_API_KEY!)
+    client = new {api_class}Client(process.env.{api_upper}_API_KEY!)
   }})
   
   test('should authenticate successfully', async () => {{
@@ -189,46 +256,22 @@ describe('{api_name.capitalize()} API Integration', () => {{
     await expect(client.get('/nonexistent')).rejects.toThrow()
   }})
 }})
-"""
-    
-    def _get_auth_header(self, auth_type: str) -> str:
-        auth_headers = {
-            "bearer": "`Bearer ${apiKey}`",
-            "api_key": "`API-Key ${apiKey}`",
-            "token": "`${apiKey}`"
-        }
-        return auth_headers.get(auth_type, "`Bearer ${apiKey}`")
-    
-    def generate_api_documentation(self, api_name: str, endpoints: List[Dict]):
-        """Generate API documentation"""
-        doc_content = f"# {api_name.upper()} API Documentation\n\n"
-        
-        for endpoint in endpoints:
-            doc_content += f"""
-## {endpoint['name']}
+""")
 
-**Endpoint:** `{endpoint['method']} {endpoint['path']}`
+API_DOC_ENDPOINT_TEMPLATE = registry.register("AP.api_doc_endpoint", """
+## {name}
 
-**Description:** {endpoint.get('description', 'No description')}
+**Endpoint:** `{method} {path}`
+
+**Description:** {description}
 
 **Parameters:**
-{self._format_parameters(endpoint.get('parameters', []))}
+{parameters}
 
 **Response:**
 ```json
-{json.dumps(endpoint.get('response_example', {}), indent=2)}
+{response_example}
 ```
 
 ---
-"""
-        return doc_content
-    
-    def _format_parameters(self, parameters: List[Dict]) -> str:
-        if not parameters:
-            return "None"
-        
-        formatted = ""
-        for param in parameters:
-            formatted += f"- `{param['name']}` ({param['type']}, {param.get('required', 'optional')}): {param.get('description', '')}\n"
-        
-        return formatted
\ No newline at end of file
+""")
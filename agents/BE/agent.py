@@ -6,15 +6,57 @@ Handles all backend development tasks
 from typing import Dict, List
 import json
 
+from agents.result_cache import pure
+from agents.templates import registry
+
 class BEAgent:
     def __init__(self):
         self.name = "BE"
         self.role = "Back End Developer"
     
+    @pure
     def create_api_endpoint(self, method: str, path: str, handler_name: str):
         """Create an API endpoint with proper structure"""
-        return f"""
-// {path.replace('/', '_')}.ts
+        return API_ENDPOINT_TEMPLATE.render(method=method, path_slug=path.replace('/', '_'), handler_name=handler_name)
+    
+    def create_api_endpoints(self, endpoints: List[Dict]) -> List[str]:
+        """Create many endpoints ({'method', 'path', 'handler_name'} each) in a single pass"""
+        return API_ENDPOINT_TEMPLATE.render_many(
+            {'method': e['method'], 'path_slug': e['path'].replace('/', '_'), 'handler_name': e['handler_name']}
+            for e in endpoints
+        )
+    
+    @pure
+    def create_database_schema(self, table_name: str, fields: List[Dict]):
+        """Generate SQL for creating a database table"""
+        field_definitions = []
+        for field in fields:
+            field_def = f"{field['name']} {field['type']}"
+            if field.get('primary_key'):
+                field_def += " PRIMARY KEY"
+            if field.get('not_null'):
+                field_def += " NOT NULL"
+            if field.get('default'):
+                field_def += f" DEFAULT {field['default']}"
+            field_definitions.append(field_def)
+        
+        fields_str = ',\n  '.join(field_definitions)
+        sql = DATABASE_SCHEMA_TEMPLATE.render(table_name=table_name, fields_str=fields_str)
+        return sql
+    
+    @pure
+    def create_service_class(self, service_name: str):
+        """Create a service class for business logic"""
+        return SERVICE_CLASS_TEMPLATE.render(service_name=service_name, service_lower=service_name.lower())
+    
+    @pure
+    def create_background_job(self, job_name: str):
+        """Create a background job processor"""
+        return BACKGROUND_JOB_TEMPLATE.render(job_name=job_name, job_lower=job_name.lower())
+
+# Templates compiled once at import
+API_ENDPOINT_TEMPLATE = registry.register("BE.api_endpoint", """
+// {path_slug}.ts
 import {{ NextRequest, NextResponse }} from 'next/server'
 import {{ createClient }} from '@/lib/supabase/server'
 
@@ -39,36 +81,19 @@ export async function {method}(request: NextRequest) {{
     )
   }}
 }}
-"""
-    
-    def create_database_schema(self, table_name: str, fields: List[Dict]):
-        """Generate SQL for creating a database table"""
-        field_definitions = []
-        for field in fields:
-            field_def = f"{field['name']} {field['type']}"
-            if field.get('primary_key'):
-                field_def += " PRIMARY KEY"
-            if field.get('not_null'):
-                field_def += " NOT NULL"
-            if field.get('default'):
-                field_def += f" DEFAULT {field['default']}"
-            field_definitions.append(field_def)
-        
-        fields_str = ',\n  '.join(field_definitions)
-        sql = f"""
+""")
+
+DATABASE_SCHEMA_TEMPLATE = registry.register("BE.database_schema", """
 CREATE TABLE IF NOT EXISTS {table_name} (
   {fields_str}
 );
 
 -- Create indexes
 CREATE INDEX IF NOT EXISTS idx_{table_name}_created_at ON {table_name}(created_at);
-"""
-        return sql
-    
-    def create_service_class(self, service_name: str):
-        """Create a service class for business logic"""
-        return f"""
-// services/{service_name.lower()}Service.ts
+""")
+
+SERVICE_CLASS_TEMPLATE = registry.register("BE.service_class", """
+// services/{service_lower}Service.ts
 import {{ createClient }} from '@/lib/supabase/server'
 
 export class {service_name}Service {{
@@ -80,7 +105,7 @@ export class {service_name}Service {{
   
   async getAll(filters = {{}}) {{
     const query = this.supabase
-      .from('{service_name.lower()}s')
+      .from('{service_lower}s')
       .select('*')
     
     // Apply filters
@@ -95,7 +120,7 @@ export class {service_name}Service {{
   
   async getById(id: string) {{
     const {{ data, error }} = await this.supabase
-      .from('{service_name.lower()}s')
+      .from('{service_lower}s')
       .select('*')
       .eq('id', id)
       .single()
@@ -106,7 +131,7 @@ export class {service_name}Service {{
   
   async create(data: any) {{
     const {{ data: result, error }} = await this.supabase
-      .from('{service_name.lower()}s')
+      .from('{service_lower}s')
       .insert(data)
       .select()
       .single()
@@ -117,7 +142,7 @@ export class {service_name}Service {{
   
   async update(id: string, data: any) {{
     const {{ data: result, error }} = await this.supabase
-      .from('{service_name.lower()}s')
+      .from('{service_lower}s')
       .update(data)
       .eq('id', id)
       .select()
@@ -129,7 +154,7 @@ export class {service_name}Service {{
   
   async delete(id: string) {{
     const {{ error }} = await this.supabase
-      .from('{service_name.lower()}s')
+      .from('{service_lower}s')
       .delete()
       .eq('id', id)
     
@@ -137,15 +162,13 @@ export class {service_name}Service {{
     return {{ success: true }}
   }}
 }}
-"""
-    
-    def create_background_job(self, job_name: str):
-        """Create a background job processor"""
-        return f"""
-// jobs/{job_name.lower()}.ts
+""")
+
+BACKGROUND_JOB_TEMPLATE = registry.register("BE.background_job", """
+// jobs/{job_lower}.ts
 import {{ CronJob }} from 'cron'
 
-export const {job_name.lower()}Job = new CronJob(
+export const {job_lower}Job = new CronJob(
   '0 */15 * * * *', // Every 15 minutes
   async function() {{
     console.log('Running {job_name} job...')
@@ -162,4 +185,4 @@ export const {job_name.lower()}Job = new CronJob(
   true,
   'America/New_York'
 )
-"""
\ No newline at end of file
+""")
@@ -3,15 +3,25 @@ Front End Developer Agent (FE)
 Handles all frontend development tasks
 """
 
+from typing import Dict, List
+
+from agents.result_cache import pure
+from agents.templates import Template, registry
+
 class FEAgent:
     def __init__(self):
         self.name = "FE"
         self.role = "Front End Developer"
         
+    @pure
     def create_component(self, component_name, component_type="functional"):
         """Create a new React component"""
+        return self._get_component_template(component_type).render(name=component_name)
+    
+    def create_components(self, component_names: List[str], component_type="functional") -> Dict[str, str]:
+        """Create many components of one type in a single pass"""
         template = self._get_component_template(component_type)
-        return template.format(name=component_name)
+        return dict(zip(component_names, template.render_many({'name': name} for name in component_names)))
     
     def setup_next_app(self):
         """Initialize a Next.js application with best practices"""
@@ -52,9 +62,12 @@ export default function DashboardLayout({
 }
 """
     
-    def _get_component_template(self, component_type):
-        templates = {
-            "functional": """
+    def _get_component_template(self, component_type) -> Template:
+        return COMPONENT_TEMPLATES.get(component_type, COMPONENT_TEMPLATES["functional"])
+
+# Templates compiled once at import
+COMPONENT_TEMPLATES = {
+    "functional": registry.register("FE.component.functional", """
 import React from 'react'
 
 interface {name}Props {{
@@ -68,8 +81,8 @@ export const {name}: React.FC<{name}Props> = (props) => {{
     </div>
   )
 }}
-""",
-            "page": """
+"""),
+    "page": registry.register("FE.component.page", """
 export default function {name}Page() {{
   return (
     <div className="container mx-auto py-6">
@@ -78,6 +91,5 @@ export default function {name}Page() {{
     </div>
   )
 }}
-"""
-        }
-        return templates.get(component_type, templates["functional"])
\ No newline at end of file
+""")
+}
@@ -6,194 +6,29 @@ Handles testing, monitoring, and infrastructure quality
 from typing import Dict, List, Any
 import json
 
+from agents.result_cache import pure
+from agents.templates import registry
+
 class QAAgent:
     def __init__(self):
         self.name = "QA"
         self.role = "Quality Assurance & Testing Expert"
         self.test_types = ["unit", "integration", "e2e", "performance", "security"]
     
+    @pure
     def create_playwright_test(self, test_name: str, test_type: str) -> str:
         """Create Playwright test configuration"""
         if test_type == "e2e":
-            return f"""
-// tests/e2e/{test_name}.spec.ts
-import {{ test, expect }} from '@playwright/test'
-
-test.describe('{test_name} E2E Tests', () => {{
-  test.beforeEach(async ({{ page }}) => {{
-    await page.goto('http://localhost:3000')
-  }})
-  
-  test('should complete full user journey', async ({{ page }}) => {{
-    // Login
-    await page.fill('[data-testid="email"]', 'test@example.com')
-    await page.fill('[data-testid="password"]', 'password123')
-    await page.click('[data-testid="login-button"]')
-    
-    // Verify dashboard
-    await expect(page).toHaveURL('/dashboard')
-    await expect(page.locator('h1')).toContainText('Dashboard')
-    
-    // Test main functionality
-    await page.click('[data-testid="create-lead"]')
-    await page.fill('[data-testid="business-name"]', 'Test Business')
-    await page.click('[data-testid="submit"]')
-    
-    // Verify success
-    await expect(page.locator('.success-message')).toBeVisible()
-  }})
-  
-  test('should handle errors gracefully', async ({{ page }}) => {{
-    // Test error scenarios
-    await page.route('**/api/**', route => route.abort())
-    await page.click('[data-testid="fetch-data"]')
-    
-    await expect(page.locator('.error-message')).toBeVisible()
-    await expect(page.locator('.error-message')).toContainText('Failed to fetch')
-  }})
-}})
-"""
+            return E2E_TEST_TEMPLATE.render(test_name=test_name)
         elif test_type == "api":
-            return f"""
-// tests/api/{test_name}.test.ts
-import {{ test, expect }} from '@playwright/test'
-
-test.describe('{test_name} API Tests', () => {{
-  const baseURL = process.env.API_URL || 'http://localhost:3000/api'
-  
-  test('GET /api/{test_name} should return 200', async ({{ request }}) => {{
-    const response = await request.get(`${{baseURL}}/{test_name}`)
-    expect(response.ok()).toBeTruthy()
-    
-    const data = await response.json()
-    expect(data).toHaveProperty('success', true)
-  }})
-  
-  test('POST /api/{test_name} should create resource', async ({{ request }}) => {{
-    const response = await request.post(`${{baseURL}}/{test_name}`, {{
-      data: {{
-        name: 'Test Resource',
-        value: 123
-      }}
-    }})
-    
-    expect(response.status()).toBe(201)
-    const created = await response.json()
-    expect(created).toHaveProperty('id')
-  }})
-  
-  test('should handle validation errors', async ({{ request }}) => {{
-    const response = await request.post(`${{baseURL}}/{test_name}`, {{
-      data: {{}} // Invalid data
-    }})
-    
-    expect(response.status()).toBe(400)
-    const error = await response.json()
-    expect(error).toHaveProperty('error')
-  }})
-}})
-"""
+            return API_TEST_TEMPLATE.render(test_name=test_name)
         else:
             return self._create_unit_test(test_name)
     
+    @pure
     def create_github_actions_workflow(self, workflow_type: str) -> str:
         """Create GitHub Actions CI/CD workflow"""
-        workflows = {
-            "ci": """
-name: CI Pipeline
-
-on:
-  push:
-    branches: [main, develop]
-  pull_request:
-    branches: [main]
-
-jobs:
-  test:
-    runs-on: ubuntu-latest
-    
-    services:
-      postgres:
-        image: postgres:15
-        env:
-          POSTGRES_PASSWORD: postgres
-        options: >-
-          --health-cmd pg_isready
-          --health-interval 10s
-          --health-timeout 5s
-          --health-retries 5
-    
-    steps:
-      - uses: actions/checkout@v3
-      
-      - name: Setup Node.js
-        uses: actions/setup-node@v3
-        with:
-          node-version: '18'
-          cache: 'npm'
-      
-      - name: Install dependencies
-        run: npm ci
-      
-      - name: Run linter
-        run: npm run lint
-      
-      - name: Run type checking
-        run: npm run typecheck
-      
-      - name: Run unit tests
-        run: npm run test:unit
-      
-      - name: Setup Playwright
-        run: npx playwright install --with-deps
-      
-      - name: Run E2E tests
-        run: npm run test:e2e
-        env:
-          DATABASE_URL: ${{ secrets.DATABASE_URL }}
-          SUPABASE_URL: ${{ secrets.SUPABASE_URL }}
-          SUPABASE_ANON_KEY: ${{ secrets.SUPABASE_ANON_KEY }}
-      
-      - name: Upload test results
-        uses: actions/upload-artifact@v3
-        if: always()
-        with:
-          name: test-results
-          path: test-results/
-          retention-days: 30
-      
-      - name: Code Coverage
-        run: npm run coverage
-      
-      - name: Upload coverage to Codecov
-        uses: codecov/codecov-action@v3
-        with:
-          token: ${{ secrets.CODECOV_TOKEN }}
-""",
-            "deploy": """
-name: Deploy Pipeline
-
-on:
-  push:
-    branches: [main]
-
-jobs:
-  deploy:
-    runs-on: ubuntu-latest
-    
-    steps:
-      - uses: actions/checkout@v3
-      
-      - name: Deploy to Vercel
-        uses: amondnet/vercel-action@v20
-        with:
-          vercel-token: ${{ secrets.VERCEL_TOKEN }}
-          vercel-org-id: ${{ secrets.VERCEL_ORG_ID }}
-          vercel-project-id: ${{ secrets.VERCEL_PROJECT_ID }}
-          vercel-args: '--prod'
-"""
-        }
-        return workflows.get(workflow_type, workflows["ci"])
+        return GITHUB_WORKFLOWS.get(workflow_type, GITHUB_WORKFLOWS["ci"])
     
     def create_monitoring_setup(self) -> str:
         """Create monitoring and error tracking setup"""
@@ -361,7 +196,89 @@ export default function () {
     
     def _create_unit_test(self, component_name: str) -> str:
         """Create a unit test template"""
-        return f"""
+        return UNIT_TEST_TEMPLATE.render(component_name=component_name, component_lower=component_name.lower())
+
+# Templates compiled once at import
+E2E_TEST_TEMPLATE = registry.register("QA.playwright_e2e", """
+// tests/e2e/{test_name}.spec.ts
+import {{ test, expect }} from '@playwright/test'
+
+test.describe('{test_name} E2E Tests', () => {{
+  test.beforeEach(async ({{ page }}) => {{
+    await page.goto('http://localhost:3000')
+  }})
+  
+  test('should complete full user journey', async ({{ page }}) => {{
+    // Login
+    await page.fill('[data-testid="email"]', 'test@example.com')
+    await page.fill('[data-testid="password"]', 'password123')
+    await page.click('[data-testid="login-button"]')
+    
+    // Verify dashboard
+    await expect(page).toHaveURL('/dashboard')
+    await expect(page.locator('h1')).toContainText('Dashboard')
+    
+    // Test main functionality
+    await page.click('[data-testid="create-lead"]')
+    await page.fill('[data-testid="business-name"]', 'Test Business')
+    await page.click('[data-testid="submit"]')
+    
+    // Verify success
+    await expect(page.locator('.success-message')).toBeVisible()
+  }})
+  
+  test('should handle errors gracefully', async ({{ page }}) => {{
+    // Test error scenarios
+    await page.route('**/api/**', route => route.abort())
+    await page.click('[data-testid="fetch-data"]')
+    
+    await expect(page.locator('.error-message')).toBeVisible()
+    await expect(page.locator('.error-message')).toContainText('Failed to fetch')
+  }})
+}})
+""")
+
+API_TEST_TEMPLATE = registry.register("QA.playwright_api", """
+// tests/api/{test_name}.test.ts
+import {{ test, expect }} from '@playwright/test'
+
+test.describe('{test_name} API Tests', () => {{
+  const baseURL = process.env.API_URL || 'http://localhost:3000/api'
+  
+  test('GET /api/{test_name} should return 200', async ({{ request }}) => {{
+    const response = await request.get(`${{baseURL}}/{test_name}`)
+    expect(response.ok()).toBeTruthy()
+    
+    const data = await response.json()
+    expect(data).toHaveProperty('success', true)
+  }})
+  
+  test('POST /api/{test_name} should create resource', async ({{ request }}) => {{
+    const response = await request.post(`${{baseURL}}/{test_name}`, {{
+      data: {{
+        name: 'Test Resource',
+        value: 123
+      }}
+    }})
+    
+    expect(response.status()).toBe(201)
+    const created = await response.json()
+    expect(created).toHaveProperty('id')
+  }})
+  
+  test('should handle validation errors', async ({{ request }}) => {{
+    const response = await request.post(`${{baseURL}}/{test_name}`, {{
+      data: {{}} // Invalid data
+    }})
+    
+    expect(response.status()).toBe(400)
+    const error = await response.json()
+    expect(error).toHaveProperty('error')
+  }})
+}})
+""")
+
+UNIT_TEST_TEMPLATE = registry.register("QA.unit_test", """
 // tests/unit/{component_name}.test.ts
 import {{ describe, it, expect, vi }} from 'vitest'
 import {{ render, screen, fireEvent }} from '@testing-library/react'
@@ -370,14 +287,14 @@ import {{ {component_name} }} from '@/components/{component_name}'
 describe('{component_name}', () => {{
   it('should render correctly', () => {{
     render(<{component_name} />)
-    expect(screen.getByTestId('{component_name.lower()}')).toBeInTheDocument()
+    expect(screen.getByTestId('{component_lower}')).toBeInTheDocument()
   }})
   
   it('should handle user interactions', async () => {{
     const mockHandler = vi.fn()
     render(<{component_name} onClick={{mockHandler}} />)
     
-    const element = screen.getByTestId('{component_name.lower()}')
+    const element = screen.getByTestId('{component_lower}')
     fireEvent.click(element)
     
     expect(mockHandler).toHaveBeenCalledTimes(1)
@@ -391,4 +308,101 @@ describe('{component_name}', () => {{
     expect(screen.getByText('123')).toBeInTheDocument()
   }})
 }})
-"""
\ No newline at end of file
+""")
+
+# Returned verbatim; ${{ }} is GitHub Actions syntax, not a placeholder
+GITHUB_WORKFLOWS = {
+    "ci": """
+name: CI Pipeline
+
+on:
+  push:
+    branches: [main, develop]
+  pull_request:
+    branches: [main]
+
+jobs:
+  test:
+    runs-on: ubuntu-latest
+    
+    services:
+      postgres:
+        image: postgres:15
+        env:
+          POSTGRES_PASSWORD: postgres
+        options: >-
+          --health-cmd pg_isready
+          --health-interval 10s
+          --health-timeout 5s
+          --health-retries 5
+    
+    steps:
+      - uses: actions/checkout@v3
+      
+      - name: Setup Node.js
+        uses: actions/setup-node@v3
+        with:
+          node-version: '18'
+          cache: 'npm'
+      
+      - name: Install dependencies
+        run: npm ci
+      
+      - name: Run linter
+        run: npm run lint
+      
+      - name: Run type checking
+        run: npm run typecheck
+      
+      - name: Run unit tests
+        run: npm run test:unit
+      
+      - name: Setup Playwright
+        run: npx playwright install --with-deps
+      
+      - name: Run E2E tests
+        run: npm run test:e2e
+        env:
+          DATABASE_URL: ${{ secrets.DATABASE_URL }}
+          SUPABASE_URL: ${{ secrets.SUPABASE_URL }}
+          SUPABASE_ANON_KEY: ${{ secrets.SUPABASE_ANON_KEY }}
+      
+      - name: Upload test results
+        uses: actions/upload-artifact@v3
+        if: always()
+        with:
+          name: test-results
+          path: test-results/
+          retention-days: 30
+      
+      - name: Code Coverage
+        run: npm run coverage
+      
+      - name: Upload coverage to Codecov
+        uses: codecov/codecov-action@v3
+        with:
+          token: ${{ secrets.CODECOV_TOKEN }}
+""",
+    "deploy": """
+name: Deploy Pipeline
+
+on:
+  push:
+    branches: [main]
+
+jobs:
+  deploy:
+    runs-on: ubuntu-latest
+    
+    steps:
+      - uses: actions/checkout@v3
+      
+      - name: Deploy to Vercel
+        uses: amondnet/vercel-action@v20
+        with:
+          vercel-token: ${{ secrets.VERCEL_TOKEN }}
+          vercel-org-id: ${{ secrets.VERCEL_ORG_ID }}
+          vercel-project-id: ${{ secrets.VERCEL_PROJECT_ID }}
+          vercel-args: '--prod'
+"""
+}
@@ -6,6 +6,8 @@ Specializes in VAPI voice AI configuration and management
 from typing import Dict, List, Any
 import json
 
+from agents.result_cache import pure
+
 class VPAgent:
     def __init__(self):
         self.name = "VP"
@@ -13,6 +15,7 @@ class VPAgent:
         self.voice_providers = ["elevenlabs", "playht", "deepgram", "azure"]
         self.models = ["gpt-4o", "gpt-4", "gpt-3.5-turbo", "claude-3", "llama-2"]
     
+    @pure
     def create_assistant_config(self, assistant_type: str) -> Dict:
         """Create VAPI assistant configuration"""
         configs = {
@@ -90,6 +93,7 @@ Be efficient and clear about available options.""",
         
         return configs.get(assistant_type, configs["sales"])
     
+    @pure
     def create_vapi_function(self, function_type: str) -> Dict:
         """Create VAPI function definitions"""
         functions = {
@@ -138,69 +142,10 @@ Be efficient and clear about available options.""",
         
         return functions.get(function_type, {})
     
+    @pure
     def create_call_script(self, script_type: str) -> str:
         """Generate call scripts for different scenarios"""
-        scripts = {
-            "cold_call": """
-# Cold Call Script
-
-## Opening (0-10 seconds)
-"Hi [Name], this is [Your Name] from GB Agency. I know you're busy, so I'll be brief. 
-We've helped businesses like yours increase revenue by 30% through our innovative solutions. 
-Do you have 2 minutes to hear how this might benefit [Company Name]?"
-
-## Value Proposition (10-30 seconds)
-[If YES]: "Great! We specialize in [specific solution] that addresses [common pain point]. 
-Many of our clients in [their industry] have seen [specific result]. 
-What's your biggest challenge with [relevant area] right now?"
-
-## Discovery Questions
-1. "How are you currently handling [specific process]?"
-2. "What would improvement in this area mean for your business?"
-3. "Who else would be involved in evaluating a solution like this?"
-
-## Close
-"Based on what you've shared, I think we could really help. 
-Would you be open to a 20-minute call next week to explore this further?"
-""",
-            "follow_up": """
-# Follow-Up Call Script
-
-## Opening
-"Hi [Name], it's [Your Name] from GB Agency following up on our conversation last [day]. 
-You mentioned [specific point from last call]. Have you had a chance to think about that?"
-
-## Re-engagement
-"Since we last spoke, we've helped [similar company] achieve [specific result]. 
-I thought this might be relevant to your situation with [their challenge]."
-
-## Next Steps
-"What questions have come up since our last conversation?"
-"What would need to happen for you to move forward with a solution?"
-"When would be a good time to involve [other stakeholders] in the conversation?"
-""",
-            "objection_handling": """
-# Common Objections & Responses
-
-## "Too Expensive"
-"I understand price is important. Let me ask - what would it cost your business 
-to continue without solving [problem]? Our clients typically see ROI within [timeframe]."
-
-## "Not Interested"
-"I appreciate your directness. Before I go, can I ask - is it because you already 
-have a solution in place, or is [problem area] just not a priority right now?"
-
-## "Send Me Information"
-"I'd be happy to send tailored information. To make sure it's relevant, 
-what specific aspects would you like me to focus on?"
-
-## "Call Me Later"
-"Of course! When would be a better time? And so I can prepare, 
-what will have changed by then that would make this conversation more valuable?"
-"""
-        }
-        
-        return scripts.get(script_type, "")
+        return CALL_SCRIPTS.get(script_type, "")
     
     def create_voice_analytics_dashboard(self) -> str:
         """Create analytics tracking configuration"""
@@ -280,4 +225,65 @@ export class VAPIAnalytics {
             "# Testing",
             "vapi test assistant <assistant-id>",
             "vapi test call --to '+1234567890' --duration 60"
-        ]
\ No newline at end of file
+        ]
+
+# Static scripts, built once rather than on every call
+CALL_SCRIPTS = {
+    "cold_call": """
+# Cold Call Script
+
+## Opening (0-10 seconds)
+"Hi [Name], this is [Your Name] from GB Agency. I know you're busy, so I'll be brief. 
+We've helped businesses like yours increase revenue by 30% through our innovative solutions. 
+Do you have 2 minutes to hear how this might benefit [Company Name]?"
+
+## Value Proposition (10-30 seconds)
+[If YES]: "Great! We specialize in [specific solution] that addresses [common pain point]. 
+Many of our clients in [their industry] have seen [specific result]. 
+What's your biggest challenge with [relevant area] right now?"
+
+## Discovery Questions
+1. "How are you currently handling [specific process]?"
+2. "What would improvement in this area mean for your business?"
+3. "Who else would be involved in evaluating a solution like this?"
+
+## Close
+"Based on what you've shared, I think we could really help. 
+Would you be open to a 20-minute call next week to explore this further?"
+""",
+    "follow_up": """
+# Follow-Up Call Script
+
+## Opening
+"Hi [Name], it's [Your Name] from GB Agency following up on our conversation last [day]. 
+You mentioned [specific point from last call]. Have you had a chance to think about that?"
+
+## Re-engagement
+"Since we last spoke, we've helped [similar company] achieve [specific result]. 
+I thought this might be relevant to your situation with [their challenge]."
+
+## Next Steps
+"What questions have come up since our last conversation?"
+"What would need to happen for you to move forward with a solution?"
+"When would be a good time to involve [other stakeholders] in the conversation?"
+""",
+    "objection_handling": """
+# Common Objections & Responses
+
+## "Too Expensive"
+"I understand price is important. Let me ask - what would it cost your business 
+to continue without solving [problem]? Our clients typically see ROI within [timeframe]."
+
+## "Not Interested"
+"I appreciate your directness. Before I go, can I ask - is it because you already 
+have a solution in place, or is [problem area] just not a priority right now?"
+
+## "Send Me Information"
+"I'd be happy to send tailored information. To make sure it's relevant, 
+what specific aspects would you like me to focus on?"
+
+## "Call Me Later"
+"Of course! When would be a better time? And so I can prepare, 
+what will have changed by then that would make this conversation more valuable?"
+"""
+}
@@ -7,40 +7,168 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from agents.orchestrator import orchestrator
 import argparse
+import contextlib
 import json
 
+from agents.daemon import AgentDaemon, SOCKET_PATH, request
+
+def execute_action(agent_name: str, action: str, data: dict):
+    """Run one action through the orchestrator ('ALL') or directly on an agent"""
+    # Imported here so talking to a running daemon never loads the orchestrator
+    from agents.orchestrator import get_orchestrator
+    orchestrator = get_orchestrator()
+    
+    if agent_name == 'ALL':
+        # Use orchestrator for multi-agent tasks
+        return orchestrator.delegate_task(action, data)
+    
+    # Direct agent access
+    if agent_name not in orchestrator.agents:
+        raise KeyError(f"Agent {agent_name} not found")
+    agent = orchestrator.agents[agent_name]
+    if not hasattr(agent, action):
+        raise AttributeError(f"Agent {agent_name} doesn't have action: {action}")
+    return getattr(agent, action)(**data)
+
+def run_action(agent_name: str, action: str, data: dict) -> str:
+    """Run one CLI action in this process and return the text to print"""
+    from agents.orchestrator import get_orchestrator
+    agents = get_orchestrator().agents
+    
+    if agent_name != 'ALL':
+        if agent_name not in agents:
+            return f"Agent {agent_name} not found"
+        if not hasattr(agents[agent_name], action):
+            # List available actions
+            methods = [m for m in dir(agents[agent_name]) if not m.startswith('_')]
+            return f"Agent {agent_name} doesn't have action: {action}\nAvailable actions: {', '.join(methods)}"
+    
+    result = execute_action(agent_name, action, data)
+    return json.dumps(result, indent=2) if agent_name == 'ALL' else str(result)
+
+def batch_main(argv):
+    parser = argparse.ArgumentParser(
+        prog='cli.py batch',
+        description='Run many actions from a JSONL file: one {"agent", "action", "data"} object per line'
+    )
+    parser.add_argument('file', nargs='?', default='-', help='JSONL task file (default: stdin)')
+    parser.add_argument('--workers', '-w', type=int, default=4, help='Actions run in parallel')
+    parser.add_argument('--output', '-o', help='Write results here instead of stdout')
+    args = parser.parse_args(argv)
+    
+    source = sys.stdin if args.file == '-' else open(args.file)
+    output = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        # Agent chatter goes to stderr so stdout stays valid JSONL
+        with contextlib.redirect_stdout(sys.stderr):
+            failed = run_batch(source, output, workers=args.workers)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    
+    if failed:
+        sys.exit(1)
+
+def run_batch(lines, output, workers: int = 4) -> int:
+    """
+    Stream tasks from JSONL lines and write one result line per task as each finishes.
+    Results carry the task's line index (blank lines are skipped but counted).
+    Returns the number of failed tasks.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+    
+    def run(index, line):
+        try:
+            task = json.loads(line)
+            result = execute_action(task.get('agent', 'ALL'), task['action'], task.get('data', {}))
+            return {'index': index, 'agent': task.get('agent', 'ALL'), 'action': task['action'],
+                    'status': 'completed', 'output': result}
+        except Exception as e:
+            return {'index': index, 'status': 'failed', 'error': f"{type(e).__name__}: {e}"}
+    
+    failed = 0
+    running = set()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        def drain(return_when):
+            nonlocal failed, running
+            done, running = wait(running, return_when=return_when)
+            for future in done:
+                result = future.result()
+                failed += result['status'] == 'failed'
+                output.write(json.dumps(result, default=str) + '\n')
+            output.flush()
+        
+        for index, line in enumerate(lines):
+            if not line.strip():
+                continue
+            # Bounded read-ahead keeps memory flat for large task files
+            if len(running) >= workers * 2:
+                drain(FIRST_COMPLETED)
+            running.add(executor.submit(run, index, line))
+        
+        while running:
+            drain(FIRST_COMPLETED)
+    
+    return failed
+
+def daemon_main(argv):
+    parser = argparse.ArgumentParser(prog='cli.py daemon',
+                                     description='Keep agents loaded between CLI calls')
+    parser.add_argument('command', choices=['start', 'stop', 'status'])
+    parser.add_argument('--socket', default=SOCKET_PATH, help='Unix socket path')
+    args = parser.parse_args(argv)
+    
+    if args.command == 'start':
+        # Runs in the foreground; background it with & or a process manager.
+        # Restart the daemon after changing agent code, it keeps the old modules loaded.
+        AgentDaemon(lambda payload: {'output': run_action(payload['agent'], payload['action'],
+                                                          payload.get('data', {}))},
+                    args.socket).serve_forever()
+    elif args.command == 'stop':
+        response = request({'op': 'shutdown'}, args.socket, timeout=5.0)
+        print("Daemon stopped" if response else "No daemon running")
+    else:
+        response = request({'op': 'ping'}, args.socket, timeout=1.0)
+        if response:
+            print(f"Daemon running (pid {response['pid']}, {response['requests_served']} requests served)")
+        else:
+            print("No daemon running")
+
 def main():
+    if sys.argv[1:2] == ['daemon']:
+        return daemon_main(sys.argv[2:])
+    if sys.argv[1:2] == ['batch']:
+        return batch_main(sys.argv[2:])
+    
     parser = argparse.ArgumentParser(description='GB SalesMachine Agent CLI')
     parser.add_argument('agent', choices=['FE', 'BE', 'AP', 'VP', 'QA', 'PM', 'AI', 'ALL'], 
                        help='Which agent to use (or ALL for orchestrator)')
     parser.add_argument('action', help='Action to perform')
     parser.add_argument('--data', '-d', type=json.loads, default={}, 
                        help='JSON data for the action')
+    parser.add_argument('--no-daemon', action='store_true',
+                       help="Run in this process even if an agent daemon is running ('cli.py daemon start')")
     
     args = parser.parse_args()
     
-    if args.agent == 'ALL':
-        # Use orchestrator for multi-agent tasks
-        result = orchestrator.delegate_task(args.action, args.data)
-        print(json.dumps(result, indent=2))
+    payload = {'op': 'run', 'agent': args.agent, 'action': args.action, 'data': args.data}
+    try:
+        response = None if args.no_daemon else request(payload)
+    except TimeoutError as e:
+        # It may still be running the action, so don't run it here as well
+        print(f"Daemon error: {e} (restart it, or use --no-daemon)")
+        sys.exit(1)
+    
+    if response is None:
+        print(run_action(args.agent, args.action, args.data))
+    elif response['ok']:
+        print(response['output'])
     else:
-        # Direct agent access
-        if args.agent in orchestrator.agents:
-            agent = orchestrator.agents[args.agent]
-            
-            if hasattr(agent, args.action):
-                method = getattr(agent, args.action)
-                result = method(**args.data)
-                print(result)
-            else:
-                print(f"Agent {args.agent} doesn't have action: {args.action}")
-                # List available actions
-                methods = [m for m in dir(agent) if not m.startswith('_')]
-                print(f"Available actions: {', '.join(methods)}")
-        else:
-            print(f"Agent {args.agent} not found")
+        print(f"Daemon error: {response['error']}")
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
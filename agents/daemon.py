@@ -0,0 +1,129 @@
+"""
+Agent Daemon
+Keeps one orchestrator warm and serves CLI requests as JSON lines over a Unix socket
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+SOCKET_PATH = os.getenv('AGENT_DAEMON_SOCKET') or os.path.join(
+    os.getenv('TMPDIR', '/tmp'), f'gb-agents-{os.getuid()}.sock'
+)
+
+# How long the CLI waits for a daemon reply before giving up on it
+REQUEST_TIMEOUT = float(os.getenv('AGENT_DAEMON_TIMEOUT', '300'))
+
+def request(payload: Dict, socket_path: Optional[str] = None,
+            timeout: Optional[float] = REQUEST_TIMEOUT) -> Optional[Dict]:
+    """
+    Send one request to a running daemon; returns None when no daemon can be
+    reached (including a socket owned by another user). Raises TimeoutError
+    when a daemon accepted the request but didn't reply within timeout.
+    """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(timeout)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        try:
+            client.connect(socket_path or SOCKET_PATH)
+            break
+        except BlockingIOError:
+            # A Unix socket with a timeout fails instead of waiting while the
+            # daemon's accept backlog is full; wait for room until the deadline
+            if deadline is None or time.monotonic() < deadline:
+                time.sleep(0.01)
+                continue
+            client.close()
+            return None
+        except (FileNotFoundError, ConnectionRefusedError, PermissionError, socket.timeout):
+            client.close()
+            return None
+
+    with client, client.makefile('rwb') as stream:
+        try:
+            stream.write(json.dumps(payload).encode('utf-8') + b'\n')
+            stream.flush()
+            line = stream.readline()
+        except socket.timeout:
+            raise TimeoutError(f"Agent daemon on {socket_path or SOCKET_PATH} didn't reply within {timeout:g}s")
+    return json.loads(line) if line else None
+
+def is_running(socket_path: Optional[str] = None) -> bool:
+    response = request({'op': 'ping'}, socket_path, timeout=1.0)
+    return bool(response and response.get('ok'))
+
+class AgentDaemon:
+    def __init__(self, handler: Callable[[Dict], Dict], socket_path: Optional[str] = None):
+        """handler turns a request dict into a response dict; it runs in the daemon's threads"""
+        self.handler = handler
+        self.socket_path = socket_path or SOCKET_PATH
+        self.requests_served = 0
+        self._served_lock = threading.Lock()
+        self._server = None
+
+    def serve_forever(self):
+        import socketserver
+
+        if os.path.exists(self.socket_path):
+            if is_running(self.socket_path):
+                raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+            # Left behind by a daemon that didn't shut down cleanly
+            os.unlink(self.socket_path)
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                # One connection can carry any number of requests, one JSON object per line
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    response = daemon._respond(line)
+                    self.wfile.write(json.dumps(response, default=str).encode('utf-8') + b'\n')
+                    self.wfile.flush()
+                    if response.get('shutdown'):
+                        # Only once the client has its reply; shutdown() blocks until
+                        # serve_forever returns, so call it off this handler thread
+                        threading.Thread(target=daemon._server.shutdown, daemon=True).start()
+                        return
+
+        class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        # Created owner-only: a chmod after bind would leave a window open to other users
+        umask = os.umask(0o177)
+        try:
+            self._server = Server(self.socket_path, Handler)
+        finally:
+            os.umask(umask)
+        print(f"🟢 Agent daemon listening on {self.socket_path}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            print("🔴 Agent daemon stopped")
+
+    def _respond(self, line: bytes) -> Dict:
+        try:
+            payload = json.loads(line)
+        except ValueError as e:
+            return {'ok': False, 'error': f"Invalid request: {e}"}
+
+        op = payload.get('op', 'run')
+        if op == 'ping':
+            return {'ok': True, 'pid': os.getpid(), 'requests_served': self.requests_served}
+        if op == 'shutdown':
+            return {'ok': True, 'shutdown': True}
+
+        with self._served_lock:
+            self.requests_served += 1
+        try:
+            return dict(self.handler(payload), ok=True)
+        except Exception as e:
+            return {'ok': False, 'error': str(e)}
@@ -0,0 +1,177 @@
+"""
+Agent Discovery
+Finds agent classes in agents/*/agent.py and installed entry points, cached as a manifest
+"""
+
+import ast
+import json
+import os
+import sys
+from typing import Dict, Optional
+
+AGENTS_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_PATH = os.path.join(AGENTS_DIR, 'agent_config.json')
+MANIFEST_PATH = os.path.join(AGENTS_DIR, 'shared', 'agent_manifest.json')
+ENTRY_POINT_GROUP = 'gb_salesmachine.agents'
+MANIFEST_VERSION = 1
+
+def load_manifest(refresh: bool = False, manifest_path: Optional[str] = None,
+                  config_path: Optional[str] = None, agents_dir: Optional[str] = None,
+                  entry_points: bool = True) -> Dict:
+    """
+    Return the agent manifest, rebuilding it when any file it was built from
+    has changed. Checking costs one stat per source; nothing is imported.
+    """
+    manifest_path = manifest_path or os.getenv('AGENT_MANIFEST_PATH', MANIFEST_PATH)
+    config_path = config_path or CONFIG_PATH
+    agents_dir = agents_dir or AGENTS_DIR
+
+    if not refresh:
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            if (manifest.get('version') == MANIFEST_VERSION
+                    and manifest.get('entry_points') == entry_points
+                    and _mtimes(manifest['sources']) == manifest['sources']):
+                return manifest
+        except (OSError, ValueError, KeyError):
+            pass
+
+    manifest = build_manifest(config_path, agents_dir, entry_points)
+    _write(manifest_path, manifest)
+    return manifest
+
+def build_manifest(config_path: str = CONFIG_PATH, agents_dir: str = AGENTS_DIR,
+                   entry_points: bool = True) -> Dict:
+    """Scan agent sources (AST only) and entry points into a manifest"""
+    with open(config_path) as f:
+        config = json.load(f)['agents']
+
+    watched = [config_path, agents_dir]
+    agents = {}
+    for entry in sorted(os.listdir(agents_dir)):
+        agent_dir = os.path.join(agents_dir, entry)
+        source = os.path.join(agent_dir, 'agent.py')
+        # shared/ holds agent data (including this manifest), never an agent
+        if entry.startswith(('_', '.')) or entry == 'shared' or not os.path.isdir(agent_dir):
+            continue
+        watched.append(agent_dir)
+        if not os.path.isfile(source):
+            continue
+        watched.append(source)
+
+        found = _scan_source(entry, source)
+        if found:
+            agents[entry] = dict(found, module=f'agents.{entry}.agent', source=source)
+
+    if entry_points:
+        # Installing or removing a distribution changes its site-packages directory
+        watched.extend(p for p in sys.path if p and os.path.isdir(p) and 'site-packages' in p)
+        for name, found in _entry_point_agents().items():
+            agents.setdefault(name, found)
+
+    for name, agent in agents.items():
+        agent['metadata'] = config.get(name, {})
+
+    # Configured agents keep their config order; newly discovered ones follow
+    order = [name for name in config if name in agents] + sorted(set(agents) - set(config))
+    return {
+        'version': MANIFEST_VERSION,
+        'entry_points': entry_points,
+        'sources': _mtimes(dict.fromkeys(watched)),
+        'agents': {name: agents[name] for name in order},
+        'configured_only': [name for name in config if name not in agents]
+    }
+
+def _scan_source(agent_name: str, source: str) -> Optional[Dict]:
+    """Pick the agent class in a module and list its public and @pure methods"""
+    with open(source, 'rb') as f:
+        tree = ast.parse(f.read(), source)
+
+    classes = {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+    preferred = (f'{agent_name}Agent', f'{agent_name.title()}Agent', f'{agent_name}ExpertAgent')
+    chosen = next((classes[name] for name in preferred if name in classes), None)
+    if chosen is None:
+        chosen = next((node for node in classes.values() if _assigns_own_name(node, agent_name)), None)
+    if chosen is None:
+        chosen = next((node for node in classes.values() if node.name.endswith('Agent')), None)
+    if chosen is None:
+        return None
+
+    methods = [node for node in chosen.body
+               if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and not node.name.startswith('_')]
+    return {
+        'class': chosen.name,
+        'methods': [node.name for node in methods],
+        'pure_methods': [node.name for node in methods
+                         if any(_decorator_name(d) == 'pure' for d in node.decorator_list)],
+        'async_methods': [node.name for node in methods if isinstance(node, ast.AsyncFunctionDef)]
+    }
+
+def _assigns_own_name(node: ast.ClassDef, agent_name: str) -> bool:
+    # class ...: def __init__(self): self.name = "<agent_name>"
+    for item in node.body:
+        if isinstance(item, ast.FunctionDef) and item.name == '__init__':
+            for stmt in ast.walk(item):
+                if (isinstance(stmt, ast.Assign) and isinstance(stmt.value, ast.Constant)
+                        and stmt.value.value == agent_name
+                        and any(isinstance(t, ast.Attribute) and t.attr == 'name' for t in stmt.targets)):
+                    return True
+    return False
+
+def _decorator_name(node: ast.expr) -> Optional[str]:
+    if isinstance(node, ast.Call):
+        node = node.func
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Name):
+        return node.id
+    return None
+
+def _entry_point_agents() -> Dict[str, Dict]:
+    """Agents from installed packages: [project.entry-points."gb_salesmachine.agents"] NAME = "pkg.mod:Class" """
+    from importlib.metadata import entry_points
+
+    agents = {}
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        module, _, attr = entry_point.value.partition(':')
+        agents[entry_point.name] = {
+            'class': attr,
+            'module': module,
+            'source': f"entry point {entry_point.name} ({entry_point.dist.name if entry_point.dist else '?'})",
+            'methods': None,
+            'pure_methods': None,
+            'async_methods': None
+        }
+    return agents
+
+def _mtimes(paths: Dict) -> Dict[str, Optional[int]]:
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            mtimes[path] = None
+    return mtimes
+
+def _write(path: str, manifest: Dict):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
+    except OSError:
+        # A read-only checkout still works, it just rescans on every start
+        pass
+
+
+if __name__ == "__main__":
+    # python -m agents.discovery [--refresh]: rebuild if needed and list what was found
+    manifest = load_manifest(refresh='--refresh' in sys.argv)
+    for name, agent in manifest['agents'].items():
+        methods = agent['methods'] if agent['methods'] is not None else ['?']
+        print(f"{name:4} {agent['module']}:{agent['class']}  ({len(methods)} methods, "
+              f"{len(agent['pure_methods'] or [])} pure)")
+    for name in manifest['configured_only']:
+        print(f"{name:4} configured but not found")
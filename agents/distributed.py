@@ -0,0 +1,423 @@
+"""
+Distributed Orchestrator
+Runs agent work in separate worker processes that pull tasks from a SQLite broker
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from agents.orchestrator import AgentOrchestrator
+
+DEFAULT_BROKER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'shared', 'broker', 'broker.db')
+
+# Dispatch threads only wait on the broker, so run enough to keep a pool of workers busy
+DEFAULT_DISPATCH_WORKERS = 32
+
+# DistributedWorker settings start_local_workers can pass on the worker command line
+WORKER_OPTIONS = ('lease_seconds', 'heartbeat_interval', 'poll_interval', 'max_tasks')
+
+class TaskBroker:
+    """
+    Task table shared by a coordinator and its workers. A worker leases a task
+    for lease_seconds and keeps extending the lease with heartbeats. When a
+    worker dies its lease runs out and another worker retries the task, up to
+    max_attempts. SQLite locking needs a local disk, so workers on other
+    nodes need the broker file on storage with working POSIX locks (not NFS).
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv('AGENT_BROKER_PATH', DEFAULT_BROKER_PATH)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._local = threading.local()
+        self._db.executescript('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                task TEXT NOT NULL,
+                concurrent INTEGER,
+                agent_timeout REAL,
+                status TEXT NOT NULL,
+                worker TEXT,
+                lease_expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                result TEXT,
+                error TEXT,
+                created REAL NOT NULL,
+                updated REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created);
+            CREATE TABLE IF NOT EXISTS workers (
+                id TEXT PRIMARY KEY,
+                host TEXT,
+                pid INTEGER,
+                started REAL,
+                last_heartbeat REAL
+            );
+        ''')
+        # Brokers created before jobs carried the coordinator's agent_timeout
+        if 'agent_timeout' not in self._job_columns():
+            try:
+                self._db.execute('ALTER TABLE jobs ADD COLUMN agent_timeout REAL')
+            except sqlite3.OperationalError:
+                # Another process may have just added it; anything else is a real failure
+                if 'agent_timeout' not in self._job_columns():
+                    raise
+
+    def _job_columns(self):
+        return {row[1] for row in self._db.execute('PRAGMA table_info(jobs)')}
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        # One connection per thread; sqlite3 connections aren't safe to share
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute('PRAGMA journal_mode=WAL')
+            self._local.db = db
+        return db
+
+    def enqueue(self, task: Dict, concurrent: Optional[bool] = None, max_attempts: int = 3,
+                agent_timeout: Optional[float] = None):
+        now = time.time()
+        self._db.execute(
+            'INSERT INTO jobs (id, task, concurrent, agent_timeout, status, max_attempts, created, updated) '
+            "VALUES (?, ?, ?, ?, 'queued', ?, ?, ?)",
+            (task['id'], json.dumps(task, default=str), None if concurrent is None else int(concurrent),
+             agent_timeout, max_attempts, now, now)
+        )
+
+    def lease(self, worker_id: str, lease_seconds: float) -> Optional[Dict]:
+        """Claim the oldest runnable task (queued, or leased by a worker that stopped heartbeating)"""
+        now = time.time()
+        db = self._db
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            db.execute(
+                "UPDATE jobs SET status = 'failed', updated = ?, "
+                "error = 'Worker lost after ' || attempts || ' attempts' "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= max_attempts",
+                (now, now)
+            )
+            row = db.execute(
+                "SELECT id, task, concurrent, agent_timeout FROM jobs "
+                "WHERE status = 'queued' OR (status = 'leased' AND lease_expires < ?) "
+                "ORDER BY created LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row:
+                db.execute(
+                    "UPDATE jobs SET status = 'leased', worker = ?, lease_expires = ?, "
+                    "attempts = attempts + 1, updated = ? WHERE id = ?",
+                    (worker_id, now + lease_seconds, now, row[0])
+                )
+            db.execute('COMMIT')
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+
+        if row is None:
+            return None
+        return {'task': json.loads(row[1]), 'concurrent': None if row[2] is None else bool(row[2]),
+                'agent_timeout': row[3]}
+
+    def heartbeat(self, worker_id: str, lease_seconds: float):
+        """Mark the worker alive and extend the leases it holds"""
+        now = time.time()
+        self._db.execute(
+            'INSERT INTO workers (id, host, pid, started, last_heartbeat) VALUES (?, ?, ?, ?, ?) '
+            'ON CONFLICT(id) DO UPDATE SET last_heartbeat = excluded.last_heartbeat',
+            (worker_id, socket.gethostname(), os.getpid(), now, now)
+        )
+        self._db.execute(
+            "UPDATE jobs SET lease_expires = ? WHERE worker = ? AND status = 'leased'",
+            (now + lease_seconds, worker_id)
+        )
+
+    def complete(self, task_id: str, worker_id: str, result: Dict) -> bool:
+        """Store a result; ignored if the lease has since moved to another worker"""
+        cursor = self._db.execute(
+            "UPDATE jobs SET status = 'done', result = ?, updated = ? "
+            "WHERE id = ? AND worker = ? AND status = 'leased'",
+            (json.dumps(result, default=str), time.time(), task_id, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, task_id: str, worker_id: str, error: str):
+        """Give the task back for a retry, or fail it once attempts are used up"""
+        self._db.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END, "
+            "error = ?, worker = NULL, lease_expires = NULL, updated = ? "
+            "WHERE id = ? AND worker = ? AND status = 'leased'",
+            (error, time.time(), task_id, worker_id)
+        )
+
+    def cancel(self, task_id: str) -> bool:
+        cursor = self._db.execute(
+            "UPDATE jobs SET status = 'cancelled', updated = ? WHERE id = ? AND status IN ('queued', 'leased')",
+            (time.time(), task_id)
+        )
+        return cursor.rowcount == 1
+
+    def abort(self, task_id: str, error: str) -> bool:
+        """Fail a task that hasn't finished, whoever holds it"""
+        cursor = self._db.execute(
+            "UPDATE jobs SET status = 'failed', error = ?, updated = ? WHERE id = ? AND status IN ('queued', 'leased')",
+            (error, time.time(), task_id)
+        )
+        return cursor.rowcount == 1
+
+    def job(self, task_id: str) -> Optional[Dict]:
+        row = self._db.execute(
+            'SELECT status, worker, attempts, result, error FROM jobs WHERE id = ?', (task_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            'status': row[0],
+            'worker': row[1],
+            'attempts': row[2],
+            'result': json.loads(row[3]) if row[3] else None,
+            'error': row[4]
+        }
+
+    def workers(self, alive_within: float = 30.0) -> List[Dict]:
+        """Workers that have sent a heartbeat recently"""
+        rows = self._db.execute(
+            'SELECT id, host, pid, last_heartbeat FROM workers WHERE last_heartbeat >= ?',
+            (time.time() - alive_within,)
+        ).fetchall()
+        return [{'id': r[0], 'host': r[1], 'pid': r[2], 'last_heartbeat': r[3]} for r in rows]
+
+    def remove_worker(self, worker_id: str):
+        self._db.execute('DELETE FROM workers WHERE id = ?', (worker_id,))
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self._db.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall())
+
+    def purge(self, older_than_seconds: float = 3600.0) -> int:
+        """Delete finished jobs once their results have been collected"""
+        cursor = self._db.execute(
+            "DELETE FROM jobs WHERE status IN ('done', 'failed', 'cancelled') AND updated < ?",
+            (time.time() - older_than_seconds,)
+        )
+        return cursor.rowcount
+
+
+class DistributedWorker:
+    def __init__(self, broker_path: Optional[str] = None, worker_id: Optional[str] = None,
+                 lease_seconds: float = 30.0, heartbeat_interval: float = 5.0, poll_interval: float = 0.2):
+        self.broker = TaskBroker(broker_path)
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.lease_seconds = lease_seconds
+        self.heartbeat_interval = heartbeat_interval
+        self.poll_interval = poll_interval
+        # Agents and caches stay warm for the life of the worker
+        self.orchestrator = AgentOrchestrator()
+        self._stop = threading.Event()
+
+    def run(self, max_tasks: Optional[int] = None):
+        """Process tasks until stop() is called (or max_tasks have run)"""
+        heartbeat = threading.Thread(target=self._heartbeat_loop, name='worker-heartbeat', daemon=True)
+        self.broker.heartbeat(self.worker_id, self.lease_seconds)
+        heartbeat.start()
+        print(f"🟢 Worker {self.worker_id} polling {self.broker.path}")
+
+        processed = 0
+        while not self._stop.is_set() and (max_tasks is None or processed < max_tasks):
+            job = self.broker.lease(self.worker_id, self.lease_seconds)
+            if job is None:
+                self._stop.wait(self.poll_interval)
+                continue
+
+            task = job['task']
+            self.orchestrator.agent_timeout = job['agent_timeout']
+            try:
+                self.orchestrator._run_task_agents(task, concurrent=job['concurrent'])
+                self.broker.complete(task['id'], self.worker_id,
+                                     {'results': task['results'], 'timing': task.get('timing')})
+            except Exception as e:
+                self.broker.fail(task['id'], self.worker_id, str(e))
+            processed += 1
+
+        self._stop.set()
+        self.broker.remove_worker(self.worker_id)
+
+    def stop(self):
+        self._stop.set()
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(self.heartbeat_interval):
+            self.broker.heartbeat(self.worker_id, self.lease_seconds)
+
+
+class DistributedOrchestrator(AgentOrchestrator):
+    def __init__(self, broker_path: Optional[str] = None, task_timeout: Optional[float] = None,
+                 max_attempts: int = 3, poll_interval: float = 0.05, worker_timeout: float = 30.0, **kwargs):
+        """
+        Same API as AgentOrchestrator, but agent work runs in worker processes
+        (`python -m agents.distributed worker`). Bookkeeping (completed_tasks,
+        status counters, knowledge base) stays in this coordinator. A task fails
+        once no worker has sent a heartbeat for worker_timeout seconds.
+        """
+        kwargs.setdefault('dispatch_workers', DEFAULT_DISPATCH_WORKERS)
+        super().__init__(**kwargs)
+        self.broker = TaskBroker(broker_path)
+        self.task_timeout = task_timeout
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.worker_timeout = worker_timeout
+        self._workers = []
+
+    def _process_task(self, task: Dict, concurrent: Optional[bool] = None) -> Dict:
+        task['status'] = 'in_progress'
+        concurrent = self.concurrent if concurrent is None else concurrent
+        self.broker.enqueue(task, concurrent=concurrent, max_attempts=self.max_attempts,
+                            agent_timeout=self.agent_timeout)
+
+        job = self._wait_for(task['id'])
+        if job['status'] == 'done':
+            task['results'].update(job['result']['results'])
+            if job['result'].get('timing'):
+                task['timing'] = job['result']['timing']
+        else:
+            status = 'timeout' if job['status'] == 'cancelled' else 'failed'
+            error = job['error'] or f"Not finished after {self.task_timeout}s"
+            for agent_name in task['assigned_agents']:
+                task['results'][agent_name] = {'status': status, 'error': error,
+                                               'timestamp': datetime.now().isoformat()}
+        task['attempts'] = job['attempts']
+        return self._finish_task(task)
+
+    async def delegate_task_async(self, task_type: str, task_data: Dict, concurrent: Optional[bool] = None) -> Dict:
+        # Agents run remotely, so just wait for the broker off the event loop
+        import asyncio
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.delegate_task, task_type, task_data, concurrent
+        )
+
+    def _wait_for(self, task_id: str) -> Dict:
+        started = time.monotonic()
+        deadline = None if self.task_timeout is None else started + self.task_timeout
+        worker_seen = started
+        next_worker_check = started
+        while True:
+            job = self.broker.job(task_id)
+            if job['status'] in ('done', 'failed', 'cancelled'):
+                return job
+            now = time.monotonic()
+            if deadline is not None and now > deadline:
+                self.broker.cancel(task_id)
+                return self.broker.job(task_id)
+            if now >= next_worker_check:
+                next_worker_check = now + 1.0
+                if self._live_workers():
+                    worker_seen = now
+                elif now - worker_seen > self.worker_timeout or self._local_workers_exited():
+                    self.broker.abort(task_id, f"No live workers on {self.broker.path}")
+                    return self.broker.job(task_id)
+            time.sleep(self.poll_interval)
+
+    def _live_workers(self) -> List[Dict]:
+        """Workers with a recent heartbeat, less local ones whose process has exited"""
+        host = socket.gethostname()
+        exited = {p.pid for p in self._workers if p.poll() is not None}
+        return [w for w in self.broker.workers(alive_within=self.worker_timeout)
+                if not (w['host'] == host and w['pid'] in exited)]
+
+    def _local_workers_exited(self) -> bool:
+        return bool(self._workers) and all(p.poll() is not None for p in self._workers)
+
+    def start_local_workers(self, count: int, startup_timeout: float = 30.0, **worker_args) -> List:
+        """
+        Spawn worker processes on this machine sharing the coordinator's broker
+        and wait for each to heartbeat; raises if one exits first
+        """
+        import subprocess
+
+        unknown = set(worker_args) - set(WORKER_OPTIONS)
+        if unknown:
+            raise TypeError(f"Unknown worker options: {', '.join(sorted(unknown))}")
+
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        command = [sys.executable, '-m', 'agents.distributed', 'worker', '--broker', self.broker.path]
+        for name, value in worker_args.items():
+            command += [f"--{name.replace('_', '-')}", str(value)]
+
+        started = [subprocess.Popen(command, cwd=root) for _ in range(count)]
+        self._workers.extend(started)
+
+        host = socket.gethostname()
+        deadline = time.monotonic() + startup_timeout
+        pending = {p.pid: p for p in started}
+        while pending:
+            for worker in self.broker.workers(alive_within=self.worker_timeout):
+                if worker['host'] == host:
+                    pending.pop(worker['pid'], None)
+            exited = [p for p in pending.values() if p.poll() is not None]
+            if exited or time.monotonic() > deadline:
+                self.stop_local_workers(processes=started)
+                if exited:
+                    raise RuntimeError(f"Worker exited with status {exited[0].returncode} on startup")
+                raise RuntimeError(f"Workers didn't start within {startup_timeout}s")
+            if pending:
+                time.sleep(self.poll_interval)
+        return self._workers
+
+    def stop_local_workers(self, timeout: float = 10.0, processes: Optional[List] = None):
+        """Terminate the given worker processes, or all that start_local_workers spawned"""
+        processes = list(self._workers if processes is None else processes)
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout)
+            except Exception:
+                process.kill()
+        self._workers = [p for p in self._workers if p not in processes]
+
+    def generate_project_status(self) -> Dict:
+        status = super().generate_project_status()
+        status['broker'] = {
+            'path': self.broker.path,
+            'jobs': self.broker.counts(),
+            'workers': self.broker.workers()
+        }
+        return status
+
+
+def main(argv=None):
+    import argparse
+    import signal
+
+    parser = argparse.ArgumentParser(description='Distributed agent worker')
+    parser.add_argument('command', choices=['worker', 'status'])
+    parser.add_argument('--broker', default=None, help='Broker database path')
+    parser.add_argument('--lease-seconds', type=float, default=30.0)
+    parser.add_argument('--heartbeat-interval', type=float, default=5.0)
+    parser.add_argument('--poll-interval', type=float, default=0.2)
+    parser.add_argument('--max-tasks', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == 'status':
+        broker = TaskBroker(args.broker)
+        print(json.dumps({'jobs': broker.counts(), 'workers': broker.workers()}, indent=2))
+        return
+
+    worker = DistributedWorker(args.broker, lease_seconds=args.lease_seconds,
+                               heartbeat_interval=args.heartbeat_interval, poll_interval=args.poll_interval)
+    signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+    try:
+        worker.run(max_tasks=args.max_tasks)
+    except KeyboardInterrupt:
+        worker.stop()
+
+if __name__ == "__main__":
+    main()
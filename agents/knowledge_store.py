@@ -0,0 +1,214 @@
+"""
+Knowledge Store
+Durable append-only log of task learnings with an index by task type, agent and time
+"""
+
+import fcntl
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'shared', 'knowledge_store')
+
+class KnowledgeStore:
+    def __init__(self, directory: Optional[str] = None, keep_per_type: Optional[int] = 5000,
+                 max_age_days: Optional[float] = None, compact_every: int = 1000):
+        self.directory = directory or os.getenv('AGENT_KNOWLEDGE_DIR', DEFAULT_DIR)
+        self.log_path = os.path.join(self.directory, 'knowledge.jsonl')
+        self.index_path = os.path.join(self.directory, 'knowledge_index.db')
+        self.lock_path = os.path.join(self.directory, 'knowledge.lock')
+        self.keep_per_type = keep_per_type
+        self.max_age_days = max_age_days
+        self.compact_every = compact_every
+        self._appends_since_compaction = 0
+        self._lock = threading.RLock()
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock_fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._db = sqlite3.connect(self.index_path, check_same_thread=False)
+        with self._locked():
+            self._create_index()
+            self._catch_up_index()
+
+    def append(self, entry: Dict) -> Dict:
+        """Persist one knowledge entry (needs task_type, timestamp and agents_involved)"""
+        line = (json.dumps(entry, separators=(',', ':'), default=str) + '\n').encode('utf-8')
+
+        with self._locked():
+            with open(self.log_path, 'ab') as f:
+                offset = f.tell()
+                f.write(line)
+            self._index_entry(offset, len(line), entry)
+            self._db.commit()
+
+            self._appends_since_compaction += 1
+            if self.compact_every and self._appends_since_compaction >= self.compact_every:
+                self._compact()
+
+        return entry
+
+    def query(self, task_type: Optional[str] = None, agent: Optional[str] = None,
+              since: Optional[str] = None, until: Optional[str] = None,
+              success: Optional[bool] = None, limit: Optional[int] = None,
+              newest_first: bool = True) -> Iterator[Dict]:
+        """Stream matching entries; only the index is scanned, entries are read by offset"""
+        clauses, params = [], []
+        if task_type is not None:
+            clauses.append('e.task_type = ?')
+            params.append(task_type)
+        if agent is not None:
+            clauses.append('e.offset IN (SELECT offset FROM entry_agents WHERE agent = ?)')
+            params.append(agent)
+        if since is not None:
+            clauses.append('e.ts >= ?')
+            params.append(since)
+        if until is not None:
+            clauses.append('e.ts < ?')
+            params.append(until)
+        if success is not None:
+            clauses.append('e.success = ?')
+            params.append(1 if success else 0)
+
+        sql = 'SELECT e.offset, e.length FROM entries e'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY e.ts ' + ('DESC' if newest_first else 'ASC')
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+
+        # Open the log together with the offset lookup: compaction replaces the
+        # file rather than rewriting it, so this handle keeps the offsets valid
+        with self._locked(shared=True):
+            locations = self._db.execute(sql, params).fetchall()
+            if not locations:
+                return
+            f = open(self.log_path, 'rb')
+
+        with f:
+            for offset, length in locations:
+                f.seek(offset)
+                yield json.loads(f.read(length))
+
+    def counts(self) -> Dict[str, int]:
+        """Number of stored entries per task type"""
+        with self._locked(shared=True):
+            rows = self._db.execute('SELECT task_type, COUNT(*) FROM entries GROUP BY task_type').fetchall()
+        return dict(rows)
+
+    def __len__(self) -> int:
+        with self._locked(shared=True):
+            return self._db.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def compact(self):
+        """Rewrite the log keeping only retained entries, then rebuild the index"""
+        with self._locked():
+            self._compact()
+
+    def _compact(self):
+        if not os.path.exists(self.log_path):
+            return
+        keep = self._retained_offsets()
+        tmp_path = self.log_path + '.tmp'
+
+        with open(self.log_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+            for offset, length in keep:
+                src.seek(offset)
+                dst.write(src.read(length))
+        os.replace(tmp_path, self.log_path)
+
+        self._db.execute('DELETE FROM entry_agents')
+        self._db.execute('DELETE FROM entries')
+        self._db.commit()
+        self._catch_up_index()
+        self._appends_since_compaction = 0
+
+    @contextmanager
+    def _locked(self, shared: bool = False):
+        """
+        Serialize against other threads and, through a flock on knowledge.lock,
+        against other processes using the same directory (the daemon, CLI runs
+        and distributed workers all append to and compact one log)
+        """
+        with self._lock:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _retained_offsets(self) -> List[tuple]:
+        clauses, params = [], []
+        if self.max_age_days is not None:
+            cutoff = datetime.fromtimestamp(datetime.now().timestamp() - self.max_age_days * 86400)
+            clauses.append('ts >= ?')
+            params.append(cutoff.isoformat())
+        if self.keep_per_type is not None:
+            clauses.append('rank <= ?')
+            params.append(self.keep_per_type)
+
+        sql = '''
+            SELECT offset, length FROM (
+                SELECT offset, length, ts,
+                       ROW_NUMBER() OVER (PARTITION BY task_type ORDER BY ts DESC) AS rank
+                FROM entries
+            )
+        '''
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        return self._db.execute(sql + ' ORDER BY offset', params).fetchall()
+
+    def _create_index(self):
+        self._db.executescript('''
+            CREATE TABLE IF NOT EXISTS entries (
+                offset INTEGER PRIMARY KEY,
+                length INTEGER NOT NULL,
+                task_type TEXT,
+                ts TEXT,
+                success INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS entry_agents (
+                offset INTEGER NOT NULL,
+                agent TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_entries_type_ts ON entries(task_type, ts);
+            CREATE INDEX IF NOT EXISTS idx_entries_ts ON entries(ts);
+            CREATE INDEX IF NOT EXISTS idx_entry_agents ON entry_agents(agent, offset);
+        ''')
+
+    def _index_entry(self, offset: int, length: int, entry: Dict):
+        self._db.execute(
+            'INSERT OR REPLACE INTO entries (offset, length, task_type, ts, success) VALUES (?, ?, ?, ?, ?)',
+            (offset, length, entry.get('task_type'), entry.get('timestamp'),
+             None if entry.get('success') is None else int(bool(entry['success'])))
+        )
+        self._db.executemany(
+            'INSERT INTO entry_agents (offset, agent) VALUES (?, ?)',
+            [(offset, agent) for agent in entry.get('agents_involved', [])]
+        )
+
+    def _catch_up_index(self):
+        """Index any log lines written after the last indexed entry (or all, after a rebuild)"""
+        if not os.path.exists(self.log_path):
+            return
+
+        row = self._db.execute('SELECT offset + length FROM entries ORDER BY offset DESC LIMIT 1').fetchone()
+        position = row[0] if row else 0
+
+        with open(self.log_path, 'r+b') as f:
+            f.seek(position)
+            for line in iter(f.readline, b''):
+                if not line.endswith(b'\n'):
+                    # A torn write from a crash; drop it so the next append starts cleanly
+                    f.truncate(position)
+                    break
+                try:
+                    self._index_entry(position, len(line), json.loads(line))
+                except ValueError:
+                    pass
+                position += len(line)
+        self._db.commit()
@@ -3,52 +3,127 @@ Agent Orchestrator
 Coordinates all agents and manages task delegation
 """
 
-import json
-import importlib
+import itertools
+import threading
+import time
+from collections import deque
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+from agents.registry import AgentRegistry
+from agents.result_cache import ResultCache, is_pure
+from agents.task_queue import TaskHandle, TaskQueue
+from agents.tracing import AgentTracer
+
 class AgentOrchestrator:
-    def __init__(self):
-        self.agents = {}
-        self.task_queue = []
-        self.completed_tasks = []
-        self.knowledge_base = {}
-        
-        # Load all agents
-        self._load_agents()
-    
-    def _load_agents(self):
-        """Dynamically load all agent modules"""
-        agent_modules = {
-            'FE': 'agents.FE.agent',
-            'BE': 'agents.BE.agent',
-            'AP': 'agents.AP.agent',
-            'VP': 'agents.VP.agent',
-            'QA': 'agents.QA.agent',
-            'PM': 'agents.PM.agent',
-            'AI': 'agents.AI.agent'
+    def __init__(self, concurrent: bool = False, max_workers: int = 4, agent_timeout: Optional[float] = None,
+                 history_size: int = 1000, cache_size: Optional[int] = 1024,
+                 trace_memory: bool = False, trace_path: Optional[str] = None,
+                 dispatch_workers: Optional[int] = None):
+        self.agents = AgentRegistry()
+        self.task_queue = TaskQueue()
+        self._task_ids = itertools.count(1)
+        self._dispatchers = []
+        # Threads draining submit()ted tasks; defaults to one per worker
+        self.dispatch_workers = max_workers if dispatch_workers is None else dispatch_workers
+        # Only the most recent tasks are kept; totals live in the counters below
+        self.completed_tasks = deque(maxlen=history_size)
+        self._knowledge_base = None
+        
+        # Results of methods marked @pure; cache_size=None disables caching
+        self.result_cache = ResultCache(cache_size) if cache_size else None
+        
+        # Span per agent method call; add_hook() on it for custom instrumentation
+        self.tracer = AgentTracer(trace_memory=trace_memory, export_path=trace_path)
+        
+        # Incrementally maintained status counters
+        self._stats_lock = threading.Lock()
+        self._task_totals = {'completed': 0, 'successful': 0}
+        self._agent_stats = {}
+        self._task_type_stats = {}
+        
+        # Concurrent execution settings
+        self.concurrent = concurrent
+        self.max_workers = max_workers
+        self.agent_timeout = agent_timeout
+        self._executor = None
+        # Async path: its own pool, and a per-loop semaphore admitting at most
+        # max_workers synchronous agent calls so none waits for a thread
+        self._async_executor = None
+        self._async_admission = {}
+        
+        # Agents that must wait for others within a task type; everything else runs in parallel
+        self.agent_dependencies = {
+            'full_feature': {'QA': ['FE', 'BE', 'AP']},
+            'deploy': {'QA': ['BE'], 'PM': ['QA']}
         }
+    
+    def delegate_task(self, task_type: str, task_data: Dict, concurrent: Optional[bool] = None) -> Dict:
+        """Delegate task to appropriate agent(s)"""
+        task = self._create_task(task_type, task_data)
+        self.task_queue.track(task)
+        
+        # Process task
+        try:
+            return self._process_task(task, concurrent=concurrent)
+        finally:
+            # _finish_task already untracks it; this covers a task that raised
+            self.task_queue.remove(task['id'])
+    
+    def submit(self, task_type: str, task_data: Dict, priority: int = 0, delay: Optional[float] = None,
+               deadline: Optional[float] = None, concurrent: Optional[bool] = None) -> TaskHandle:
+        """
+        Queue a task without blocking and return a handle to it.
+        delay defers the start by that many seconds; a task still queued
+        `deadline` seconds after submission is expired instead of run.
+        """
+        from concurrent.futures import Future
         
-        for agent_name, module_path in agent_modules.items():
+        now = time.time()
+        task = self._create_task(task_type, task_data)
+        task['priority'] = priority
+        task['deadline'] = now + deadline if deadline is not None else None
+        future = Future()
+        
+        self.task_queue.push(task, priority=priority,
+                             run_at=now + delay if delay else None,
+                             deadline=task['deadline'],
+                             future=future, concurrent=concurrent)
+        self._ensure_dispatchers()
+        return TaskHandle(task, future, self.task_queue)
+    
+    def _ensure_dispatchers(self):
+        """Start background threads that drain the task queue"""
+        with self._stats_lock:
+            self._dispatchers = [t for t in self._dispatchers if t.is_alive()]
+            while len(self._dispatchers) < self.dispatch_workers:
+                thread = threading.Thread(target=self._dispatch_loop, name='orchestrator-dispatch', daemon=True)
+                thread.start()
+                self._dispatchers.append(thread)
+    
+    def _dispatch_loop(self):
+        while True:
+            entry = self.task_queue.pop()
+            task = entry['task']
+            future = entry['future']
+            if not future.set_running_or_notify_cancel():
+                continue
+            
+            if task['deadline'] is not None and time.time() > task['deadline']:
+                task['status'] = 'expired'
+                task['completed_at'] = datetime.now().isoformat()
+                future.set_result(task)
+                continue
+            
             try:
-                module = importlib.import_module(module_path)
-                agent_class = getattr(module, f'{agent_name}Agent', None)
-                if not agent_class:
-                    # Try alternative naming
-                    agent_class = getattr(module, f'{agent_name.title()}Agent', None)
-                    if not agent_class:
-                        agent_class = getattr(module, f'{agent_name}ExpertAgent', None)
-                
-                if agent_class:
-                    self.agents[agent_name] = agent_class()
-                    print(f"✅ Loaded agent: {agent_name}")
+                future.set_result(self._process_task(task, concurrent=entry['concurrent']))
             except Exception as e:
-                print(f"❌ Failed to load agent {agent_name}: {e}")
+                task['status'] = 'failed'
+                future.set_exception(e)
     
-    def delegate_task(self, task_type: str, task_data: Dict) -> Dict:
-        """Delegate task to appropriate agent(s)"""
-        task_id = f"TASK_{datetime.now().timestamp()}"
+    def _create_task(self, task_type: str, task_data: Dict) -> Dict:
+        """Build a task record with the agents responsible for its type"""
+        task_id = f"TASK_{datetime.now().timestamp()}_{next(self._task_ids)}"
         
         # Determine which agents to involve
         agent_mapping = {
@@ -75,50 +150,117 @@ class AgentOrchestrator:
             'results': {}
         }
         
-        self.task_queue.append(task)
-        
-        # Process task
-        return self._process_task(task)
+        return task
     
-    def _process_task(self, task: Dict) -> Dict:
+    def _process_task(self, task: Dict, concurrent: Optional[bool] = None) -> Dict:
         """Process a task through assigned agents"""
         task['status'] = 'in_progress'
-        
-        for agent_name in task['assigned_agents']:
-            if agent_name in self.agents:
-                agent = self.agents[agent_name]
-                
-                try:
-                    # Call appropriate method on agent
-                    result = self._execute_agent_task(agent, task)
-                    task['results'][agent_name] = {
-                        'status': 'completed',
-                        'output': result,
-                        'timestamp': datetime.now().isoformat()
-                    }
-                except Exception as e:
-                    task['results'][agent_name] = {
-                        'status': 'failed',
-                        'error': str(e),
-                        'timestamp': datetime.now().isoformat()
-                    }
-        
+        self._run_task_agents(task, concurrent=concurrent)
+        return self._finish_task(task)
+    
+    def _run_task_agents(self, task: Dict, concurrent: Optional[bool] = None):
+        """Run the task's assigned agents, filling task['results']"""
+        if self.concurrent if concurrent is None else concurrent:
+            self._run_agents_concurrently(task)
+        else:
+            for agent_name in task['assigned_agents']:
+                if agent_name in self.agents:
+                    task['results'][agent_name] = self._run_agent(agent_name, task)
+    
+    def _finish_task(self, task: Dict) -> Dict:
+        """Mark a task completed, record it and feed the knowledge base"""
         task['status'] = 'completed'
         task['completed_at'] = datetime.now().isoformat()
         
-        self.completed_tasks.append(task)
-        self.task_queue.remove(task)
+        self._record_completion(task)
+        self.task_queue.remove(task['id'])
         
         # Update knowledge base
         self._update_knowledge_base(task)
         
         return task
     
+    def _run_agent(self, agent_name: str, task: Dict) -> Dict:
+        """Run one agent on a task and wrap the outcome as a result entry"""
+        try:
+            # Agents are imported on first use, so loading can fail here too
+            agent = self.agents[agent_name]
+            
+            # Call appropriate method on agent
+            result = self._execute_agent_task(agent, task)
+            return {
+                'status': 'completed',
+                'output': result,
+                'timestamp': datetime.now().isoformat()
+            }
+        except Exception as e:
+            return {
+                'status': 'failed',
+                'error': str(e),
+                'timestamp': datetime.now().isoformat()
+            }
+    
+    def _run_agents_concurrently(self, task: Dict):
+        """Run assigned agents in parallel, holding back only those with unmet dependencies"""
+        agent_names = [name for name in task['assigned_agents'] if name in self.agents]
+        dependencies = self.agent_dependencies.get(task['type'], {})
+        nodes = {
+            name: {
+                'fn': lambda inputs, name=name: self._run_agent(name, task),
+                'depends_on': [dep for dep in dependencies.get(name, []) if dep in agent_names]
+            }
+            for name in agent_names
+        }
+        
+        # Dependencies only order agents here; a failed agent doesn't block the rest
+        run = self._scheduler(skip_dependents_on_failure=False).run(nodes)
+        for name, node_result in run['results'].items():
+            if node_result['status'] == 'completed':
+                task['results'][name] = node_result['output']
+            else:
+                task['results'][name] = {
+                    'status': node_result['status'],
+                    'error': node_result['error'],
+                    'timestamp': node_result['timestamp']
+                }
+        task['timing'] = run['timing']
+    
+    def _scheduler(self, skip_dependents_on_failure: bool = True):
+        """DAG scheduler sharing the orchestrator's worker pool"""
+        # Imported here so CLI startup doesn't pay for concurrent.futures
+        from concurrent.futures import ThreadPoolExecutor
+        from agents.scheduler import DAGScheduler
+        
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='agent')
+        return DAGScheduler(executor=self._executor, node_timeout=self.agent_timeout,
+                            skip_dependents_on_failure=skip_dependents_on_failure)
+    
     def _execute_agent_task(self, agent: Any, task: Dict) -> Any:
         """Execute specific task on agent"""
-        task_type = task['type']
         task_data = task['data']
+        method_name, method = self._resolve_agent_method(agent, task['type'])
         
+        with self.tracer.span(agent.name, method_name, task):
+            if self.result_cache is not None and is_pure(method):
+                return self.result_cache.get_or_call(agent.name, method_name, task_data,
+                                                     lambda: method(**task_data))
+            
+            result = method(**task_data)
+            if hasattr(result, '__await__'):
+                # Coroutine agent methods called from synchronous code
+                import asyncio
+                try:
+                    asyncio.get_running_loop()
+                except RuntimeError:
+                    return asyncio.run(result)
+                result.close()
+                raise RuntimeError(f"{agent.name}.{method_name} is a coroutine and an event loop is "
+                                   f"running in this thread; use delegate_task_async instead")
+            return result
+    
+    def _resolve_agent_method(self, agent: Any, task_type: str) -> tuple:
+        """Find the agent method that handles a task type"""
         # Map task types to agent methods
         method_mapping = {
             'create_component': 'create_component',
@@ -132,11 +274,152 @@ class AgentOrchestrator:
         method_name = method_mapping.get(task_type, task_type)
         
         if hasattr(agent, method_name):
-            method = getattr(agent, method_name)
-            return method(**task_data)
+            return method_name, getattr(agent, method_name)
         else:
             raise AttributeError(f"Agent {agent.name} doesn't have method {method_name}")
     
+    async def delegate_task_async(self, task_type: str, task_data: Dict, concurrent: Optional[bool] = None) -> Dict:
+        """Async delegate_task: never blocks the event loop"""
+        import asyncio
+        
+        task = self._create_task(task_type, task_data)
+        self.task_queue.track(task)
+        task['status'] = 'in_progress'
+        
+        try:
+            agent_names = [name for name in task['assigned_agents'] if name in self.agents]
+            if self.concurrent if concurrent is None else concurrent:
+                dependencies = self.agent_dependencies.get(task['type'], {})
+                started = {}
+                pending = list(agent_names)
+                while pending:
+                    # Start agents in dependency order; each awaits its upstream agents itself
+                    ready = [n for n in pending
+                             if all(d in started or d not in agent_names for d in dependencies.get(n, []))]
+                    if not ready:
+                        raise ValueError(f"Dependency cycle among agents: {', '.join(pending)}")
+                    for name in ready:
+                        upstream = [started[d] for d in dependencies.get(name, []) if d in started]
+                        started[name] = asyncio.ensure_future(self._run_agent_async(name, task, upstream))
+                        pending.remove(name)
+                
+                results = await asyncio.gather(*started.values())
+                task['results'].update(zip(started.keys(), results))
+            else:
+                for name in agent_names:
+                    task['results'][name] = await self._run_agent_async(name, task)
+            
+            # Bookkeeping touches disk (knowledge store), so keep it off the loop
+            return await asyncio.get_running_loop().run_in_executor(None, self._finish_task, task)
+        finally:
+            self.task_queue.remove(task['id'])
+    
+    async def delegate_many(self, requests: List[Dict], max_concurrency: Optional[int] = None) -> List[Dict]:
+        """
+        Run many delegations from one event loop.
+        requests: [{'task_type': ..., 'task_data': {...}, 'concurrent': optional}, ...]
+        Results come back in request order.
+        """
+        import asyncio
+        
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        
+        async def run(request):
+            call = self.delegate_task_async(request['task_type'], request.get('task_data', {}),
+                                            concurrent=request.get('concurrent'))
+            if semaphore is None:
+                return await call
+            async with semaphore:
+                return await call
+        
+        return await asyncio.gather(*(run(request) for request in requests))
+    
+    async def _run_agent_async(self, agent_name: str, task: Dict, upstream: Optional[List] = None) -> Dict:
+        """Async _run_agent; waits for upstream agents first and applies agent_timeout"""
+        import asyncio
+        
+        if upstream:
+            await asyncio.gather(*upstream)
+        
+        try:
+            # Agents are imported on first use; don't stall the loop on it
+            agent = await asyncio.get_running_loop().run_in_executor(None, self.agents.__getitem__, agent_name)
+            result = await self._execute_agent_task_async(agent, task)
+            return {
+                'status': 'completed',
+                'output': result,
+                'timestamp': datetime.now().isoformat()
+            }
+        except asyncio.TimeoutError:
+            return {
+                'status': 'timeout',
+                'error': f"Timed out after {self.agent_timeout}s",
+                'timestamp': datetime.now().isoformat()
+            }
+        except Exception as e:
+            return {
+                'status': 'failed',
+                'error': str(e),
+                'timestamp': datetime.now().isoformat()
+            }
+    
+    async def _execute_agent_task_async(self, agent: Any, task: Dict) -> Any:
+        """
+        Await coroutine agent methods; run synchronous ones on the async worker
+        pool. agent_timeout counts from admission, not from when the call was queued.
+        """
+        import asyncio
+        import inspect
+        
+        method_name, method = self._resolve_agent_method(agent, task['type'])
+        loop = asyncio.get_running_loop()
+        admission = self._admission(loop)
+        await admission.acquire()
+        
+        if inspect.iscoroutinefunction(method):
+            try:
+                # Other coroutines share this thread, so CPU time would be meaningless
+                with self.tracer.span(agent.name, method_name, task, measure_cpu=False):
+                    return await self._with_timeout(method(**task['data']))
+            finally:
+                admission.release()
+        
+        try:
+            call = loop.run_in_executor(self._get_async_executor(), self._execute_agent_task, agent, task)
+        except BaseException:
+            admission.release()
+            raise
+        # A timed-out call keeps its thread until it returns; so does its admission
+        call.add_done_callback(lambda _: admission.release())
+        return await self._with_timeout(asyncio.shield(call))
+    
+    async def _with_timeout(self, awaitable):
+        import asyncio
+        
+        if self.agent_timeout is None:
+            return await awaitable
+        return await asyncio.wait_for(awaitable, self.agent_timeout)
+    
+    def _admission(self, loop) -> Any:
+        """Semaphore bounding agent calls in flight on this event loop"""
+        import asyncio
+        
+        with self._stats_lock:
+            # Semaphores belong to one loop; drop those of loops that have closed
+            self._async_admission = {l: s for l, s in self._async_admission.items() if not l.is_closed()}
+            if loop not in self._async_admission:
+                self._async_admission[loop] = asyncio.Semaphore(self.max_workers)
+            return self._async_admission[loop]
+    
+    def _get_async_executor(self):
+        from concurrent.futures import ThreadPoolExecutor
+        
+        with self._stats_lock:
+            if self._async_executor is None:
+                self._async_executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                          thread_name_prefix='agent-async')
+            return self._async_executor
+    
     def get_agent_collaboration(self, agents: List[str], objective: str) -> Dict:
         """Coordinate multiple agents for complex tasks"""
         collaboration = {
@@ -146,41 +429,86 @@ class AgentOrchestrator:
             'outputs': {}
         }
         
-        # Define collaboration patterns
+        # Define collaboration patterns; depends_on lists the steps whose output a step needs
         if set(agents) == {'FE', 'BE', 'AP'}:
             # Full stack feature development
             collaboration['workflow'] = [
-                {'agent': 'BE', 'task': 'Create API endpoints'},
-                {'agent': 'AP', 'task': 'Integrate external APIs'},
-                {'agent': 'FE', 'task': 'Create UI components'},
-                {'agent': 'QA', 'task': 'Test integration'}
+                {'agent': 'BE', 'task': 'Create API endpoints', 'action': 'create_api_endpoint', 'depends_on': []},
+                {'agent': 'AP', 'task': 'Integrate external APIs', 'action': 'create_api_client', 'depends_on': []},
+                {'agent': 'FE', 'task': 'Create UI components', 'action': 'create_component', 'depends_on': ['BE', 'AP']},
+                {'agent': 'QA', 'task': 'Test integration', 'action': 'create_playwright_test', 'depends_on': ['FE']}
             ]
         elif set(agents) == {'VP', 'AI'}:
             # Voice AI optimization
             collaboration['workflow'] = [
-                {'agent': 'AI', 'task': 'Generate optimized prompts'},
-                {'agent': 'VP', 'task': 'Configure voice assistant'},
-                {'agent': 'QA', 'task': 'Test voice flows'}
+                {'agent': 'AI', 'task': 'Generate optimized prompts', 'action': 'create_prompt_template', 'depends_on': []},
+                {'agent': 'VP', 'task': 'Configure voice assistant', 'action': 'create_assistant_config', 'depends_on': ['AI']},
+                {'agent': 'QA', 'task': 'Test voice flows', 'action': 'create_playwright_test', 'depends_on': ['VP']}
             ]
         
         return collaboration
     
-    def _update_knowledge_base(self, task: Dict):
-        """Update shared knowledge base with task results"""
-        task_type = task['type']
+    def run_collaboration(self, agents: List[str], objective: str, agent_data: Optional[Dict[str, Dict]] = None) -> Dict:
+        """Execute a collaboration workflow as a DAG, running independent steps in parallel"""
+        collaboration = self.get_agent_collaboration(agents, objective)
+        agent_data = agent_data or {}
         
-        if task_type not in self.knowledge_base:
-            self.knowledge_base[task_type] = []
+        nodes = {}
+        previous = None
+        for step in collaboration['workflow']:
+            step_id = step.get('id', step['agent'])
+            # Steps without explicit dependencies keep the listed order
+            depends_on = step.get('depends_on', [previous] if previous else [])
+            nodes[step_id] = {
+                'fn': lambda inputs, step=step: self._run_workflow_step(step, agent_data.get(step['agent'], {}), inputs),
+                'depends_on': depends_on
+            }
+            previous = step_id
+        
+        run = self._scheduler().run(nodes)
+        collaboration['outputs'] = {
+            step_id: result.get('output') for step_id, result in run['results'].items()
+            if result['status'] == 'completed'
+        }
+        collaboration['results'] = run['results']
+        collaboration['timing'] = run['timing']
+        return collaboration
+    
+    def _run_workflow_step(self, step: Dict, data: Dict, upstream: Dict[str, Any]) -> Any:
+        """Run one workflow step, handing upstream outputs to methods that accept them"""
+        if step['agent'] not in self.agents:
+            raise KeyError(f"Agent {step['agent']} is not loaded")
+        
+        import inspect
         
+        agent = self.agents[step['agent']]
+        data = dict(data)
+        method = getattr(agent, step.get('action', ''), None)
+        if method is not None and 'upstream' in inspect.signature(method).parameters:
+            data['upstream'] = upstream
+        
+        return self._execute_agent_task(agent, {'type': step.get('action'), 'data': data})
+    
+    @property
+    def knowledge_base(self):
+        """Persistent knowledge store, opened on first use"""
+        if self._knowledge_base is None:
+            from agents.knowledge_store import KnowledgeStore
+            self._knowledge_base = KnowledgeStore()
+        return self._knowledge_base
+    
+    def _update_knowledge_base(self, task: Dict):
+        """Update shared knowledge base with task results"""
         knowledge_entry = {
             'task_id': task['id'],
+            'task_type': task['type'],
             'timestamp': task['completed_at'],
             'agents_involved': task['assigned_agents'],
             'success': all(r['status'] == 'completed' for r in task['results'].values()),
             'learnings': self._extract_learnings(task)
         }
         
-        self.knowledge_base[task_type].append(knowledge_entry)
+        self.knowledge_base.append(knowledge_entry)
     
     def _extract_learnings(self, task: Dict) -> List[str]:
         """Extract learnings from completed task"""
@@ -195,42 +523,56 @@ class AgentOrchestrator:
         
         return learnings
     
+    def _record_completion(self, task: Dict):
+        """Add a finished task to the history and update the counters"""
+        successful = all(r['status'] == 'completed' for r in task['results'].values())
+        
+        with self._stats_lock:
+            self.completed_tasks.append(task)
+            self._task_totals['completed'] += 1
+            self._task_totals['successful'] += 1 if successful else 0
+            
+            type_stats = self._task_type_stats.setdefault(task['type'], {'completed': 0, 'successful': 0})
+            type_stats['completed'] += 1
+            type_stats['successful'] += 1 if successful else 0
+            
+            for agent_name in task['assigned_agents']:
+                agent_stats = self._agent_stats.setdefault(agent_name, {'assigned': 0, 'completed': 0})
+                agent_stats['assigned'] += 1
+                if task['results'].get(agent_name, {}).get('status') == 'completed':
+                    agent_stats['completed'] += 1
+    
     def generate_project_status(self) -> Dict:
         """Generate overall project status"""
         return {
             'active_agents': list(self.agents.keys()),
             'tasks_in_queue': len(self.task_queue),
-            'tasks_completed': len(self.completed_tasks),
+            'tasks_completed': self._task_totals['completed'],
             'success_rate': self._calculate_success_rate(),
             'agent_performance': self._calculate_agent_performance(),
-            'recent_tasks': self.completed_tasks[-5:] if self.completed_tasks else []
+            'task_type_performance': self._calculate_task_type_performance(),
+            'agent_timing': self.tracer.percentiles('agent'),
+            'method_timing': self.tracer.percentiles('method'),
+            'result_cache': self.result_cache.stats() if self.result_cache else None,
+            'recent_tasks': list(self.completed_tasks)[-5:]
         }
     
     def _calculate_success_rate(self) -> float:
         """Calculate overall task success rate"""
-        if not self.completed_tasks:
+        completed = self._task_totals['completed']
+        if not completed:
             return 0.0
         
-        successful_tasks = sum(
-            1 for task in self.completed_tasks
-            if all(r['status'] == 'completed' for r in task['results'].values())
-        )
-        
-        return (successful_tasks / len(self.completed_tasks)) * 100
+        return (self._task_totals['successful'] / completed) * 100
     
     def _calculate_agent_performance(self) -> Dict[str, Dict]:
         """Calculate performance metrics for each agent"""
         performance = {}
         
         for agent_name in self.agents.keys():
-            tasks_assigned = 0
-            tasks_completed = 0
-            
-            for task in self.completed_tasks:
-                if agent_name in task['assigned_agents']:
-                    tasks_assigned += 1
-                    if task['results'].get(agent_name, {}).get('status') == 'completed':
-                        tasks_completed += 1
+            stats = self._agent_stats.get(agent_name, {'assigned': 0, 'completed': 0})
+            tasks_assigned = stats['assigned']
+            tasks_completed = stats['completed']
             
             performance[agent_name] = {
                 'tasks_assigned': tasks_assigned,
@@ -239,26 +581,52 @@ class AgentOrchestrator:
             }
         
         return performance
+    
+    def _calculate_task_type_performance(self) -> Dict[str, Dict]:
+        """Calculate success metrics for each task type"""
+        return {
+            task_type: {
+                'tasks_completed': stats['completed'],
+                'success_rate': stats['successful'] / stats['completed'] * 100
+            }
+            for task_type, stats in self._task_type_stats.items()
+        }
+
+# Global orchestrator instance, created on first access
+_orchestrator = None
+_orchestrator_lock = threading.Lock()
+
+def get_orchestrator() -> AgentOrchestrator:
+    """Return the shared orchestrator, creating it on first use"""
+    global _orchestrator
+    if _orchestrator is None:
+        with _orchestrator_lock:
+            if _orchestrator is None:
+                _orchestrator = AgentOrchestrator()
+    return _orchestrator
 
-# Create global orchestrator instance
-orchestrator = AgentOrchestrator()
+def __getattr__(name: str):
+    # Keeps `from agents.orchestrator import orchestrator` working without import-time setup
+    if name == 'orchestrator':
+        return get_orchestrator()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Example usage functions
 def create_full_feature(feature_name: str, description: str):
     """Create a full feature using multiple agents"""
-    return orchestrator.delegate_task('full_feature', {
+    return get_orchestrator().delegate_task('full_feature', {
         'feature_name': feature_name,
         'description': description
     })
 
 def setup_api_integration(api_name: str):
     """Set up a new API integration"""
-    return orchestrator.delegate_task('integrate_api', {
+    return get_orchestrator().delegate_task('integrate_api', {
         'service_name': api_name
     })
 
 def run_full_test_suite():
     """Run complete test suite"""
-    return orchestrator.delegate_task('run_tests', {
+    return get_orchestrator().delegate_task('run_tests', {
         'test_type': 'full_suite'
     })
\ No newline at end of file
@@ -0,0 +1,66 @@
+"""
+Agent Registry
+Lazily imports and builds discovered agents on first use
+"""
+
+import importlib
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, List, Optional
+
+from agents.discovery import CONFIG_PATH, load_manifest
+
+class AgentRegistry(Mapping):
+    def __init__(self, config_path: Optional[str] = None, manifest_path: Optional[str] = None):
+        # Agent dirs, classes and agent_config.json metadata come from a cached manifest,
+        # so startup reads one file instead of importing or introspecting modules
+        self.manifest = load_manifest(manifest_path=manifest_path, config_path=config_path or CONFIG_PATH)
+        self.config = self.manifest['agents']
+        self._instances = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, agent_name: str) -> Any:
+        if agent_name not in self.config:
+            raise KeyError(agent_name)
+        if agent_name not in self._instances:
+            # Concurrent first use (threaded runs, batch mode) must build each agent once
+            with self._lock:
+                if agent_name not in self._instances:
+                    self._instances[agent_name] = self._load(agent_name)
+        return self._instances[agent_name]
+
+    def __iter__(self):
+        # Iterating lists configured agents without importing any of them
+        return iter(self.config)
+
+    def __len__(self) -> int:
+        return len(self.config)
+
+    def __contains__(self, agent_name: object) -> bool:
+        return agent_name in self.config
+
+    def loaded(self) -> List[str]:
+        """Names of agents that have been imported so far"""
+        return list(self._instances)
+
+    def metadata(self, agent_name: str) -> Dict:
+        """agent_config.json entry for an agent (no import needed)"""
+        return self.config[agent_name]['metadata']
+
+    def describe(self, agent_name: str) -> Dict:
+        """Manifest entry: module, class, public methods and which are @pure or async"""
+        return self.config[agent_name]
+
+    def _load(self, agent_name: str) -> Any:
+        entry = self.config[agent_name]
+        try:
+            module = importlib.import_module(entry['module'])
+        except Exception as e:
+            print(f"❌ Failed to load agent {agent_name}: {e}")
+            raise
+
+        agent_class = getattr(module, entry['class'], None)
+        if agent_class is None:
+            raise ImportError(f"No agent class {entry['class']} in {entry['module']}")
+        print(f"✅ Loaded agent: {agent_name}")
+        return agent_class()
@@ -0,0 +1,81 @@
+"""
+Result Cache
+Memoizes agent methods marked as pure, keyed by agent, method and canonical arguments
+"""
+
+import copy
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+_MISSING = object()
+
+def pure(method: Callable) -> Callable:
+    """Mark an agent method as a pure function of its arguments (safe to cache)"""
+    method._pure = True
+    return method
+
+def is_pure(method: Callable) -> bool:
+    return getattr(method, '_pure', False)
+
+class ResultCache:
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.uncacheable = 0
+
+    def key(self, agent_name: str, method_name: str, task_data: Dict) -> Optional[str]:
+        """Canonical cache key, or None when the arguments can't be canonicalized"""
+        try:
+            canonical = json.dumps(task_data, sort_keys=True, separators=(',', ':'))
+        except (TypeError, ValueError):
+            return None
+        return f"{agent_name}.{method_name}:{canonical}"
+
+    def get_or_call(self, agent_name: str, method_name: str, task_data: Dict, call: Callable[[], Any]) -> Any:
+        """Return the cached result or compute, store and return it"""
+        key = self.key(agent_name, method_name, task_data)
+        if key is None:
+            with self._lock:
+                self.uncacheable += 1
+            return call()
+
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is not _MISSING:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                # Callers may mutate dict/list results; never hand out the cached object
+                return copy.deepcopy(value)
+            self.misses += 1
+
+        value = call()
+
+        with self._lock:
+            self._entries[key] = copy.deepcopy(value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'uncacheable': self.uncacheable,
+            'hit_rate': (self.hits / lookups * 100) if lookups else 0.0
+        }
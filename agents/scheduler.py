@@ -0,0 +1,165 @@
+"""
+DAG Scheduler
+Runs dependency graphs of agent work in parallel and reports critical-path timing
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+class DAGScheduler:
+    def __init__(self, executor: Optional[Executor] = None, max_workers: int = 4,
+                 node_timeout: Optional[float] = None, skip_dependents_on_failure: bool = True):
+        self.executor = executor
+        self.max_workers = max_workers
+        self.node_timeout = node_timeout
+        self.skip_dependents_on_failure = skip_dependents_on_failure
+
+    def run(self, nodes: Dict[str, Dict]) -> Dict:
+        """
+        Run a graph of nodes: {node_id: {'fn': callable(inputs), 'depends_on': [...]}}
+        Each fn receives {dependency_id: output} for its completed dependencies.
+        """
+        self._check_graph(nodes)
+
+        results = {}
+        outputs = {}
+        pending = {node_id: set(node.get('depends_on', [])) for node_id, node in nodes.items()}
+        running = {}
+        own_executor = self.executor is None
+        executor = self.executor or ThreadPoolExecutor(max_workers=self.max_workers)
+        run_started = time.monotonic()
+
+        try:
+            while pending or running:
+                for node_id in [n for n, deps in pending.items() if not deps]:
+                    del pending[node_id]
+                    failed_deps = [d for d in nodes[node_id].get('depends_on', [])
+                                   if results[d]['status'] != 'completed']
+                    if failed_deps and self.skip_dependents_on_failure:
+                        results[node_id] = self._result('skipped', run_started, time.monotonic(),
+                                                         error=f"Upstream failed: {', '.join(failed_deps)}")
+                        self._release(pending, node_id)
+                        continue
+
+                    inputs = {d: outputs[d] for d in nodes[node_id].get('depends_on', []) if d in outputs}
+                    future = executor.submit(self._call, nodes[node_id]['fn'], inputs)
+                    running[future] = (node_id, time.monotonic())
+
+                if not running:
+                    continue
+
+                timeout = None
+                if self.node_timeout is not None:
+                    oldest_start = min(started for _, started in running.values())
+                    timeout = max(0.0, oldest_start + self.node_timeout - time.monotonic())
+
+                done, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+                now = time.monotonic()
+
+                for future in done:
+                    node_id, started = running.pop(future)
+                    status, value = future.result()
+                    if status == 'completed':
+                        outputs[node_id] = value
+                        results[node_id] = self._result('completed', started, now, output=value,
+                                                        offset=run_started)
+                    else:
+                        results[node_id] = self._result('failed', started, now, error=value,
+                                                        offset=run_started)
+                    self._release(pending, node_id)
+
+                if self.node_timeout is not None:
+                    for future, (node_id, started) in list(running.items()):
+                        if now - started >= self.node_timeout:
+                            # Worker threads cannot be interrupted; a late result is discarded
+                            del running[future]
+                            future.cancel()
+                            results[node_id] = self._result(
+                                'timeout', started, now, offset=run_started,
+                                error=f"Timed out after {self.node_timeout}s"
+                            )
+                            self._release(pending, node_id)
+        finally:
+            if own_executor:
+                executor.shutdown(wait=False)
+
+        return {
+            'results': results,
+            'timing': self._timing(nodes, results, time.monotonic() - run_started)
+        }
+
+    def _call(self, fn: Callable, inputs: Dict) -> tuple:
+        try:
+            return 'completed', fn(inputs)
+        except Exception as e:
+            return 'failed', str(e)
+
+    def _release(self, pending: Dict[str, set], node_id: str):
+        for deps in pending.values():
+            deps.discard(node_id)
+
+    def _result(self, status: str, started: float, finished: float, output: Any = None,
+                error: Optional[str] = None, offset: Optional[float] = None) -> Dict:
+        offset = started if offset is None else offset
+        result = {
+            'status': status,
+            'start_ms': round((started - offset) * 1000, 2),
+            'duration_ms': round((finished - started) * 1000, 2) if status != 'skipped' else 0.0,
+            'timestamp': datetime.now().isoformat()
+        }
+        if status == 'completed':
+            result['output'] = output
+        else:
+            result['error'] = error
+        return result
+
+    def _timing(self, nodes: Dict[str, Dict], results: Dict[str, Dict], wall_seconds: float) -> Dict:
+        """Longest duration-weighted path through the graph"""
+        finish = {}
+        previous = {}
+        for node_id in self._topological_order(nodes):
+            deps = nodes[node_id].get('depends_on', [])
+            best = max(deps, key=lambda d: finish[d], default=None)
+            previous[node_id] = best
+            finish[node_id] = results[node_id]['duration_ms'] + (finish[best] if best else 0.0)
+
+        path = []
+        node_id = max(finish, key=finish.get, default=None)
+        while node_id is not None:
+            path.append(node_id)
+            node_id = previous[node_id]
+
+        return {
+            'wall_ms': round(wall_seconds * 1000, 2),
+            'sum_ms': round(sum(r['duration_ms'] for r in results.values()), 2),
+            'critical_path': list(reversed(path)),
+            'critical_path_ms': round(finish[path[0]], 2) if path else 0.0
+        }
+
+    def _topological_order(self, nodes: Dict[str, Dict]) -> List[str]:
+        order, visiting, visited = [], set(), set()
+
+        def visit(node_id):
+            if node_id in visited:
+                return
+            if node_id in visiting:
+                raise ValueError(f"Dependency cycle through '{node_id}'")
+            visiting.add(node_id)
+            for dep in nodes[node_id].get('depends_on', []):
+                visit(dep)
+            visiting.discard(node_id)
+            visited.add(node_id)
+            order.append(node_id)
+
+        for node_id in nodes:
+            visit(node_id)
+        return order
+
+    def _check_graph(self, nodes: Dict[str, Dict]):
+        for node_id, node in nodes.items():
+            unknown = [d for d in node.get('depends_on', []) if d not in nodes]
+            if unknown:
+                raise ValueError(f"Node '{node_id}' depends on unknown nodes: {', '.join(unknown)}")
+        self._topological_order(nodes)
@@ -0,0 +1,130 @@
+"""
+Task Queue
+Priority queue for orchestrator tasks with deferred start, deadlines and O(1) cancellation
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Dict, Optional
+
+class TaskQueue:
+    def __init__(self):
+        self._ready = []      # (-priority, deadline, seq, task_id)
+        self._deferred = []   # (run_at, seq, task_id)
+        self._index = {}      # task_id -> entry dict
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+
+    def push(self, task: Dict, priority: int = 0, run_at: Optional[float] = None,
+             deadline: Optional[float] = None, **extra):
+        """Queue a task; higher priority first, then earliest deadline. Times are time.time() values."""
+        with self._condition:
+            if task['id'] in self._index:
+                raise ValueError(f"Task {task['id']} is already queued")
+
+            seq = next(self._counter)
+            self._index[task['id']] = dict(extra, task=task, priority=priority,
+                                           run_at=run_at, deadline=deadline)
+            if run_at is not None and run_at > time.time():
+                heapq.heappush(self._deferred, (run_at, seq, task['id']))
+            else:
+                self._push_ready(task['id'], seq)
+            self._condition.notify()
+
+    def track(self, task: Dict):
+        """Register a task the caller runs itself; it counts as queued but is never popped"""
+        with self._condition:
+            if task['id'] in self._index:
+                raise ValueError(f"Task {task['id']} is already queued")
+            self._index[task['id']] = {'task': task, 'priority': None, 'run_at': None, 'deadline': None}
+
+    def pop(self, block: bool = True, timeout: Optional[float] = None) -> Optional[Dict]:
+        """Remove and return the next runnable entry ({'task', 'priority', 'run_at', 'deadline', ...extra})"""
+        end = None if timeout is None else time.monotonic() + timeout
+
+        with self._condition:
+            while True:
+                self._promote_due()
+                while self._ready:
+                    _, _, _, task_id = heapq.heappop(self._ready)
+                    entry = self._index.pop(task_id, None)
+                    if entry is not None:
+                        return entry
+
+                if not block:
+                    return None
+
+                wait_for = None
+                if self._deferred:
+                    wait_for = max(0.0, self._deferred[0][0] - time.time())
+                if end is not None:
+                    remaining = end - time.monotonic()
+                    if remaining <= 0:
+                        return None
+                    wait_for = remaining if wait_for is None else min(wait_for, remaining)
+                self._condition.wait(wait_for)
+
+    def remove(self, task_id: str) -> bool:
+        """Drop a queued task in O(1); its heap slot is skipped when it surfaces"""
+        with self._condition:
+            return self._index.pop(task_id, None) is not None
+
+    def get(self, task_id: str) -> Optional[Dict]:
+        return self._index.get(task_id)
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _push_ready(self, task_id: str, seq: int):
+        entry = self._index[task_id]
+        deadline = entry['deadline'] if entry['deadline'] is not None else float('inf')
+        heapq.heappush(self._ready, (-entry['priority'], deadline, seq, task_id))
+
+    def _promote_due(self):
+        now = time.time()
+        while self._deferred and self._deferred[0][0] <= now:
+            _, seq, task_id = heapq.heappop(self._deferred)
+            if task_id in self._index:
+                self._push_ready(task_id, seq)
+
+        # Compact when cancelled entries dominate the heaps
+        if len(self._ready) + len(self._deferred) > 64 and len(self._index) * 2 < len(self._ready) + len(self._deferred):
+            self._ready = [item for item in self._ready if item[3] in self._index]
+            self._deferred = [item for item in self._deferred if item[2] in self._index]
+            heapq.heapify(self._ready)
+            heapq.heapify(self._deferred)
+
+
+class TaskHandle:
+    def __init__(self, task: Dict, future, queue: TaskQueue):
+        self.task = task
+        self._future = future
+        self._queue = queue
+
+    @property
+    def id(self) -> str:
+        return self.task['id']
+
+    @property
+    def status(self) -> str:
+        return self.task['status']
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def result(self, timeout: Optional[float] = None) -> Dict:
+        """Block until the task has finished (or expired) and return it"""
+        return self._future.result(timeout)
+
+    def cancel(self) -> bool:
+        """Cancel the task if it has not started yet"""
+        if self._queue.remove(self.task['id']):
+            self.task['status'] = 'cancelled'
+            self._future.cancel()
+            return True
+        return False
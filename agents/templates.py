@@ -0,0 +1,128 @@
+"""
+Template Registry
+Code templates parsed once at load time into compiled render functions
+"""
+
+import _string
+from string import Formatter
+from typing import Dict, Iterable, List, Optional
+
+_CONVERSIONS = {'r': 'repr', 's': 'str', 'a': 'ascii'}
+
+class TemplateError(ValueError):
+    pass
+
+class Template:
+    def __init__(self, source: str, name: Optional[str] = None):
+        """source uses str.format syntax: {name}, {name.attr}, {name[key]}, {name!r}, {name:>10}"""
+        self.source = source
+        self.name = name or '<template>'
+        self.fields = ()
+        self._render = self._compile()
+        self._field_set = frozenset(self.fields)
+
+    def render(self, /, **params) -> str:
+        if params.keys() != self._field_set:
+            self._check(params)
+        return self._render(params)
+
+    def render_many(self, param_sets: Iterable[Dict]) -> List[str]:
+        """Render one output per parameter dict"""
+        render, fields = self._render, self._field_set
+        results = []
+        for params in param_sets:
+            if params.keys() != fields:
+                self._check(params)
+            results.append(render(params))
+        return results
+
+    def _check(self, params: Dict):
+        missing = [f for f in self.fields if f not in params]
+        unexpected = sorted(set(params) - self._field_set)
+        problems = []
+        if missing:
+            problems.append(f"missing {', '.join(missing)}")
+        if unexpected:
+            problems.append(f"unexpected {', '.join(unexpected)}")
+        raise TemplateError(f"Template {self.name}: {'; '.join(problems)}")
+
+    def _compile(self):
+        """Generate `def render(p): return ''.join((...))` with literals and lookups inlined"""
+        try:
+            parsed = list(Formatter().parse(self.source))
+        except ValueError as e:
+            raise TemplateError(f"Template {self.name}: {e}") from None
+
+        fields = []
+        parts = []
+        for literal, field_name, spec, conversion in parsed:
+            if literal:
+                parts.append(repr(literal))
+            if field_name is None:
+                continue
+            if field_name == '' or field_name[0].isdigit():
+                raise TemplateError(f"Template {self.name}: positional placeholders aren't supported, name them")
+            if '{' in spec:
+                raise TemplateError(f"Template {self.name}: nested placeholder in format spec of {{{field_name}}}")
+
+            first, rest = _string.formatter_field_name_split(field_name)
+            if not first.isidentifier():
+                raise TemplateError(f"Template {self.name}: invalid placeholder {{{field_name}}}")
+            if first not in fields:
+                fields.append(first)
+
+            expr = f"p[{first!r}]"
+            for is_attr, key in rest:
+                expr = f"getattr({expr}, {key!r})" if is_attr else f"{expr}[{key!r}]"
+            if conversion:
+                expr = f"{_CONVERSIONS[conversion]}({expr})"
+            parts.append(f"format({expr}, {spec!r})" if spec else f"str({expr})")
+
+        self.fields = tuple(fields)
+        code = f"def render(p):\n    return ''.join(({', '.join(parts)},))\n" if parts else \
+            "def render(p):\n    return ''\n"
+        namespace = {}
+        exec(compile(code, f"<template {self.name}>", 'exec'), namespace)
+        return namespace['render']
+
+
+class TemplateRegistry:
+    def __init__(self):
+        self._templates = {}
+
+    def register(self, name: str, source: str, fields: Optional[Iterable[str]] = None) -> Template:
+        """Compile and store a template; fields, when given, must match its placeholders exactly"""
+        if name in self._templates:
+            # Re-importing an agent module registers the same source again
+            if self._templates[name].source == source:
+                return self._templates[name]
+            raise TemplateError(f"Template {name} is already registered")
+        template = Template(source, name)
+        if fields is not None and set(fields) != set(template.fields):
+            raise TemplateError(f"Template {name}: placeholders {sorted(template.fields)} "
+                                f"don't match declared fields {sorted(fields)}")
+        self._templates[name] = template
+        return template
+
+    def get(self, name: str) -> Template:
+        try:
+            return self._templates[name]
+        except KeyError:
+            raise TemplateError(f"Unknown template {name}") from None
+
+    def render(self, name: str, /, **params) -> str:
+        # Positional-only, so templates can have a {name} placeholder of their own
+        return self.get(name).render(**params)
+
+    def render_many(self, name: str, param_sets: Iterable[Dict]) -> List[str]:
+        return self.get(name).render_many(param_sets)
+
+    def names(self) -> List[str]:
+        return sorted(self._templates)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._templates
+
+
+# Shared registry the agents register their templates in at import time
+registry = TemplateRegistry()
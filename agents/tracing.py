@@ -0,0 +1,155 @@
+"""
+Agent Tracing
+Span records around agent method calls: wall time, CPU time, peak memory and errors
+"""
+
+import itertools
+import json
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+class AgentTracer:
+    def __init__(self, max_spans: int = 10000, samples_per_key: int = 1000,
+                 trace_memory: bool = False, export_path: Optional[str] = None):
+        """
+        trace_memory turns on tracemalloc for peak memory per span. It slows
+        every allocation in the process, and spans running at the same time share
+        one peak counter, so leave it off outside of profiling runs.
+        export_path streams each finished span to a JSON lines file.
+        """
+        self.spans = deque(maxlen=max_spans)
+        self.samples_per_key = samples_per_key
+        self.trace_memory = trace_memory
+        self.export_path = export_path
+        self._pre_hooks = []
+        self._post_hooks = []
+        self._samples = {'agent': {}, 'method': {}}
+        self._errors = {'agent': {}, 'method': {}}
+        self._span_ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+        if trace_memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+    def add_hook(self, pre: Optional[Callable[[Dict], None]] = None,
+                 post: Optional[Callable[[Dict], None]] = None):
+        """Register callbacks run with the span dict before and after each agent call"""
+        if pre:
+            self._pre_hooks.append(pre)
+        if post:
+            self._post_hooks.append(post)
+
+    @contextmanager
+    def span(self, agent_name: str, method_name: str, task: Dict, measure_cpu: bool = True):
+        """
+        Trace one agent method call. CPU time is per-thread, so pass
+        measure_cpu=False for coroutines sharing the event loop thread.
+        """
+        span = {
+            'span_id': next(self._span_ids),
+            'trace_id': task.get('id'),
+            'task_type': task.get('type'),
+            'agent': agent_name,
+            'method': method_name,
+            'start': datetime.now().isoformat(),
+            'status': 'completed'
+        }
+        for hook in self._pre_hooks:
+            hook(span)
+
+        memory_start = self._start_memory()
+        cpu_start = time.thread_time() if measure_cpu else None
+        wall_start = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span['status'] = 'failed'
+            span['error'] = str(e)
+            span['exception'] = type(e).__name__
+            raise
+        finally:
+            span['wall_ms'] = round((time.perf_counter() - wall_start) * 1000, 3)
+            span['cpu_ms'] = round((time.thread_time() - cpu_start) * 1000, 3) if measure_cpu else None
+            span['peak_kb'] = self._peak_memory_kb(memory_start)
+            self._finish(span)
+
+    def percentiles(self, by: str = 'agent') -> Dict[str, Dict]:
+        """Wall-time percentiles per agent ('agent') or per agent method ('method')"""
+        with self._lock:
+            samples = {key: sorted(values) for key, values in self._samples[by].items()}
+            errors = dict(self._errors[by])
+
+        return {
+            key: {
+                'count': len(values),
+                'errors': errors.get(key, 0),
+                'mean_ms': round(sum(values) / len(values), 3),
+                'p50_ms': self._percentile(values, 50),
+                'p90_ms': self._percentile(values, 90),
+                'p99_ms': self._percentile(values, 99),
+                'max_ms': values[-1]
+            }
+            for key, values in samples.items()
+        }
+
+    def export_jsonl(self, path: str) -> int:
+        """Write the retained spans as JSON lines; returns the number written"""
+        with self._lock:
+            spans = list(self.spans)
+        with open(path, 'w') as f:
+            for span in spans:
+                f.write(json.dumps(span, default=str) + '\n')
+        return len(spans)
+
+    def reset(self):
+        with self._lock:
+            self.spans.clear()
+            self._samples = {'agent': {}, 'method': {}}
+            self._errors = {'agent': {}, 'method': {}}
+
+    def _finish(self, span: Dict):
+        keys = {'agent': span['agent'], 'method': f"{span['agent']}.{span['method']}"}
+        with self._lock:
+            self.spans.append(span)
+            for by, key in keys.items():
+                samples = self._samples[by].get(key)
+                if samples is None:
+                    samples = self._samples[by][key] = deque(maxlen=self.samples_per_key)
+                samples.append(span['wall_ms'])
+                if span['status'] != 'completed':
+                    self._errors[by][key] = self._errors[by].get(key, 0) + 1
+
+            if self.export_path:
+                with open(self.export_path, 'a') as f:
+                    f.write(json.dumps(span, default=str) + '\n')
+
+        for hook in self._post_hooks:
+            hook(span)
+
+    def _start_memory(self) -> Optional[int]:
+        if not self.trace_memory:
+            return None
+        import tracemalloc
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        return current
+
+    def _peak_memory_kb(self, memory_start: Optional[int]) -> Optional[float]:
+        if memory_start is None:
+            return None
+        import tracemalloc
+        _, peak = tracemalloc.get_traced_memory()
+        return round(max(0, peak - memory_start) / 1024, 1)
+
+    @staticmethod
+    def _percentile(values: List[float], pct: float) -> float:
+        # Nearest-rank on an already sorted list
+        index = max(0, min(len(values) - 1, math.ceil(pct / 100 * len(values)) - 1))
+        return values[index]
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.ai.html_extract import HTMLExtractor
+
+def make_page(size: int) -> bytes:
+    """A business homepage padded with nav, paragraphs, scripts and styles to roughly size bytes"""
+    head = ('<html><head><title>Acme Dental</title><style>body{font-family:sans-serif}.nav a{margin:0 4px}</style>'
+            '<script>window.dataLayer=window.dataLayer||[];function gtag(){dataLayer.push(arguments)}</script></head><body>')
+    block = ('<div class="section"><h2>Our services</h2><ul class="nav"><li><a href="/cleaning">Cleaning</a></li>'
+             '<li><a href="/implants">Implants</a></li></ul><p>We have cared for families in the area for over '
+             'twenty years.   Book online or call us today.</p><table><tr><td>Mon</td><td>9-5</td></tr></table>'
+             '<script>console.log("section")</script></div>\n')
+    body = [head]
+    while sum(map(len, body)) < size:
+        body.append(block)
+    body.append('</body></html>')
+    return ''.join(body).encode()
+
+def throughput(extract, pages, threads: int) -> float:
+    # Validators call the extractor from their own threads; mimic that
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(extract, pages))
+    return len(pages) / (time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare in-thread vs process-pool HTML extraction')
+    parser.add_argument('--threads', type=int, default=8, help='Concurrent callers (default: 8)')
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1, help='Pool size (default: cores)')
+    parser.add_argument('--pages', type=int, default=64, help='Pages per size (default: 64)')
+    parser.add_argument('--sizes', default='2,8,32,128,512', help='Page sizes in KB (default: 2,8,32,128,512)')
+    args = parser.parse_args()
+
+    in_thread = HTMLExtractor(processes=0)
+    pooled = HTMLExtractor(processes=args.processes, min_pool_bytes=0)
+    # Start the workers outside the timed runs
+    pooled.extract(make_page(1024))
+
+    print(f"🧪 {args.pages} pages per size, {args.threads} calling threads, {args.processes} processes "
+          f"({os.cpu_count()} cores)")
+    print(f"  {'size':>8} {'in-thread':>12} {'pool':>12} {'speedup':>8}")
+    crossover = None
+    for kb in (int(s) for s in args.sizes.split(',')):
+        pages = [make_page(kb * 1024) for _ in range(args.pages)]
+        local = throughput(in_thread.extract, pages, args.threads)
+        remote = throughput(pooled.extract, pages, args.threads)
+        if crossover is None and remote > local:
+            crossover = kb
+        print(f"  {kb:>6}KB {local:>10.1f}/s {remote:>10.1f}/s {remote / local:>7.2f}x")
+    pooled.shutdown()
+
+    if crossover is None:
+        print("\n📊 The pool never won here; keep HTML_EXTRACT_PROCESSES=0")
+    else:
+        print(f"\n📊 The pool wins from ~{crossover}KB pages; set min_pool_bytes around {crossover * 1024}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+
+from agents.FE.agent import COMPONENT_TEMPLATES, FEAgent
+from agents.BE.agent import API_ENDPOINT_TEMPLATE, BEAgent
+
+def timed(label, fn, count):
+    # Best of 3 to keep scheduler noise out of the comparison
+    best = None
+    for _ in range(3):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"  {label:<42} {best * 1000:8.1f} ms  ({count / best:,.0f}/s)")
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark code template rendering')
+    parser.add_argument('--count', '-n', type=int, default=10000, help='Renders per case (default: 10000)')
+    args = parser.parse_args()
+    n = args.count
+
+    fe = FEAgent()
+    be = BEAgent()
+    names = [f"Widget{i}" for i in range(n)]
+    endpoints = [{'method': 'GET', 'path': f"/api/resource{i}/items", 'handler_name': f"getResource{i}"}
+                 for i in range(n)]
+    functional = COMPONENT_TEMPLATES['functional']
+
+    print(f"🧪 {n:,} components")
+    timed("str.format on the raw source (old path)", lambda: [functional.source.format(name=x) for x in names], n)
+    timed("FEAgent.create_component per call", lambda: [fe.create_component(x) for x in names], n)
+    timed("Template.render per call", lambda: [functional.render(name=x) for x in names], n)
+    timed("Template.render_many", lambda: functional.render_many({'name': x} for x in names), n)
+    timed("FEAgent.create_components", lambda: fe.create_components(names), n)
+
+    print(f"🧪 {n:,} endpoints")
+    source = API_ENDPOINT_TEMPLATE.source
+    timed("str.format on the raw source", lambda: [
+        source.format(method=e['method'], path_slug=e['path'].replace('/', '_'), handler_name=e['handler_name'])
+        for e in endpoints
+    ], n)
+    timed("BEAgent.create_api_endpoint per call", lambda: [be.create_api_endpoint(**e) for e in endpoints], n)
+    timed("BEAgent.create_api_endpoints", lambda: be.create_api_endpoints(endpoints), n)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import Config
+from src.pipeline.job_queue import JobQueue
+from src.pipeline.lead_jobs import QUEUES, run_workers
+import argparse
+import json
+
+def main():
+    parser = argparse.ArgumentParser(description='Drain the durable lead job queue (run as many as you like)')
+    parser.add_argument('--db', default=Config.LEAD_JOB_QUEUE, help='Job queue database path')
+    parser.add_argument('--queues', default=','.join(QUEUES), help='Comma-separated queues to work on')
+    parser.add_argument('--threads', type=int, default=1, help='Worker threads in this process')
+    parser.add_argument('--until-empty', action='store_true', help='Exit once the queues are drained')
+    parser.add_argument('--visibility-timeout', type=float, default=300, help='Seconds before an unfinished job is retried')
+    parser.add_argument('--stats', action='store_true', help='Print queue counts and dead letters, then exit')
+    parser.add_argument('--retry-dead', action='store_true', help='Requeue dead-lettered jobs, then exit')
+    args = parser.parse_args()
+
+    jobs = JobQueue(args.db)
+
+    if args.stats:
+        print(json.dumps({'queues': jobs.stats(), 'dead_letters': jobs.dead_letters(limit=20)}, indent=2))
+        return
+    if args.retry_dead:
+        print(f"🔁 Requeued {jobs.retry_dead()} dead-lettered jobs")
+        return
+
+    queues = [q.strip() for q in args.queues.split(',') if q.strip()]
+    print(f"👷 Working on {', '.join(queues)} from {args.db}")
+    totals = run_workers(jobs, queues, args.threads, args.until_empty, args.visibility_timeout)
+    print(f"\n📊 Jobs done: {totals['done']}, retrying: {totals['retry']}, dead-lettered: {totals['dead']}")
+
+if __name__ == "__main__":
+    main()
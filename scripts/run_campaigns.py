@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scrapers.google_maps import GoogleMapsScraper
+from src.database.setup import get_supabase_client
+from src.pipeline.fair_scheduler import FairScheduler, load_campaigns, record_spend
+from src.pipeline.leads import build_lead_pipeline, summarize
+import argparse
+import json
+import threading
+
+class CampaignScraper:
+    """Tags every scraped lead with the campaign it belongs to"""
+
+    def __init__(self, scraper: GoogleMapsScraper, campaign_id: str):
+        self.scraper = scraper
+        self.campaign_id = campaign_id
+
+    def stream_businesses(self, *args, **kwargs):
+        for lead in self.scraper.stream_businesses(*args, **kwargs):
+            lead['campaign_id'] = self.campaign_id
+            yield lead
+
+def campaign_searches(campaign: dict):
+    params = campaign.get('search_parameters') or {}
+    targets = params.get('salesTargets') or [params.get('query') or params.get('service')]
+    for target in targets:
+        query = target if isinstance(target, str) else (target or {}).get('name')
+        if query and params.get('location'):
+            yield (query, params['location'], params.get('numberOfLeads', 100))
+
+def main():
+    parser = argparse.ArgumentParser(description='Scrape leads for several campaigns, sharing capacity fairly')
+    parser.add_argument('--campaigns', help='Comma-separated campaign ids (default: every active campaign)')
+    parser.add_argument('--slots', type=int, default=8, help='Scrapes + validations in flight overall (default: 8)')
+    parser.add_argument('--campaign-concurrency', type=int, default=4, help='Slots one campaign may hold (default: 4)')
+    parser.add_argument('--tenant-concurrency', type=int, default=6, help='Slots one user may hold (default: 6)')
+    parser.add_argument('--validate', action='store_true', help='Score each lead with the AI validator before saving')
+    parser.add_argument('--min-score', type=float, default=None, help='With --validate, skip leads scoring lower')
+    args = parser.parse_args()
+
+    client = get_supabase_client()
+    query = client.table('campaigns').select('id, name, search_parameters')
+    if args.campaigns:
+        query = query.in_('id', args.campaigns.split(','))
+    else:
+        query = query.eq('status', 'active')
+    campaigns = query.execute().data
+    if not campaigns:
+        print("No campaigns to run!")
+        return
+
+    def on_stop(campaign_id, reason):
+        print(f"💸 Pausing campaign {campaign_id}: {reason}")
+        client.table('campaigns').update({'status': 'paused'}).eq('id', campaign_id).execute()
+
+    scheduler = FairScheduler(args.slots, on_stop=on_stop)
+    load_campaigns(client, scheduler, [c['id'] for c in campaigns],
+                   campaign_concurrency=args.campaign_concurrency, tenant_concurrency=args.tenant_concurrency)
+
+    validator = None
+    if args.validate:
+        from src.ai.validator import LeadValidator
+        validator = LeadValidator()
+
+    scraper = GoogleMapsScraper()
+    counts = {}
+
+    def run(campaign):
+        searches = list(campaign_searches(campaign))
+        if not searches:
+            print(f"⚠️  {campaign['name']}: no search targets and location in search_parameters")
+            return
+        # Worker counts are generous on purpose: the scheduler decides who actually runs
+        pipeline = build_lead_pipeline(
+            CampaignScraper(scraper, campaign['id']), client, validator=validator,
+            target_criteria=campaign['search_parameters'], min_score=args.min_score,
+            scrape_workers=min(len(searches), args.campaign_concurrency),
+            validate_workers=args.campaign_concurrency, scheduler=scheduler, campaign_id=campaign['id']
+        )
+        counts[campaign['name']] = summarize(pipeline.iter(searches))
+
+    print(f"🚦 Running {len(campaigns)} campaigns on {args.slots} slots")
+    # Daemon threads, so an interrupted run ends once its spend is recorded
+    # instead of carrying on unbilled
+    threads = [threading.Thread(target=run, args=(c,), daemon=True) for c in campaigns]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        # Also on Ctrl-C or a crash: what was spent so far counts against the
+        # budgets and credits the next run loads
+        record_spend(client, scheduler)
+
+    print(f"\n📊 Saved per campaign: {json.dumps(counts, indent=2)}")
+    print(f"📦 Scheduler: {json.dumps(scheduler.stats(), indent=2, default=str)}")
+
+if __name__ == "__main__":
+    main()
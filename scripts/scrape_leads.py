@@ -6,45 +6,115 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.scrapers.google_maps import GoogleMapsScraper
 from src.database.setup import get_supabase_client
+from src.config import Config
+from src.pipeline.checkpoint import CampaignCheckpoint
+from src.pipeline.leads import build_lead_pipeline, summarize
+from src.pipeline.streaming import print_report
 import argparse
+import json
+
+def run_durable(args):
+    from src.pipeline.job_queue import JobQueue
+    from src.pipeline.lead_jobs import QUEUES, enqueue_search, run_workers
+    
+    # Re-running the same search picks up whatever jobs are still outstanding
+    jobs = JobQueue(Config.LEAD_JOB_QUEUE)
+    if enqueue_search(jobs, args.query, args.location, args.max, validate=args.validate,
+                      target_criteria=args.criteria, min_score=args.min_score) is None:
+        print("♻️  Search already queued, resuming outstanding jobs")
+    
+    totals = run_workers(jobs, QUEUES, threads=max(args.validate_workers, args.persist_workers), until_empty=True)
+    stats = jobs.stats()
+    print(f"\n📊 Jobs done: {totals['done']}, dead-lettered: {totals['dead']}")
+    print(f"📦 Queue: {json.dumps(stats)}")
 
 def main():
     parser = argparse.ArgumentParser(description='Scrape business leads from Google Maps')
-    parser.add_argument('--query', '-q', required=True, help='Search query (e.g., "restaurants", "dentists")')
-    parser.add_argument('--location', '-l', required=True, help='Location (e.g., "New York, NY")')
+    parser.add_argument('--query', '-q', help='Search query (e.g., "restaurants", "dentists")')
+    parser.add_argument('--location', '-l', help='Location (e.g., "New York, NY")')
     parser.add_argument('--max', '-m', type=int, default=50, help='Maximum results (default: 50)')
+    parser.add_argument('--validate', action='store_true', help='Score each lead with the AI validator before saving')
+    parser.add_argument('--criteria', type=json.loads, default={}, help='Target criteria JSON for --validate')
+    parser.add_argument('--min-score', type=float, default=None, help='With --validate, skip leads scoring lower')
+    parser.add_argument('--validate-workers', type=int, default=4, help='Concurrent validations (default: 4)')
+    parser.add_argument('--persist-workers', type=int, default=2, help='Concurrent database writers (default: 2)')
+    parser.add_argument('--queue-size', type=int, default=50, help='Leads buffered between stages (default: 50)')
+    parser.add_argument('--report-every', type=float, default=10, help='Seconds between stage reports (0 = off)')
+    parser.add_argument('--durable', action='store_true', help='Run stages as jobs on the durable queue (resumable after a crash)')
+    parser.add_argument('--campaign', '-c', help='Checkpoint progress under this campaign name')
+    parser.add_argument('--resume', action='store_true', help='Continue the --campaign from its last checkpoint')
+    parser.add_argument('--restart', action='store_true', help="Discard the --campaign's checkpoint and start over")
     
     args = parser.parse_args()
     
+    checkpoint = None
+    if args.resume and args.restart:
+        parser.error('--resume and --restart are mutually exclusive')
+    if args.restart and not args.campaign:
+        parser.error('--restart needs --campaign')
+    if args.resume:
+        if not args.campaign:
+            parser.error('--resume needs --campaign')
+        if args.durable:
+            parser.error('--durable jobs resume on their own; drop --resume')
+        checkpoint = CampaignCheckpoint.load(args.campaign, Config.CAMPAIGN_CHECKPOINT_DIR)
+        if checkpoint is None:
+            parser.error(f"No checkpoint for campaign '{args.campaign}'")
+        if checkpoint.completed:
+            print(f"✅ Campaign '{args.campaign}' already completed")
+            return
+        # The search (and validation settings) come from the checkpoint
+        for name, value in checkpoint.search.items():
+            setattr(args, name, value)
+        print(f"♻️  Resuming campaign '{args.campaign}': " + '; '.join(checkpoint.summary()))
+    elif not (args.query and args.location):
+        parser.error('--query and --location are required')
+    elif args.campaign and not args.durable:
+        try:
+            checkpoint = CampaignCheckpoint.create(args.campaign, Config.CAMPAIGN_CHECKPOINT_DIR, {
+                'query': args.query, 'location': args.location, 'max': args.max, 'validate': args.validate,
+                'criteria': args.criteria, 'min_score': args.min_score
+            }, overwrite=args.restart)
+        except FileExistsError:
+            # Its actor run and unsaved analyses would be lost
+            parser.error(f"Campaign '{args.campaign}' already has a checkpoint; "
+                         f"continue it with --resume or discard it with --restart")
+    
     print(f"🔍 Scraping {args.query} in {args.location}...")
     
-    # Scrape data
-    scraper = GoogleMapsScraper()
-    results = scraper.search_businesses(args.query, args.location, args.max)
+    if args.durable:
+        return run_durable(args)
     
-    if not results:
+    validator = None
+    if args.validate:
+        from src.ai.validator import LeadValidator
+        validator = LeadValidator()
+    
+    # Scrape, validate and save run concurrently; a slow stage throttles the ones before it
+    pipeline = build_lead_pipeline(
+        GoogleMapsScraper(), get_supabase_client(), validator=validator,
+        target_criteria=args.criteria, min_score=args.min_score,
+        validate_workers=args.validate_workers, persist_workers=args.persist_workers,
+        queue_size=args.queue_size, checkpoint=checkpoint
+    )
+    try:
+        counts = summarize(pipeline.iter([(args.query, args.location, args.max)],
+                                         report_every=args.report_every or None))
+    finally:
+        # Also on Ctrl-C: whatever finished so far is kept for --resume
+        if checkpoint is not None:
+            checkpoint.complete()
+    
+    if checkpoint is not None and not checkpoint.completed:
+        print(f"⚠️  Campaign '{args.campaign}' has unfinished leads; rerun with --resume")
+    
+    found = pipeline.report()['stages']['scrape']['items_out']
+    if not found:
         print("No results found!")
         return
     
-    # Save to database
-    client = get_supabase_client()
-    
-    saved_count = 0
-    for lead in results:
-        try:
-            # Check if already exists
-            existing = client.table('leads').select('id').eq('google_place_id', lead['google_place_id']).execute()
-            
-            if not existing.data:
-                client.table('leads').insert(lead).execute()
-                saved_count += 1
-                print(f"✅ Saved: {lead['business_name']}")
-            else:
-                print(f"⏭️  Skipped (already exists): {lead['business_name']}")
-        except Exception as e:
-            print(f"❌ Error saving {lead['business_name']}: {e}")
-    
-    print(f"\n📊 Summary: Saved {saved_count} new leads out of {len(results)} found")
+    print_report(pipeline.report())
+    print(f"\n📊 Summary: Saved {counts['saved']} new leads out of {found} found")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
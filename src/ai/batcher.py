@@ -0,0 +1,137 @@
+"""
+Token-Aware Prompt Batcher
+Local token estimation and first-fit-decreasing packing under model limits
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+# Context window and maximum output tokens per request
+MODEL_LIMITS = {
+    'gemini-1.5-flash': {'context': 1048576, 'output': 8192},
+    'gemini-1.5-pro': {'context': 2097152, 'output': 8192},
+    'gpt-3.5-turbo': {'context': 16385, 'output': 4096},
+    'gpt-4': {'context': 8192, 'output': 4096},
+    'claude-3-opus': {'context': 200000, 'output': 4096},
+    'claude-2.1': {'context': 200000, 'output': 4096},
+}
+
+DEFAULT_LIMITS = {'context': 8192, 'output': 2048}
+
+
+class TokenEstimator:
+    def __init__(self, smoothing: float = 0.1):
+        self.smoothing = smoothing
+        self._calibration = {}
+        self._errors = {}
+        self._lock = threading.Lock()
+
+    def raw_estimate(self, text: str) -> float:
+        """Blend of the ~4 chars/token and ~0.75 words/token rules of thumb"""
+        if not text:
+            return 0.0
+        words = text.count(' ') + text.count('\n') + 1
+        return (len(text) / 4 + words * 4 / 3) / 2
+
+    def estimate(self, text: str, model: Optional[str] = None) -> int:
+        """Estimated token count, calibrated per model once counts are reported"""
+        if not text:
+            return 0
+        factor = self._calibration.get(model, 1.0)
+        return max(1, int(round(self.raw_estimate(text) * factor)))
+
+    def observe(self, model: str, text: str, actual_tokens: int):
+        """Compare an estimate with the provider-reported count and recalibrate"""
+        raw = self.raw_estimate(text)
+        if raw <= 0 or actual_tokens <= 0:
+            return
+
+        with self._lock:
+            estimated = max(1, int(round(raw * self._calibration.get(model, 1.0))))
+            errors = self._errors.setdefault(model, {'samples': 0, 'abs_pct_error': 0.0, 'signed_error': 0})
+            errors['samples'] += 1
+            errors['abs_pct_error'] += abs(estimated - actual_tokens) / actual_tokens
+            errors['signed_error'] += estimated - actual_tokens
+
+            ratio = min(2.0, max(0.5, actual_tokens / raw))
+            current = self._calibration.get(model)
+            self._calibration[model] = ratio if current is None else (
+                (1 - self.smoothing) * current + self.smoothing * ratio
+            )
+
+    def error_report(self) -> Dict[str, Dict]:
+        """Mean absolute percentage error and bias of estimates per model"""
+        with self._lock:
+            return {
+                model: {
+                    'samples': e['samples'],
+                    'mean_abs_pct_error': e['abs_pct_error'] / e['samples'],
+                    'mean_bias_tokens': e['signed_error'] / e['samples'],
+                    'calibration': self._calibration.get(model, 1.0),
+                }
+                for model, e in self._errors.items()
+            }
+
+
+default_estimator = TokenEstimator()
+
+
+def estimate_tokens(text: str, model: Optional[str] = None) -> int:
+    """Estimate tokens with the process-wide calibrated estimator"""
+    return default_estimator.estimate(text, model)
+
+
+class PromptBatcher:
+    def __init__(self, model: str, estimator: Optional[TokenEstimator] = None,
+                 max_input_tokens: Optional[int] = None, output_tokens_per_prompt: int = 256,
+                 overhead_tokens_per_prompt: int = 8):
+        limits = MODEL_LIMITS.get(model, DEFAULT_LIMITS)
+        self.model = model
+        self.estimator = estimator or default_estimator
+        self.context_limit = limits['context']
+        self.output_limit = limits['output']
+        self.max_input_tokens = max_input_tokens
+        self.output_tokens_per_prompt = output_tokens_per_prompt
+        self.overhead_tokens_per_prompt = overhead_tokens_per_prompt
+
+    @property
+    def max_prompts_per_batch(self) -> int:
+        """How many answers fit in the model's output limit"""
+        return max(1, self.output_limit // max(1, self.output_tokens_per_prompt))
+
+    def input_budget(self, prompts_in_batch: int) -> int:
+        """Input tokens available once the expected output is reserved"""
+        budget = self.context_limit - prompts_in_batch * self.output_tokens_per_prompt
+        if self.max_input_tokens is not None:
+            budget = min(budget, self.max_input_tokens)
+        return budget
+
+    def pack(self, prompts: List[str]) -> List[Dict]:
+        """First-fit-decreasing packing; each batch keeps the original prompt indices"""
+        sizes = [self.estimator.estimate(p, self.model) + self.overhead_tokens_per_prompt for p in prompts]
+        order = sorted(range(len(prompts)), key=lambda i: sizes[i], reverse=True)
+        max_count = self.max_prompts_per_batch
+
+        bins = []  # each: {'indices': [...], 'tokens': int}
+        for i in order:
+            size = sizes[i]
+            for b in bins:
+                count = len(b['indices']) + 1
+                if count <= max_count and b['tokens'] + size <= self.input_budget(count):
+                    b['indices'].append(i)
+                    b['tokens'] += size
+                    break
+            else:
+                # Oversized prompts still get a batch of their own
+                bins.append({'indices': [i], 'tokens': size})
+
+        batches = []
+        for b in bins:
+            indices = sorted(b['indices'])
+            batches.append({
+                'indices': indices,
+                'prompts': [prompts[i] for i in indices],
+                'estimated_tokens': b['tokens'],
+                'oversized': b['tokens'] > self.input_budget(len(indices)),
+            })
+        return batches
@@ -0,0 +1,120 @@
+"""
+Prompt Chain Executor
+Runs AIExpertAgent prompt chains as a dependency graph with memoized steps
+"""
+
+import hashlib
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from string import Formatter
+from typing import Any, Callable, Dict, List, Optional
+
+from src.ai.router import PromptCache
+
+
+def prompt_placeholders(prompt: str) -> List[str]:
+    """Names of the {placeholders} used in a prompt template"""
+    names = []
+    for _, field_name, _, _ in Formatter().parse(prompt):
+        if field_name and field_name not in names:
+            names.append(field_name)
+    return names
+
+
+class PromptChainExecutor:
+    def __init__(self, call_fn: Callable[[str], Any], max_workers: int = 4,
+                 cache: Optional[PromptCache] = None):
+        self.call_fn = call_fn
+        self.max_workers = max_workers
+        self.cache = cache if cache is not None else PromptCache(max_entries=4096, ttl_seconds=None)
+
+    def build_graph(self, steps: List[Dict]) -> Dict[str, Dict]:
+        """Map each step to its placeholders and the steps that produce them"""
+        producers = {}
+        for step in steps:
+            if step['output'] in producers:
+                raise ValueError(f"Output '{step['output']}' is produced by more than one step")
+            producers[step['output']] = step['step']
+
+        graph = {}
+        for step in steps:
+            inputs = prompt_placeholders(step['prompt'])
+            graph[step['step']] = {
+                'step': step,
+                'inputs': inputs,
+                'depends_on': [producers[name] for name in inputs if name in producers],
+            }
+
+        self._check_acyclic(graph)
+        return graph
+
+    def run(self, steps: List[Dict], inputs: Dict[str, Any]) -> Dict:
+        """Execute a chain; independent steps run concurrently"""
+        graph = self.build_graph(steps)
+        produced = {step['output'] for step in steps}
+        missing = sorted({name for node in graph.values() for name in node['inputs']
+                          if name not in produced and name not in inputs})
+        if missing:
+            raise ValueError(f"Missing chain inputs: {', '.join(missing)}")
+
+        values = dict(inputs)
+        report = {}
+        remaining = {name: set(node['depends_on']) for name, node in graph.items()}
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while remaining or running:
+                ready = [name for name, deps in remaining.items() if not deps]
+                for name in ready:
+                    del remaining[name]
+                    node = graph[name]
+                    resolved = {key: values[key] for key in node['inputs']}
+                    running[pool.submit(self._run_step, node['step'], resolved)] = name
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    output, step_report = future.result()
+                    values[graph[name]['step']['output']] = output
+                    report[name] = step_report
+                    for deps in remaining.values():
+                        deps.discard(name)
+
+        return {
+            'outputs': {step['output']: values[step['output']] for step in steps},
+            'steps': report,
+        }
+
+    def _run_step(self, step: Dict, resolved: Dict[str, Any]) -> tuple:
+        key = self._memo_key(step, resolved)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached, {'cached': True, 'duration_ms': 0.0}
+
+        start = time.perf_counter()
+        response = self.call_fn(step['prompt'].format(**resolved))
+        output = response if isinstance(response, str) else getattr(response, 'text', str(response))
+        self.cache.put(key, output)
+        return output, {'cached': False, 'duration_ms': (time.perf_counter() - start) * 1000}
+
+    def _memo_key(self, step: Dict, resolved: Dict[str, Any]) -> str:
+        payload = json.dumps({'prompt': step['prompt'], 'inputs': resolved}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _check_acyclic(self, graph: Dict[str, Dict]):
+        visiting, visited = set(), set()
+
+        def visit(name):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Prompt chain has a cycle through step '{name}'")
+            visiting.add(name)
+            for dep in graph[name]['depends_on']:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in graph:
+            visit(name)
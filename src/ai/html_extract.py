@@ -0,0 +1,78 @@
+"""
+HTML Text Extraction
+Website HTML to prompt text, in-thread or on a process pool so parsing isn't bound by the GIL
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from bs4 import BeautifulSoup
+from src.config import Config
+
+# Below this many bytes a page parses faster than the round trip to a worker
+# process costs; scripts/bench_html_extract.py measures the crossover on a machine
+DEFAULT_MIN_POOL_BYTES = 32 * 1024
+
+def html_to_text(html: bytes, encoding: Optional[str] = None, limit: int = 2000) -> str:
+    """
+    Visible text of a page, whitespace-collapsed and cut to limit characters.
+    Takes and returns compact values (raw bytes in, short text out) so it is
+    cheap to run in another process.
+    """
+    soup = BeautifulSoup(html, 'html.parser', from_encoding=encoding)
+
+    # Remove script and style elements
+    for script in soup(["script", "style"]):
+        script.decompose()
+
+    text = soup.get_text()
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    text = ' '.join(chunk for chunk in chunks if chunk)
+
+    return text[:limit]
+
+
+class HTMLExtractor:
+    def __init__(self, processes: Optional[int] = 0, min_pool_bytes: int = DEFAULT_MIN_POOL_BYTES):
+        """
+        processes: 0 parses in the calling thread; None uses one process per core.
+        Pages smaller than min_pool_bytes are always parsed in-thread.
+        """
+        self.processes = (os.cpu_count() or 1) if processes is None else processes
+        self.min_pool_bytes = min_pool_bytes
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def extract(self, html: bytes, encoding: Optional[str] = None, limit: int = 2000) -> str:
+        if self.processes <= 0 or len(html) < self.min_pool_bytes:
+            return html_to_text(html, encoding, limit)
+        return self._get_pool().submit(html_to_text, html, encoding, limit).result()
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        # Started on first use: validators that never see a large page pay nothing
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.processes)
+            return self._pool
+
+
+_default_extractor = None
+_default_lock = threading.Lock()
+
+
+def get_extractor() -> HTMLExtractor:
+    """Process-wide extractor configured from HTML_EXTRACT_PROCESSES"""
+    global _default_extractor
+    with _default_lock:
+        if _default_extractor is None:
+            _default_extractor = HTMLExtractor(processes=Config.HTML_EXTRACT_PROCESSES)
+        return _default_extractor
@@ -0,0 +1,210 @@
+"""
+AI Call Instrumentation
+Records tokens, latency, cache hits and estimated cost for every model call
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from src.ai.batcher import default_estimator, estimate_tokens
+from src.config import Config
+
+# USD per 1K tokens as (prompt, response). Providers report tokens, not cost, so
+# every cost figure here is an estimate from this table.
+MODEL_PRICING = {
+    'gemini-1.5-pro': (0.00125, 0.005),
+    'gemini-1.5-flash': (0.000075, 0.0003),
+    'gpt-4': (0.03, 0.06),
+    'gpt-3.5-turbo': (0.0005, 0.0015),
+    'claude-3-opus': (0.015, 0.075),
+    'claude-2.1': (0.008, 0.024),
+}
+
+
+def prompt_hash(prompt: str) -> str:
+    """Short stable hash used to group identical prompts"""
+    return hashlib.sha1(prompt.encode('utf-8')).hexdigest()[:12]
+
+
+class AICallRecorder:
+    def __init__(self, log_path: Optional[str] = None, pricing: Optional[Dict] = None,
+                 store_text: bool = False):
+        self.log_path = log_path
+        self.pricing = dict(MODEL_PRICING, **(pricing or {}))
+        self.store_text = store_text
+        self._lock = threading.Lock()
+        self._totals = self._empty_counters()
+        self._by_model = {}
+        self._by_template = {}
+        self._by_prompt = {}
+        self._listeners = []
+
+    def add_listener(self, listener: Callable[[Dict], None]):
+        """Register a callback invoked with every recorded entry"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[Dict], None]):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def call(self, model: str, fn: Callable, prompt: str, template: Optional[str] = None,
+             cache_hit: bool = False, **kwargs) -> Any:
+        """Invoke fn(prompt, **kwargs) and record one call"""
+        start = time.perf_counter()
+        response = None
+        error = None
+        try:
+            response = fn(prompt, **kwargs)
+            return response
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            prompt_tokens, response_tokens = self._extract_usage(model, prompt, response)
+            self.record(
+                model=model,
+                prompt=prompt,
+                response_text=self._response_text(response),
+                prompt_tokens=prompt_tokens,
+                response_tokens=response_tokens,
+                latency_ms=elapsed_ms,
+                template=template,
+                cache_hit=cache_hit,
+                error=error,
+            )
+
+    def record(self, model: str, prompt: str, prompt_tokens: int, response_tokens: int,
+               latency_ms: float, template: Optional[str] = None, cache_hit: bool = False,
+               error: Optional[Exception] = None, response_text: str = "") -> Dict:
+        """Record a single call and update the aggregate counters"""
+        cost = 0.0 if cache_hit else self.estimate_cost(model, prompt_tokens, response_tokens)
+        entry = {
+            'ts': datetime.now().isoformat(timespec='milliseconds'),
+            'model': model,
+            'tmpl': template,
+            'ph': prompt_hash(prompt),
+            'pt': prompt_tokens,
+            'rt': response_tokens,
+            'ms': round(latency_ms, 2),
+            'hit': cache_hit,
+            'cost': round(cost, 8),
+        }
+        if error is not None:
+            entry['err'] = type(error).__name__
+        if self.store_text:
+            entry['prompt'] = prompt
+            entry['response'] = response_text
+
+        with self._lock:
+            for bucket in (self._totals,
+                           self._by_model.setdefault(model, self._empty_counters()),
+                           self._by_template.setdefault(template or '-', self._empty_counters()),
+                           self._by_prompt.setdefault(entry['ph'], self._empty_counters())):
+                self._accumulate(bucket, entry)
+            if self.log_path:
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            listener(entry)
+
+        return entry
+
+    def estimate_cost(self, model: str, prompt_tokens: int, response_tokens: int) -> float:
+        """Estimate USD cost from the per-1K token price table"""
+        prompt_price, response_price = self.pricing.get(model, (0.0, 0.0))
+        return (prompt_tokens * prompt_price + response_tokens * response_price) / 1000
+
+    def summary(self) -> Dict:
+        """Aggregate counters overall, per model and per template"""
+        with self._lock:
+            return {
+                'totals': self._finalize(self._totals),
+                'by_model': {k: self._finalize(v) for k, v in self._by_model.items()},
+                'by_template': {k: self._finalize(v) for k, v in self._by_template.items()},
+            }
+
+    def most_expensive_prompts(self, limit: int = 10) -> List[Dict]:
+        """Prompt hashes ranked by total estimated cost"""
+        with self._lock:
+            ranked = sorted(self._by_prompt.items(), key=lambda kv: kv[1]['cost'], reverse=True)
+            return [dict(self._finalize(counters), ph=ph) for ph, counters in ranked[:limit]]
+
+    def reset(self):
+        """Clear all aggregate counters (the log file is left untouched)"""
+        with self._lock:
+            self._totals = self._empty_counters()
+            self._by_model.clear()
+            self._by_template.clear()
+            self._by_prompt.clear()
+
+    def _extract_usage(self, model: str, prompt: str, response: Any) -> tuple:
+        """Read provider-reported token counts, falling back to a local estimate"""
+        usage = getattr(response, 'usage_metadata', None)
+        if usage is not None:
+            prompt_tokens = getattr(usage, 'prompt_token_count', None)
+            response_tokens = getattr(usage, 'candidates_token_count', None)
+            if prompt_tokens is not None and response_tokens is not None:
+                # Keep the local estimator honest against real counts
+                default_estimator.observe(model, prompt, int(prompt_tokens))
+                return int(prompt_tokens), int(response_tokens)
+
+        return estimate_tokens(prompt, model), estimate_tokens(self._response_text(response), model)
+
+    def _response_text(self, response: Any) -> str:
+        if response is None:
+            return ""
+        if isinstance(response, str):
+            return response
+        try:
+            return response.text or ""
+        except Exception:
+            return ""
+
+    def _empty_counters(self) -> Dict:
+        return {'calls': 0, 'errors': 0, 'cache_hits': 0, 'prompt_tokens': 0,
+                'response_tokens': 0, 'latency_ms': 0.0, 'cost': 0.0}
+
+    def _accumulate(self, counters: Dict, entry: Dict):
+        counters['calls'] += 1
+        counters['errors'] += 1 if 'err' in entry else 0
+        counters['cache_hits'] += 1 if entry['hit'] else 0
+        counters['prompt_tokens'] += entry['pt']
+        counters['response_tokens'] += entry['rt']
+        counters['latency_ms'] += entry['ms']
+        counters['cost'] += entry['cost']
+
+    def _finalize(self, counters: Dict) -> Dict:
+        result = dict(counters)
+        calls = counters['calls']
+        result['avg_latency_ms'] = counters['latency_ms'] / calls if calls else 0.0
+        result['cache_hit_rate'] = counters['cache_hits'] / calls if calls else 0.0
+        result['cost'] = round(counters['cost'], 6)
+        return result
+
+
+_default_recorder = None
+_default_lock = threading.Lock()
+
+
+def get_recorder() -> AICallRecorder:
+    """Process-wide recorder configured from AI_CALL_LOG"""
+    global _default_recorder
+    with _default_lock:
+        if _default_recorder is None:
+            log_path = Config.AI_CALL_LOG
+            if log_path:
+                os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+            _default_recorder = AICallRecorder(log_path=log_path,
+                                               store_text=Config.AI_CALL_LOG_TEXT)
+        return _default_recorder
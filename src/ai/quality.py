@@ -0,0 +1,130 @@
+"""
+AI Response Quality Metrics
+Batch-scores logged AI responses with vectorized string operations
+"""
+
+import json
+import sys
+from typing import Dict, Optional
+
+import pandas as pd
+
+# Expected response format per prompt template (the recorder's 'tmpl' field)
+DEFAULT_EXPECTED_FORMATS = {
+    'analyze_business': {
+        'type': 'json',
+        'required_fields': ['business_description', 'services', 'target_market',
+                            'company_size', 'relevance_score', 'recommendation'],
+    },
+    'lead_qualification': {
+        'type': 'json',
+        'required_fields': ['match_score', 'strengths', 'concerns', 'recommendation', 'next_steps'],
+    },
+    'email_generation': {
+        'type': 'text',
+        'required_fields': ['subject:', 'body:'],
+    },
+    'content_analysis': {
+        'type': 'json',
+        'required_fields': [],
+    },
+}
+
+METRICS = ['completeness', 'format_compliance', 'coherence', 'non_empty']
+
+# A sentence (text before a '.') whose stripped length is at most 10 characters
+_SHORT_SENTENCE = r'(?:^|\.)\s*(?:[^.\s][^.]{0,8}[^.\s]|[^.\s])?\s*\.'
+_CODE_FENCE = r'^```(?:json)?\s*|\s*```$'
+
+
+def _is_json(text: str) -> bool:
+    try:
+        json.loads(text)
+        return True
+    except ValueError:
+        return False
+
+
+class QualityScorer:
+    def __init__(self, expected_formats: Optional[Dict[str, Dict]] = None):
+        self.expected_formats = expected_formats or DEFAULT_EXPECTED_FORMATS
+
+    def load_log(self, path: str) -> pd.DataFrame:
+        """Read an AI call log (JSONL) into a columnar table"""
+        df = pd.read_json(path, lines=True)
+        if 'response' not in df.columns:
+            raise ValueError(f"{path} has no response text; record calls with AI_CALL_LOG_TEXT=1")
+        return df
+
+    def score(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Add one column per metric plus 'overall' to a table of responses"""
+        scored = df.copy()
+        response = scored['response'].fillna('').astype(str)
+        lowered = response.str.lower()
+        templates = scored['tmpl'].fillna('-') if 'tmpl' in scored.columns else pd.Series('-', index=scored.index)
+
+        scored['non_empty'] = (response.str.strip().str.len() > 0).astype(float)
+        scored['completeness'] = 1.0
+        scored['format_compliance'] = scored['non_empty']
+
+        for template, index in templates.groupby(templates).groups.items():
+            expected = self.expected_formats.get(template)
+            if not expected:
+                continue
+
+            fields = expected.get('required_fields', [])
+            if fields:
+                found = sum(lowered.loc[index].str.contains(f.lower(), regex=False).astype(int) for f in fields)
+                scored.loc[index, 'completeness'] = found / len(fields)
+
+            if expected.get('type') == 'json':
+                scored.loc[index, 'format_compliance'] = self._json_compliance(response.loc[index])
+
+        sentence_count = response.str.count(r'\.')
+        has_short_sentence = response.str.contains(_SHORT_SENTENCE, regex=True)
+        scored['coherence'] = 0.0
+        scored.loc[sentence_count >= 1, 'coherence'] = 0.5
+        scored.loc[(sentence_count >= 1) & ~has_short_sentence, 'coherence'] = 0.8
+
+        scored['overall'] = scored[METRICS].mean(axis=1)
+        return scored
+
+    def report(self, scored: pd.DataFrame, by: str) -> pd.DataFrame:
+        """Aggregate metrics (plus cost and latency when logged) per template or model"""
+        aggregations = {metric: 'mean' for metric in METRICS + ['overall']}
+        for column, how in (('cost', 'sum'), ('ms', 'mean'), ('pt', 'mean'), ('rt', 'mean')):
+            if column in scored.columns:
+                aggregations[column] = how
+
+        grouped = scored.fillna({by: '-'}).groupby(by)
+        result = grouped.agg(aggregations)
+        result.insert(0, 'calls', grouped.size())
+        return result.sort_values('overall')
+
+    def campaign_report(self, path: str) -> Dict[str, pd.DataFrame]:
+        """Score a whole log and return per-template and per-model reports"""
+        scored = self.score(self.load_log(path))
+        return {
+            'by_template': self.report(scored, 'tmpl'),
+            'by_model': self.report(scored, 'model'),
+        }
+
+    def _json_compliance(self, response: pd.Series) -> pd.Series:
+        stripped = response.str.strip().str.replace(_CODE_FENCE, '', regex=True)
+        candidate = stripped.str.match(r'^\{[\s\S]*\}$')
+        compliance = pd.Series(0.0, index=response.index)
+        # Only rows that already look like an object need a real parse
+        compliance[candidate] = stripped[candidate].map(_is_json).astype(float)
+        return compliance
+
+
+if __name__ == "__main__":
+    from src.config import Config
+
+    log_path = sys.argv[1] if len(sys.argv) > 1 else Config.AI_CALL_LOG
+    if not log_path:
+        sys.exit("Usage: python -m src.ai.quality <ai_calls.jsonl> (or set AI_CALL_LOG)")
+    reports = QualityScorer().campaign_report(log_path)
+    for name, table in reports.items():
+        print(f"\n📊 Quality {name.replace('_', ' ')}")
+        print(table.round(3).to_string())
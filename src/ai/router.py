@@ -0,0 +1,203 @@
+"""
+Cost-Aware Model Router
+Picks a model per call from measured latency and estimated cost, with a prompt cache
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from src.ai.batcher import PromptBatcher
+from src.ai.instrumentation import MODEL_PRICING, AICallRecorder, get_recorder
+
+# Relative capability (higher is stronger) and a latency prior used until a
+# model has been measured.
+MODEL_PROFILES = {
+    'gemini-1.5-flash': {'quality': 2, 'latency_ms': 1200},
+    'gemini-1.5-pro': {'quality': 3, 'latency_ms': 3500},
+    'gpt-3.5-turbo': {'quality': 2, 'latency_ms': 1500},
+    'gpt-4': {'quality': 4, 'latency_ms': 6000},
+    'claude-3-opus': {'quality': 4, 'latency_ms': 7000},
+}
+
+COMPLEXITY_QUALITY = {
+    'simple': 1,
+    'moderate': 3,
+    'complex': 4,
+}
+
+
+class PromptCache:
+    def __init__(self, max_entries: int = 1024, ttl_seconds: Optional[float] = 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, model: str, prompt: str) -> str:
+        return hashlib.sha256(f"{model}\x00{prompt}".encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Any:
+        """Return the cached response or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, value = entry
+            if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ModelRouter:
+    def __init__(self, models: Optional[List[str]] = None, recorder: Optional[AICallRecorder] = None,
+                 cache: Optional[PromptCache] = None, smoothing: float = 0.2):
+        self.models = list(models or MODEL_PROFILES.keys())
+        self.recorder = recorder or get_recorder()
+        self.cache = cache if cache is not None else PromptCache()
+        self.smoothing = smoothing
+        self._stats = {}
+        self._lock = threading.Lock()
+        self.recorder.add_listener(self._observe)
+
+    def select_model(self, task_complexity: str = 'moderate', latency_slo_ms: Optional[float] = None,
+                     models: Optional[List[str]] = None) -> str:
+        """
+        Cheapest model capable of the task that meets the latency SLO.
+        models restricts the choice (e.g. to the ones a caller's client can run).
+        """
+        candidates = self.models if models is None else [m for m in self.models if m in models]
+        if not candidates:
+            raise ValueError(f"None of {models} are routable (router has {self.models})")
+        required = COMPLEXITY_QUALITY.get(task_complexity, COMPLEXITY_QUALITY['moderate'])
+        capable = [m for m in candidates if MODEL_PROFILES.get(m, {}).get('quality', 0) >= required]
+        if not capable:
+            # Nothing is strong enough; fall back to the strongest we have
+            capable = [max(candidates, key=lambda m: MODEL_PROFILES.get(m, {}).get('quality', 0))]
+
+        if latency_slo_ms is not None:
+            within_slo = [m for m in capable if self.expected_latency_ms(m) <= latency_slo_ms]
+            if not within_slo:
+                return min(capable, key=self.expected_latency_ms)
+            capable = within_slo
+
+        return min(capable, key=lambda m: (self.expected_cost_per_1k(m), self.expected_latency_ms(m)))
+
+    def call(self, prompt: str, call_fn: Callable[[str, str], Any], task_complexity: str = 'moderate',
+             latency_slo_ms: Optional[float] = None, template: Optional[str] = None,
+             model: Optional[str] = None, use_cache: bool = True, models: Optional[List[str]] = None) -> Any:
+        """Route one prompt: call_fn(model, prompt) runs only on a cache miss"""
+        model = model or self.select_model(task_complexity, latency_slo_ms, models)
+        key = self.cache.key(model, prompt)
+
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.recorder.record(model=model, prompt=prompt, prompt_tokens=0,
+                                     response_tokens=0, latency_ms=0.0,
+                                     template=template, cache_hit=True)
+                return cached
+
+        response = self.recorder.call(model, lambda p: call_fn(model, p), prompt, template=template)
+        if use_cache:
+            self.cache.put(key, response)
+        return response
+
+    def optimize_prompt(self, prompt: str) -> str:
+        """Reduce prompt size while maintaining quality"""
+        optimized = re.sub(r'\s+', ' ', prompt)
+
+        replacements = {
+            'Please provide': 'Provide',
+            'Make sure to': 'Must',
+            'It is important that': 'Important:',
+            'In your response': 'Response:',
+        }
+
+        for old, new in replacements.items():
+            optimized = optimized.replace(old, new)
+
+        return optimized.strip()
+
+    def batch_requests(self, prompts: List[str], model: Optional[str] = None,
+                       max_tokens: Optional[int] = None, output_tokens_per_prompt: int = 256) -> List[List[str]]:
+        """Pack prompts into batches that fit the model's context and output limits"""
+        batcher = PromptBatcher(model or self.select_model('simple'), max_input_tokens=max_tokens,
+                                output_tokens_per_prompt=output_tokens_per_prompt)
+        return [batch['prompts'] for batch in batcher.pack(prompts)]
+
+    def expected_latency_ms(self, model: str) -> float:
+        stats = self._stats.get(model)
+        if stats and stats['latency_ms'] is not None:
+            return stats['latency_ms']
+        return MODEL_PROFILES.get(model, {}).get('latency_ms', float('inf'))
+
+    def expected_cost_per_1k(self, model: str) -> float:
+        """
+        Blended USD per 1K tokens. Providers don't report cost, so this is the
+        price table applied to the prompt/response token mix of observed calls.
+        """
+        stats = self._stats.get(model)
+        if stats and stats['cost_per_1k'] is not None:
+            return stats['cost_per_1k']
+        prompt_price, response_price = MODEL_PRICING.get(model, (float('inf'), float('inf')))
+        return (prompt_price + response_price) / 2
+
+    def model_stats(self) -> Dict[str, Dict]:
+        """Current latency and cost estimates for every routable model"""
+        return {
+            m: {
+                'expected_latency_ms': self.expected_latency_ms(m),
+                'estimated_cost_per_1k': self.expected_cost_per_1k(m),
+                'observed_calls': self._stats.get(m, {}).get('calls', 0),
+            }
+            for m in self.models
+        }
+
+    def close(self):
+        """Stop following the recorder (it outlives routers; each one adds a listener)"""
+        self.recorder.remove_listener(self._observe)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _observe(self, entry: Dict):
+        """Fold a recorded call into the per-model moving averages"""
+        if entry['hit'] or 'err' in entry:
+            return
+        model = entry['model']
+        tokens = entry['pt'] + entry['rt']
+        alpha = self.smoothing
+
+        with self._lock:
+            stats = self._stats.setdefault(model, {'calls': 0, 'latency_ms': None, 'cost_per_1k': None})
+            stats['calls'] += 1
+            stats['latency_ms'] = self._ewma(stats['latency_ms'], entry['ms'], alpha)
+            if tokens:
+                stats['cost_per_1k'] = self._ewma(stats['cost_per_1k'], entry['cost'] * 1000 / tokens, alpha)
+
+    def _ewma(self, current: Optional[float], value: float, alpha: float) -> float:
+        return value if current is None else (1 - alpha) * current + alpha * value
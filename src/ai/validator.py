@@ -1,13 +1,32 @@
 import google.generativeai as genai
+from google.api_core.exceptions import ResourceExhausted
 from typing import Dict, Optional
 import requests
-from bs4 import BeautifulSoup
 from src.config import Config
+from src.ai.html_extract import HTMLExtractor, get_extractor
+from src.ai.instrumentation import AICallRecorder, get_recorder
+from src.ai.router import ModelRouter
+from src.integrations.rate_limiter import RateLimiter, get_limiter
 
 class LeadValidator:
-    def __init__(self):
+    def __init__(self, recorder: Optional[AICallRecorder] = None, router: Optional[ModelRouter] = None,
+                 latency_slo_ms: Optional[float] = None, task_complexity: str = 'moderate',
+                 extractor: Optional[HTMLExtractor] = None, limiter: Optional[RateLimiter] = None):
         genai.configure(api_key=Config.GOOGLE_GEMINI_API_KEY)
-        self.model = genai.GenerativeModel('gemini-1.5-pro')
+        self.model_name = 'gemini-1.5-pro'
+        self.model = genai.GenerativeModel(self.model_name)
+        self.recorder = recorder or get_recorder()
+        self.router = router
+        # Only Gemini models can run here; a shared router may know others
+        self.router_models = [m for m in router.models if m.startswith('gemini-')] if router else []
+        if router and not self.router_models:
+            raise ValueError(f"LeadValidator needs a router with Gemini models, got {router.models}")
+        self.latency_slo_ms = latency_slo_ms
+        self.task_complexity = task_complexity
+        # HTML parsing is CPU-bound; give concurrent validators a process-pool extractor
+        self.extractor = extractor or get_extractor()
+        self.limiter = limiter or get_limiter('gemini')
+        self._models = {self.model_name: self.model}
     
     def analyze_business(self, business_data: Dict, target_criteria: Dict) -> Dict:
         """
@@ -45,10 +64,23 @@ class LeadValidator:
         """
         
         try:
-            response = self.model.generate_content(prompt)
+            if self.router:
+                response = self.router.call(
+                    prompt, self._generate, task_complexity=self.task_complexity,
+                    latency_slo_ms=self.latency_slo_ms, template='analyze_business',
+                    models=self.router_models
+                )
+            else:
+                self.limiter.acquire()
+                response = self.recorder.call(
+                    self.model_name, self.model.generate_content, prompt, template='analyze_business'
+                )
             analysis = self._parse_response(response.text)
             return analysis
         except Exception as e:
+            if isinstance(e, ResourceExhausted):
+                # Gemini's 429: slow every worker down, not just this one
+                self.limiter.backoff(10)
             print(f"Error analyzing business: {e}")
             return {
                 'relevance_score': 0,
@@ -56,22 +88,19 @@ class LeadValidator:
                 'error': str(e)
             }
     
+    def _generate(self, model_name: str, prompt: str):
+        """Run a prompt on the named Gemini model (used by the router)"""
+        if model_name not in self._models:
+            self._models[model_name] = genai.GenerativeModel(model_name)
+        self.limiter.acquire()
+        return self._models[model_name].generate_content(prompt)
+    
     def _fetch_website_content(self, url: str) -> str:
         """Fetch and extract text from website"""
         try:
             response = requests.get(url, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            text = soup.get_text()
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
-            
-            return text[:2000]  # Limit content length
+            # Same encoding response.text would have decoded with
+            return self.extractor.extract(response.content, response.encoding, limit=2000)  # Limit content length
         except:
             return ""
     
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -16,4 +17,27 @@ class Config:
     
     CONTACTOUT_API_KEY = os.getenv('CONTACTOUT_API_KEY')
     
-    VAPI_API_KEY = os.getenv('VAPI_API_KEY')
\ No newline at end of file
+    VAPI_API_KEY = os.getenv('VAPI_API_KEY')
+    
+    # Per-call AI instrumentation (JSONL), off unless AI_CALL_LOG is set (e.g. logs/ai_calls.jsonl).
+    # Set AI_CALL_LOG_TEXT=1 to keep prompt/response text.
+    AI_CALL_LOG = os.getenv('AI_CALL_LOG') or None
+    AI_CALL_LOG_TEXT = os.getenv('AI_CALL_LOG_TEXT', '0') == '1'
+    
+    # Worker processes for website HTML parsing in LeadValidator (0 = parse in the calling thread)
+    HTML_EXTRACT_PROCESSES = int(os.getenv('HTML_EXTRACT_PROCESSES', '0'))
+
+    # Durable lead job queue (SQLite) shared by scrape_leads.py --durable and scripts/lead_worker.py
+    LEAD_JOB_QUEUE = os.getenv('LEAD_JOB_QUEUE', 'data/lead_jobs.db')
+
+    # Per-campaign progress files for scrape_leads.py --campaign/--resume
+    CAMPAIGN_CHECKPOINT_DIR = os.getenv('CAMPAIGN_CHECKPOINT_DIR', 'data/checkpoints')
+
+    # External API limits in requests per minute, shared by every worker process on the host
+    API_RATE_LIMITS = {
+        'apify': int(os.getenv('APIFY_RATE_LIMIT', '100')),
+        'contactout': int(os.getenv('CONTACTOUT_RATE_LIMIT', '50')),
+        'gemini': int(os.getenv('GEMINI_RATE_LIMIT', '60')),
+        'vapi': int(os.getenv('VAPI_RATE_LIMIT', '100')),
+    }
+    RATE_LIMIT_DIR = os.getenv('RATE_LIMIT_DIR') or os.path.join(tempfile.gettempdir(), 'gb-ratelimits')
@@ -0,0 +1,116 @@
+"""
+API Rate Limiter
+Token buckets shared by every process on the host through a locked state file
+"""
+
+import fcntl
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from src.config import Config
+
+# tokens, last refill (wall clock seconds)
+_STATE = struct.Struct('dd')
+
+class RateLimitTimeout(Exception):
+    """Waiting for a token would take longer than the caller allowed"""
+
+
+class RateLimiter:
+    """
+    A token bucket whose state lives in a small file; each acquire takes an
+    exclusive flock, refills, reserves its tokens and releases the lock before
+    sleeping. Reservations may drive the balance negative: each caller then
+    sleeps until its own tokens have been refilled, so waiters are served in
+    the order they asked (across threads and processes) without polling.
+
+    The bucket holds up to `burst` tokens and refills at (per_minute - burst)
+    per minute, so no 60 second window ever sees more than per_minute requests,
+    which is what providers count against.
+    """
+
+    def __init__(self, name: str, per_minute: float, burst: Optional[float] = None,
+                 state_dir: Optional[str] = None):
+        self.name = name
+        self.per_minute = per_minute
+        self.burst = max(1.0, per_minute / 10 if burst is None else burst)
+        self.rate = max(per_minute - self.burst, 1.0) / 60.0
+        state_dir = state_dir or Config.RATE_LIMIT_DIR
+        os.makedirs(state_dir, exist_ok=True)
+        self.path = os.path.join(state_dir, f"{name}.bucket")
+        self._fd = None
+        self._pid = None
+        # flock is per open file, so threads sharing _fd also need a local lock
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None) -> float:
+        """Block until the tokens are available; returns the seconds waited"""
+        with self._locked() as state:
+            balance, now = self._refill(state)
+            wait = max(0.0, (tokens - balance) / self.rate)
+            if timeout is not None and wait > timeout:
+                raise RateLimitTimeout(f"{self.name}: next slot in {wait:.1f}s")
+            state[:] = [balance - tokens, now]
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def backoff(self, seconds: float):
+        """The provider answered 429: push every waiter back by at least `seconds`"""
+        with self._locked() as state:
+            balance, now = self._refill(state)
+            state[:] = [min(balance, 0.0) - seconds * self.rate, now]
+
+    def limit(self, fn: Callable) -> Callable:
+        """Wrap fn so every call takes a token first"""
+        def limited(*args, **kwargs):
+            self.acquire()
+            return fn(*args, **kwargs)
+        return limited
+
+    def available(self) -> float:
+        with self._locked() as state:
+            return self._refill(state)[0]
+
+    def _refill(self, state):
+        balance, last = state
+        now = time.time()
+        # Clamp: a wall clock step backwards must not mint tokens
+        balance = min(self.burst, balance + max(0.0, now - last) * self.rate)
+        return balance, max(now, last)
+
+    @contextmanager
+    def _locked(self):
+        """Yield the [tokens, last] state under both locks; changes are written back"""
+        with self._lock:
+            if self._pid != os.getpid():
+                # A forked child shares the parent's open file and so its flock; open our own
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+                self._pid = os.getpid()
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                raw = os.pread(self._fd, _STATE.size, 0)
+                # A new bucket starts full
+                state = list(_STATE.unpack(raw)) if len(raw) == _STATE.size else [self.burst, time.time()]
+                original = list(state)
+                yield state
+                if state != original:
+                    os.pwrite(self._fd, _STATE.pack(*state), 0)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(service: str) -> RateLimiter:
+    """Process-wide limiter for a service in Config.API_RATE_LIMITS"""
+    with _limiters_lock:
+        if service not in _limiters:
+            _limiters[service] = RateLimiter(service, Config.API_RATE_LIMITS[service])
+        return _limiters[service]
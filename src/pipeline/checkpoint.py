@@ -0,0 +1,162 @@
+"""
+Campaign Checkpoints
+Per-campaign progress files so an interrupted scrape resumes without redoing paid work
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+class CampaignCheckpoint:
+    """
+    Records, for one campaign:
+      - the Apify actor run and its dataset, so a resume reads the same run
+        instead of starting (and paying for) a new one
+      - the dataset offset fetched so far
+      - the analyses of validated leads that aren't saved yet, so Gemini isn't asked twice
+      - the persistence watermark: every dataset item below it is finished (saved,
+        skipped or dropped); finished items above it are kept in a sparse list
+
+    Leads are tracked by object identity between fetch and finish, so the same
+    dict has to flow through the pipeline (build_lead_pipeline does that).
+    """
+
+    def __init__(self, path: str, campaign: str, search: Optional[Dict] = None, save_interval: float = 2.0):
+        self.path = path
+        self.campaign = campaign
+        self.search = search or {}
+        self.save_interval = save_interval
+        self.run_id = None
+        self.dataset_id = None
+        self.run_status = None
+        self.scrape_done = False
+        self.dataset_offset = 0
+        self.watermark = 0
+        self.finished_above = set()
+        self.validated = set()
+        self.analyses = {}
+        self.completed = False
+        self._positions = {}
+        self._lock = threading.Lock()
+        self._saved_at = 0.0
+
+    @staticmethod
+    def path_for(campaign: str, directory: str) -> str:
+        slug = re.sub(r'[^A-Za-z0-9._-]+', '-', campaign).strip('-') or 'campaign'
+        return os.path.join(directory, f"{slug}.json")
+
+    @classmethod
+    def load(cls, campaign: str, directory: str) -> Optional['CampaignCheckpoint']:
+        path = cls.path_for(campaign, directory)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            data = json.load(f)
+        checkpoint = cls(path, data['campaign'], data.get('search'))
+        checkpoint.run_id = data.get('run_id')
+        checkpoint.dataset_id = data.get('dataset_id')
+        checkpoint.run_status = data.get('run_status')
+        checkpoint.scrape_done = data.get('scrape_done', False)
+        checkpoint.dataset_offset = data.get('dataset_offset', 0)
+        checkpoint.watermark = data.get('watermark', 0)
+        checkpoint.finished_above = set(data.get('finished_above', []))
+        checkpoint.validated = set(data.get('validated', []))
+        checkpoint.analyses = data.get('analyses', {})
+        checkpoint.completed = data.get('completed', False)
+        return checkpoint
+
+    @classmethod
+    def create(cls, campaign: str, directory: str, search: Dict, overwrite: bool = False) -> 'CampaignCheckpoint':
+        """Start a fresh checkpoint; raises FileExistsError if the campaign has one, unless overwrite"""
+        path = cls.path_for(campaign, directory)
+        if not overwrite and os.path.exists(path):
+            raise FileExistsError(f"Campaign '{campaign}' already has a checkpoint at {path}")
+        checkpoint = cls(path, campaign, search)
+        checkpoint.save()
+        return checkpoint
+
+    def record_run(self, run: Dict):
+        """on_run callback for GoogleMapsScraper.stream_businesses"""
+        with self._lock:
+            self.run_id = run['id']
+            self.dataset_id = run['defaultDatasetId']
+            self.run_status = run.get('status')
+            self.scrape_done = self.run_status == 'SUCCEEDED'
+        # Losing the run id means paying for the scrape again; write it straight away
+        self.save()
+
+    def track(self, leads: Iterator[Dict], start: int) -> Iterator[Dict]:
+        """Number leads from the dataset offset they were read at, skipping finished ones"""
+        for index, lead in enumerate(leads, start):
+            with self._lock:
+                self.dataset_offset = max(self.dataset_offset, index + 1)
+                if index in self.finished_above:
+                    continue
+                self._positions[id(lead)] = index
+            yield lead
+
+    def analysis_for(self, lead: Dict) -> Optional[Dict]:
+        with self._lock:
+            return self.analyses.get(lead['google_place_id'])
+
+    def record_analysis(self, lead: Dict, analysis: Dict):
+        with self._lock:
+            self.validated.add(lead['google_place_id'])
+            self.analyses[lead['google_place_id']] = analysis
+        self.save(force=False)
+
+    def finish(self, lead: Dict):
+        """The lead needs no more work: advance the watermark past it"""
+        with self._lock:
+            index = self._positions.pop(id(lead), None)
+            # Saved leads don't need their analysis any more
+            self.analyses.pop(lead['google_place_id'], None)
+            if index is not None and index >= self.watermark:
+                self.finished_above.add(index)
+                while self.watermark in self.finished_above:
+                    self.finished_above.remove(self.watermark)
+                    self.watermark += 1
+        self.save(force=False)
+
+    def complete(self):
+        with self._lock:
+            self.completed = self.scrape_done and not self.finished_above and self.watermark >= self.dataset_offset
+        self.save()
+
+    def save(self, force: bool = True):
+        """Atomically rewrite the file; unforced saves are throttled to save_interval"""
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._saved_at < self.save_interval:
+                return
+            self._saved_at = now
+            data = {
+                'campaign': self.campaign,
+                'search': self.search,
+                'run_id': self.run_id,
+                'dataset_id': self.dataset_id,
+                'run_status': self.run_status,
+                'scrape_done': self.scrape_done,
+                'dataset_offset': self.dataset_offset,
+                'watermark': self.watermark,
+                'finished_above': sorted(self.finished_above),
+                'validated': sorted(self.validated),
+                'analyses': self.analyses,
+                'completed': self.completed,
+                'updated': time.strftime('%Y-%m-%dT%H:%M:%S')
+            }
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, 'w') as f:
+                json.dump(data, f, indent=2, default=str)
+            os.replace(tmp, self.path)
+
+    def summary(self) -> List[str]:
+        return [
+            f"run {self.run_id or '-'} ({self.run_status or 'not started'})",
+            f"{self.dataset_offset} fetched, {self.watermark} finished in order "
+            f"(+{len(self.finished_above)} beyond), {len(self.validated)} validated"
+        ]
@@ -0,0 +1,299 @@
+"""
+Fair Scheduler
+Weighted fair sharing of scrape/validate/call capacity across tenants and campaigns,
+with per-tenant and per-campaign concurrency caps and budget stops
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# What a unit of work costs, per budget dimension. Credits follow the billing
+# API routes (1 per scraped lead, 2 per enrichment, 7 per call); usd is what
+# the campaign is charged, which campaigns.budget_limit is expressed in.
+COSTS = {
+    'scrape': {'credits': 1, 'usd': 0.20},
+    'validate': {},
+    'enrich': {'credits': 2, 'usd': 2},
+    'call': {'credits': 7, 'usd': 7},
+}
+
+class BudgetExceeded(Exception):
+    """The campaign (or its tenant) can't afford more work; it has been stopped"""
+
+    def __init__(self, campaign_id: str, reason: str):
+        super().__init__(f"Campaign {campaign_id} stopped: {reason}")
+        self.campaign_id = campaign_id
+        self.reason = reason
+
+
+class _Account:
+    def __init__(self, key: str, weight: float, max_concurrency: Optional[int], budget: Optional[Dict[str, float]]):
+        self.key = key
+        self.weight = weight
+        self.max_concurrency = max_concurrency
+        # Remaining budget per dimension; dimensions that aren't listed are unlimited
+        self.budget = dict(budget or {})
+        self.spent = {}
+        self.running = 0
+        self.dispatched = 0
+        self.vtime = 0.0
+
+    def has_slot(self) -> bool:
+        return self.max_concurrency is None or self.running < self.max_concurrency
+
+    def shortfall(self, cost: Dict[str, float]) -> Optional[str]:
+        for dimension, amount in cost.items():
+            # Small tolerance so a budget spent in float steps (0.20 per lead) isn't a cent short
+            if dimension in self.budget and self.budget[dimension] < amount - 1e-9:
+                return f"{dimension} budget exhausted ({round(self.budget[dimension], 6):g} left, {amount:g} needed)"
+        return None
+
+    def charge(self, cost: Dict[str, float], sign: int = 1):
+        for dimension, amount in cost.items():
+            if dimension in self.budget:
+                self.budget[dimension] -= sign * amount
+            self.spent[dimension] = self.spent.get(dimension, 0) + sign * amount
+
+
+class _Campaign(_Account):
+    def __init__(self, key, tenant, weight, max_concurrency, budget):
+        super().__init__(key, weight, max_concurrency, budget)
+        self.tenant = tenant
+        self.waiting = []
+        self.stopped = None
+        self.halted = False
+
+
+class _Waiter:
+    def __init__(self, cost: Dict[str, float]):
+        self.cost = cost
+        self.event = threading.Event()
+        self.error = None
+
+
+class FairScheduler:
+    """
+    Workers ask for a slot before doing a unit of work for a campaign. Free
+    slots go to the tenant with the least weighted service so far, and within
+    it to its campaign with the least, so a campaign with thousands of queued
+    leads gets its share and no more. Caps bound how many slots a tenant or
+    campaign holds at once. Costs are reserved when a slot is granted; work the
+    campaign's (or its tenant's) remaining budget can't cover gets
+    BudgetExceeded, while free work such as validating leads that were already
+    paid for still runs. stop() halts a campaign outright.
+    """
+
+    def __init__(self, max_concurrency: int, on_stop=None):
+        """on_stop(campaign_id, reason) is called once when a campaign is stopped"""
+        self.max_concurrency = max_concurrency
+        self.on_stop = on_stop
+        self.running = 0
+        self._tenants: Dict[str, _Account] = {}
+        self._campaigns: Dict[str, _Campaign] = {}
+        self._lock = threading.Lock()
+
+    def add_tenant(self, tenant_id: str, weight: float = 1.0, max_concurrency: Optional[int] = None,
+                   budget: Optional[Dict[str, float]] = None):
+        with self._lock:
+            self._tenants[tenant_id] = _Account(tenant_id, weight, max_concurrency, budget)
+
+    def add_campaign(self, campaign_id: str, tenant_id: str, weight: float = 1.0,
+                     max_concurrency: Optional[int] = None, budget: Optional[Dict[str, float]] = None):
+        with self._lock:
+            if tenant_id not in self._tenants:
+                self._tenants[tenant_id] = _Account(tenant_id, 1.0, None, None)
+            self._campaigns[campaign_id] = _Campaign(campaign_id, self._tenants[tenant_id], weight,
+                                                     max_concurrency, budget)
+
+    @contextmanager
+    def slot(self, campaign_id: str, cost: Optional[Dict[str, float]] = None) -> Iterator[None]:
+        """Block until it's this campaign's turn; the reserved cost is refunded if the body raises"""
+        cost = cost or {}
+        waiter = _Waiter(cost)
+        with self._lock:
+            campaign = self._campaigns[campaign_id]
+            if campaign.halted:
+                raise BudgetExceeded(campaign_id, campaign.stopped)
+            if not campaign.waiting and campaign.running == 0:
+                self._activate(campaign)
+            campaign.waiting.append(waiter)
+            self._dispatch()
+        waiter.event.wait()
+        if waiter.error is not None:
+            raise waiter.error
+
+        try:
+            yield
+        except BaseException:
+            self.refund(campaign_id, cost)
+            raise
+        finally:
+            with self._lock:
+                campaign.running -= 1
+                campaign.tenant.running -= 1
+                self.running -= 1
+                self._dispatch()
+
+    def charge(self, campaign_id: str, cost: Dict[str, float]):
+        """Bill extra work done inside a slot, whose cost was only known once it ran; raises once over budget"""
+        with self._lock:
+            campaign = self._campaigns[campaign_id]
+            reason = ((campaign.halted and campaign.stopped) or campaign.shortfall(cost)
+                      or campaign.tenant.shortfall(cost))
+            if reason:
+                self._stop(campaign, reason)
+                raise BudgetExceeded(campaign_id, reason)
+            campaign.charge(cost)
+            campaign.tenant.charge(cost)
+
+    def refund(self, campaign_id: str, cost: Dict[str, float]):
+        """Give back a reservation for work that didn't happen"""
+        with self._lock:
+            campaign = self._campaigns[campaign_id]
+            campaign.charge(cost, -1)
+            campaign.tenant.charge(cost, -1)
+
+    def stop(self, campaign_id: str, reason: str = 'stopped'):
+        """Halt a campaign: queued and future slot requests get BudgetExceeded"""
+        with self._lock:
+            campaign = self._campaigns[campaign_id]
+            campaign.halted = True
+            self._stop(campaign, reason)
+            for waiter in campaign.waiting:
+                waiter.error = BudgetExceeded(campaign.key, reason)
+                waiter.event.set()
+            campaign.waiting = []
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                key: {
+                    'tenant': c.tenant.key,
+                    'running': c.running,
+                    'waiting': len(c.waiting),
+                    'dispatched': c.dispatched,
+                    'spent': dict(c.spent),
+                    'budget_left': dict(c.budget),
+                    'stopped': c.stopped
+                }
+                for key, c in self._campaigns.items()
+            }
+
+    def _activate(self, campaign: _Campaign):
+        # An idle campaign (or tenant) rejoins at the current virtual time instead
+        # of cashing in the share it didn't use while it was idle
+        active = [c for c in self._campaigns.values() if c is not campaign and (c.waiting or c.running)]
+        siblings = [c.vtime for c in active if c.tenant is campaign.tenant]
+        if siblings:
+            campaign.vtime = max(campaign.vtime, min(siblings))
+        tenants = [c.tenant.vtime for c in active if c.tenant is not campaign.tenant]
+        if tenants and not siblings:
+            campaign.tenant.vtime = max(campaign.tenant.vtime, min(tenants))
+
+    def _dispatch(self):
+        """Grant free slots in weighted fair order; called with the lock held"""
+        while self.running < self.max_concurrency:
+            campaign = self._next_campaign()
+            if campaign is None:
+                return
+            waiter = campaign.waiting.pop(0)
+            tenant = campaign.tenant
+            reason = campaign.shortfall(waiter.cost) or tenant.shortfall(waiter.cost)
+            if reason:
+                waiter.error = BudgetExceeded(campaign.key, reason)
+                waiter.event.set()
+                self._stop(campaign, reason)
+                continue
+
+            campaign.charge(waiter.cost)
+            tenant.charge(waiter.cost)
+            campaign.running += 1
+            tenant.running += 1
+            self.running += 1
+            campaign.dispatched += 1
+            tenant.dispatched += 1
+            campaign.vtime += 1.0 / campaign.weight
+            tenant.vtime += 1.0 / tenant.weight
+            waiter.event.set()
+
+    def _next_campaign(self) -> Optional[_Campaign]:
+        eligible = [c for c in self._campaigns.values() if c.waiting and c.has_slot() and c.tenant.has_slot()]
+        if not eligible:
+            return None
+        tenant = min((c.tenant for c in eligible), key=lambda t: t.vtime)
+        return min((c for c in eligible if c.tenant is tenant), key=lambda c: c.vtime)
+
+    def _stop(self, campaign: _Campaign, reason: str):
+        if campaign.stopped:
+            return
+        campaign.stopped = reason
+        if self.on_stop:
+            self.on_stop(campaign.key, reason)
+
+
+def load_campaigns(client, scheduler: FairScheduler, campaign_ids: Iterable[str],
+                   campaign_concurrency: Optional[int] = None, tenant_concurrency: Optional[int] = None) -> List[str]:
+    """
+    Register campaigns with their owner's remaining credits and the campaign's
+    credits_allocated (less credits its billing transactions used) and
+    budget_limit (less total_spent) as budgets
+    """
+    campaign_ids = list(campaign_ids)
+    campaigns = client.table('campaigns').select(
+        'id, budget_limit, credits_allocated, total_spent, businesses(user_id)'
+    ).in_('id', campaign_ids).execute().data
+    user_ids = list({c['businesses']['user_id'] for c in campaigns})
+    users = client.table('users').select('id, credits').in_('id', user_ids).execute().data if user_ids else []
+    credits_used = {}
+    for transaction in client.table('billing_transactions').select(
+        'campaign_id, credits_used'
+    ).in_('campaign_id', campaign_ids).execute().data:
+        campaign_id = transaction['campaign_id']
+        credits_used[campaign_id] = credits_used.get(campaign_id, 0) + (transaction.get('credits_used') or 0)
+
+    for user in users:
+        scheduler.add_tenant(user['id'], max_concurrency=tenant_concurrency,
+                             budget={'credits': user.get('credits') or 0})
+    for campaign in campaigns:
+        budget = {}
+        if campaign.get('credits_allocated'):
+            budget['credits'] = campaign['credits_allocated'] - credits_used.get(campaign['id'], 0)
+        if campaign.get('budget_limit') is not None:
+            budget['usd'] = float(campaign['budget_limit']) - float(campaign.get('total_spent') or 0)
+        scheduler.add_campaign(campaign['id'], campaign['businesses']['user_id'],
+                               max_concurrency=campaign_concurrency, budget=budget)
+    return [c['id'] for c in campaigns]
+
+def record_spend(client, scheduler: FairScheduler, recorded: Optional[Dict[str, Dict]] = None) -> Dict[str, Dict]:
+    """
+    Bill what each campaign spent since `recorded` (what the last call returned)
+    the way the billing API routes do: a 'lead_scraped' billing_transactions row,
+    whose trigger debits the owner's users.credits, plus campaigns.total_spent.
+    Returns the spend now recorded; a campaign whose write failed keeps its old entry.
+    """
+    recorded = {key: dict(spent) for key, spent in (recorded or {}).items()}
+    for campaign_id, stats in scheduler.stats().items():
+        before = recorded.get(campaign_id, {})
+        credits = stats['spent'].get('credits', 0) - before.get('credits', 0)
+        usd = round(stats['spent'].get('usd', 0) - before.get('usd', 0), 2)
+        if not credits and not usd:
+            continue
+        try:
+            client.table('billing_transactions').insert({
+                'user_id': stats['tenant'],
+                'campaign_id': campaign_id,
+                'type': 'lead_scraped',
+                'amount': usd,
+                'credits_used': int(round(credits)),
+                'description': f"Scraped leads for campaign {campaign_id} ({credits:g} credits)"
+            }).execute()
+            campaign = client.table('campaigns').select('total_spent').eq('id', campaign_id).execute().data[0]
+            client.table('campaigns').update({
+                'total_spent': round(float(campaign.get('total_spent') or 0) + usd, 2)
+            }).eq('id', campaign_id).execute()
+        except Exception as e:
+            print(f"❌ Error recording spend for campaign {campaign_id}: {e}")
+            continue
+        recorded[campaign_id] = dict(stats['spent'])
+    return recorded
@@ -0,0 +1,270 @@
+"""
+Durable Job Queue
+SQLite-backed jobs with visibility timeouts, retry backoff, dead-lettering and idempotency keys
+"""
+
+import json
+import os
+import random
+import socket
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+class JobQueue:
+    """
+    Any number of processes can share one queue file. A claimed job is invisible
+    to other workers until its visibility timeout runs out; a worker that dies
+    mid-job therefore just delays it. Failed jobs come back after an exponential
+    backoff and are dead-lettered after max_attempts. Enqueueing a (queue, key)
+    that already has a job does nothing, so re-running a producer is safe;
+    enqueue(..., rearm=True) only defers to a job that is still ready or running.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._db.executescript('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                queue TEXT NOT NULL,
+                key TEXT,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'ready',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                available_at REAL NOT NULL,
+                lease_expires REAL,
+                worker TEXT,
+                result TEXT,
+                last_error TEXT,
+                created REAL NOT NULL,
+                updated REAL NOT NULL,
+                UNIQUE (queue, key)
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs(queue, status, available_at);
+        ''')
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            self._local.db = db
+        return db
+
+    def enqueue(self, queue: str, payload: Dict, key: Optional[str] = None,
+                max_attempts: int = 5, delay: float = 0.0, rearm: bool = False) -> Optional[int]:
+        """
+        Add a job; returns its id, or None when a job with this key exists. With
+        rearm, a finished (done or dead) job with the key is reset in place and
+        runs again, so only a pending one blocks it.
+        """
+        now = time.time()
+        db = self._db
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            if rearm:
+                on_conflict = (
+                    "ON CONFLICT (queue, key) DO UPDATE SET payload = excluded.payload, status = 'ready', "
+                    'attempts = 0, max_attempts = excluded.max_attempts, available_at = excluded.available_at, '
+                    'lease_expires = NULL, worker = NULL, result = NULL, last_error = NULL, '
+                    'updated = excluded.updated '
+                    "WHERE jobs.status IN ('done', 'dead')"
+                )
+            else:
+                on_conflict = 'ON CONFLICT (queue, key) DO NOTHING'
+            cursor = db.execute(
+                'INSERT INTO jobs (queue, key, payload, max_attempts, available_at, created, updated) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?) ' + on_conflict,
+                (queue, key, json.dumps(payload, default=str), max_attempts, now + delay, now, now)
+            )
+            job_id = None
+            if cursor.rowcount:
+                job_id = cursor.lastrowid if key is None else db.execute(
+                    'SELECT id FROM jobs WHERE queue = ? AND key = ?', (queue, key)
+                ).fetchone()[0]
+            db.execute('COMMIT')
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        return job_id
+
+    def claim(self, queues: Iterable[str], worker: str, visibility_timeout: float = 300.0) -> Optional[Dict]:
+        """Take the next visible job from any of the queues (earliest first)"""
+        queues = list(queues)
+        marks = ', '.join('?' * len(queues))
+        now = time.time()
+        db = self._db
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            # Jobs whose worker vanished on their last attempt go to the dead-letter state
+            db.execute(
+                f"UPDATE jobs SET status = 'dead', updated = ?, "
+                f"last_error = COALESCE(last_error, 'Visibility timeout expired') "
+                f"WHERE queue IN ({marks}) AND status = 'running' AND lease_expires < ? "
+                f"AND attempts >= max_attempts",
+                (now, *queues, now)
+            )
+            row = db.execute(
+                f"SELECT id, queue, key, payload, attempts FROM jobs "
+                f"WHERE queue IN ({marks}) AND ((status = 'ready' AND available_at <= ?) "
+                f"OR (status = 'running' AND lease_expires < ?)) "
+                f"ORDER BY available_at LIMIT 1",
+                (*queues, now, now)
+            ).fetchone()
+            if row:
+                db.execute(
+                    "UPDATE jobs SET status = 'running', worker = ?, lease_expires = ?, "
+                    "attempts = attempts + 1, updated = ? WHERE id = ?",
+                    (worker, now + visibility_timeout, now, row[0])
+                )
+            db.execute('COMMIT')
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+
+        if row is None:
+            return None
+        return {'id': row[0], 'queue': row[1], 'key': row[2], 'payload': json.loads(row[3]),
+                'attempt': row[4] + 1, 'worker': worker}
+
+    def extend(self, job_id: int, worker: str, visibility_timeout: float = 300.0) -> bool:
+        """Keep a long-running job invisible; False if it was already handed to someone else"""
+        cursor = self._db.execute(
+            "UPDATE jobs SET lease_expires = ? WHERE id = ? AND worker = ? AND status = 'running'",
+            (time.time() + visibility_timeout, job_id, worker)
+        )
+        return cursor.rowcount == 1
+
+    def update_payload(self, job_id: int, worker: str, payload: Dict) -> bool:
+        """Save a running job's progress so its next attempt can pick up from there"""
+        cursor = self._db.execute(
+            "UPDATE jobs SET payload = ?, updated = ? WHERE id = ? AND worker = ? AND status = 'running'",
+            (json.dumps(payload, default=str), time.time(), job_id, worker)
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: int, worker: str, result: Any = None) -> bool:
+        cursor = self._db.execute(
+            "UPDATE jobs SET status = 'done', result = ?, lease_expires = NULL, updated = ? "
+            "WHERE id = ? AND worker = ? AND status = 'running'",
+            (json.dumps(result, default=str), time.time(), job_id, worker)
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: int, worker: str, error: str, backoff_base: float = 5.0,
+             backoff_max: float = 600.0) -> str:
+        """Schedule a retry with jittered exponential backoff, or dead-letter the job"""
+        db = self._db
+        row = db.execute('SELECT attempts, max_attempts FROM jobs WHERE id = ? AND worker = ?',
+                         (job_id, worker)).fetchone()
+        if row is None:
+            return 'lost'
+        attempts, max_attempts = row
+        now = time.time()
+        if attempts >= max_attempts:
+            status, available_at = 'dead', now
+        else:
+            delay = min(backoff_max, backoff_base * 2 ** (attempts - 1))
+            status, available_at = 'ready', now + delay * random.uniform(0.5, 1.0)
+        db.execute(
+            "UPDATE jobs SET status = ?, available_at = ?, last_error = ?, lease_expires = NULL, updated = ? "
+            "WHERE id = ? AND worker = ? AND status = 'running'",
+            (status, available_at, error, now, job_id, worker)
+        )
+        return status
+
+    def retry_dead(self, queue: Optional[str] = None) -> int:
+        """Give dead-lettered jobs a fresh set of attempts"""
+        sql = "UPDATE jobs SET status = 'ready', attempts = 0, available_at = ?, updated = ? WHERE status = 'dead'"
+        params = [time.time(), time.time()]
+        if queue is not None:
+            sql += ' AND queue = ?'
+            params.append(queue)
+        return self._db.execute(sql, params).rowcount
+
+    def dead_letters(self, queue: Optional[str] = None, limit: int = 100) -> List[Dict]:
+        sql = "SELECT id, queue, key, payload, attempts, last_error FROM jobs WHERE status = 'dead'"
+        params = []
+        if queue is not None:
+            sql += ' AND queue = ?'
+            params.append(queue)
+        rows = self._db.execute(sql + ' ORDER BY updated DESC LIMIT ?', (*params, limit)).fetchall()
+        return [{'id': r[0], 'queue': r[1], 'key': r[2], 'payload': json.loads(r[3]),
+                 'attempts': r[4], 'error': r[5]} for r in rows]
+
+    def pending(self, queues: Optional[Iterable[str]] = None) -> int:
+        """Jobs that are ready, backing off or running"""
+        sql = "SELECT COUNT(*) FROM jobs WHERE status IN ('ready', 'running')"
+        params = []
+        if queues is not None:
+            queues = list(queues)
+            sql += f" AND queue IN ({', '.join('?' * len(queues))})"
+            params = queues
+        return self._db.execute(sql, params).fetchone()[0]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        counts = {}
+        for queue, status, count in self._db.execute(
+                'SELECT queue, status, COUNT(*) FROM jobs GROUP BY queue, status').fetchall():
+            counts.setdefault(queue, {})[status] = count
+        return counts
+
+
+class JobWorker:
+    def __init__(self, jobs: JobQueue, handlers: Dict[str, Callable[[Dict, Dict], Any]],
+                 worker_id: Optional[str] = None, visibility_timeout: float = 300.0,
+                 poll_interval: float = 1.0, backoff_base: float = 5.0):
+        """handlers: {queue: fn(payload, job) -> result}; raising fails the attempt"""
+        self.jobs = jobs
+        self.handlers = handlers
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{threading.get_ident()}"
+        self.visibility_timeout = visibility_timeout
+        self.poll_interval = poll_interval
+        self.backoff_base = backoff_base
+        self.processed = {'done': 0, 'retry': 0, 'dead': 0}
+        self._stop = threading.Event()
+
+    def run(self, until_empty: bool = False):
+        """Process jobs until stop(); with until_empty, return once the handled queues are drained"""
+        queues = list(self.handlers)
+        while not self._stop.is_set():
+            job = self.jobs.claim(queues, self.worker_id, self.visibility_timeout)
+            if job is None:
+                if until_empty and not self.jobs.pending(queues):
+                    return
+                self._stop.wait(self.poll_interval)
+                continue
+            self._process(job)
+
+    def stop(self):
+        self._stop.set()
+
+    def _process(self, job: Dict):
+        # Long jobs (a whole scrape) keep extending their visibility while they run
+        done = threading.Event()
+        keepalive = threading.Thread(target=self._keepalive, args=(job['id'], done), daemon=True)
+        keepalive.start()
+        try:
+            result = self.handlers[job['queue']](job['payload'], job)
+        except Exception as e:
+            status = self.jobs.fail(job['id'], self.worker_id, f"{type(e).__name__}: {e}", self.backoff_base)
+            self.processed['retry' if status == 'ready' else 'dead'] += 1
+            print(f"{'🔁' if status == 'ready' else '💀'} {job['queue']} job {job['key'] or job['id']} "
+                  f"attempt {job['attempt']} failed: {e}")
+        else:
+            self.jobs.complete(job['id'], self.worker_id, result)
+            self.processed['done'] += 1
+        finally:
+            done.set()
+
+    def _keepalive(self, job_id: int, done: threading.Event):
+        interval = self.visibility_timeout / 3
+        while not done.wait(interval):
+            self.jobs.extend(job_id, self.worker_id, self.visibility_timeout)
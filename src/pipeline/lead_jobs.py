@@ -0,0 +1,136 @@
+"""
+Lead Jobs
+Scrape, validate and persist as resumable jobs on the durable queue
+"""
+
+import os
+import signal
+import socket
+import threading
+from typing import Callable, Dict, Iterable, Optional
+
+from src.pipeline.job_queue import JobQueue, JobWorker
+from src.pipeline.leads import persist_lead
+
+QUEUES = ('scrape', 'validate', 'persist')
+
+def enqueue_search(jobs: JobQueue, search_query: str, location: str, max_results: int = 50,
+                   validate: bool = False, target_criteria: Optional[Dict] = None,
+                   min_score: Optional[float] = None) -> Optional[int]:
+    """Queue a scrape; a search that is already queued or running isn't queued twice, a finished one runs again"""
+    return jobs.enqueue('scrape', {
+        'search_query': search_query,
+        'location': location,
+        'max_results': max_results,
+        'validate': validate,
+        'target_criteria': target_criteria or {},
+        'min_score': min_score
+    }, key=f"{search_query}|{location}|{max_results}", max_attempts=3, rearm=True)
+
+def lead_handlers(jobs: JobQueue, scraper_factory: Callable, client_factory: Callable,
+                  validator_factory: Optional[Callable] = None) -> Dict[str, Callable]:
+    """
+    Job handlers for each stage. Factories are called on first use, so a worker
+    that only drains 'persist' never builds a scraper or an AI client.
+    A scrape job records its actor run and how many leads it has queued in its
+    payload, so a retry continues that run instead of paying for a new one.
+    Follow-up jobs are keyed by google_place_id and never re-armed, so leads a
+    retry or a repeated search re-emits aren't validated or saved twice.
+    """
+    built = {}
+
+    def get(name, factory):
+        if name not in built:
+            built[name] = factory()
+        return built[name]
+
+    def scrape(payload: Dict, job: Dict) -> Dict:
+        scraper = get('scraper', scraper_factory)
+        progress = dict(payload)
+        progress.setdefault('offset', 0)
+
+        def record_run(run: Dict):
+            progress['run_id'] = run['id']
+            jobs.update_payload(job['id'], job['worker'], progress)
+
+        queued = 0
+        for lead in scraper.stream_businesses(payload['search_query'], payload['location'],
+                                              payload['max_results'], run_id=payload.get('run_id'),
+                                              offset=progress['offset'], on_run=record_run):
+            if payload['validate']:
+                job_id = jobs.enqueue('validate', {
+                    'lead': lead,
+                    'target_criteria': payload['target_criteria'],
+                    'min_score': payload['min_score']
+                }, key=lead['google_place_id'] or None)
+            else:
+                job_id = jobs.enqueue('persist', {'lead': lead}, key=lead['google_place_id'] or None)
+            queued += job_id is not None
+            progress['offset'] += 1
+            jobs.update_payload(job['id'], job['worker'], progress)
+        return {'queued': queued}
+
+    def validate(payload: Dict, job: Dict) -> Dict:
+        if validator_factory is None:
+            raise RuntimeError("This worker has no validator configured")
+        lead = payload['lead']
+        analysis = get('validator', validator_factory).analyze_business(lead, payload['target_criteria'])
+        if analysis.get('error'):
+            # LeadValidator swallows API errors into the result; retry those
+            raise RuntimeError(analysis['error'])
+        if payload['min_score'] is not None and (analysis.get('relevance_score') or 0) < payload['min_score']:
+            return {'status': 'below_score', 'relevance_score': analysis.get('relevance_score')}
+        jobs.enqueue('persist', {'lead': lead, 'analysis': analysis}, key=lead['google_place_id'] or None)
+        return {'status': 'validated', 'relevance_score': analysis.get('relevance_score')}
+
+    def persist(payload: Dict, job: Dict) -> Dict:
+        result = persist_lead(get('client', client_factory), payload['lead'], payload.get('analysis'))
+        if result['status'] == 'error':
+            raise RuntimeError(result['error'])
+        return {'status': result['status']}
+
+    return {'scrape': scrape, 'validate': validate, 'persist': persist}
+
+def default_handlers(jobs: JobQueue) -> Dict[str, Callable]:
+    """lead_handlers wired to the real scraper, Supabase client and validator"""
+    def scraper():
+        from src.scrapers.google_maps import GoogleMapsScraper
+        return GoogleMapsScraper()
+
+    def client():
+        from src.database.setup import get_supabase_client
+        return get_supabase_client()
+
+    def validator():
+        from src.ai.validator import LeadValidator
+        return LeadValidator()
+
+    return lead_handlers(jobs, scraper, client, validator)
+
+def run_workers(jobs: JobQueue, queues: Iterable[str] = QUEUES, threads: int = 1, until_empty: bool = False,
+                visibility_timeout: float = 300.0):
+    """Drain the given queues with worker threads in this process"""
+    handlers = default_handlers(jobs)
+    handlers = {name: handlers[name] for name in queues}
+    workers = [JobWorker(jobs, handlers, worker_id=f"{socket.gethostname()}-{os.getpid()}-{n}", visibility_timeout=visibility_timeout)
+               for n in range(threads)]
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda *_: [w.stop() for w in workers])
+
+    running = [threading.Thread(target=w.run, kwargs={'until_empty': until_empty}, daemon=True) for w in workers]
+    for thread in running:
+        thread.start()
+    try:
+        for thread in running:
+            while thread.is_alive():
+                thread.join(0.5)
+    except KeyboardInterrupt:
+        # The current jobs become visible again after their timeout
+        for worker in workers:
+            worker.stop()
+
+    totals = {'done': 0, 'retry': 0, 'dead': 0}
+    for worker in workers:
+        for status, count in worker.processed.items():
+            totals[status] += count
+    return totals
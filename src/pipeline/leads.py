@@ -0,0 +1,144 @@
+"""
+Lead Pipeline
+Scrape -> validate -> persist as one streaming pipeline
+"""
+
+from typing import Dict, Iterable, Optional, Tuple
+
+from src.pipeline.fair_scheduler import COSTS
+from src.pipeline.streaming import Stage, StreamingPipeline
+
+def build_lead_pipeline(scraper, client, validator=None, target_criteria: Optional[Dict] = None,
+                        min_score: Optional[float] = None, scrape_workers: int = 1,
+                        validate_workers: int = 4, persist_workers: int = 2,
+                        queue_size: int = 50, checkpoint=None, scheduler=None,
+                        campaign_id: Optional[str] = None, validate_attempts: int = 2) -> StreamingPipeline:
+    """
+    Source items are (search_query, location, max_results) tuples. Validation is
+    skipped without a validator; with min_score, leads scoring lower are dropped
+    before they reach the database. A lead whose analysis still errors after
+    validate_attempts tries is counted as a validate stage error and not saved.
+    With a CampaignCheckpoint, the scrape continues the recorded actor run from
+    the persistence watermark and stored analyses are reused instead of re-validating.
+    With a FairScheduler, scrapes and validations for campaign_id wait for a fair
+    slot, and each scraped lead is charged to the campaign's budget (refunded
+    if the campaign already had it).
+    """
+    if checkpoint is not None:
+        def scrape(search):
+            start = checkpoint.watermark
+            return checkpoint.track(scraper.stream_businesses(
+                *search, run_id=checkpoint.run_id, offset=start, on_run=checkpoint.record_run
+            ), start)
+        finish = checkpoint.finish
+    else:
+        scrape = lambda search: scraper.stream_businesses(*search)
+        finish = lambda lead: None
+
+    if scheduler is not None:
+        unscheduled_scrape = scrape
+
+        def scrape(search):
+            leads = iter(unscheduled_scrape(search))
+            try:
+                while True:
+                    # One slot per lead, paid for up front (so a campaign that can't afford
+                    # a lead never starts an actor run) and released before the lead is
+                    # passed on: a scrape blocked on a full validate queue mustn't hold
+                    # the capacity those validations are waiting for
+                    with scheduler.slot(campaign_id, COSTS['scrape']):
+                        lead = next(leads, None)
+                        if lead is None:
+                            scheduler.refund(campaign_id, COSTS['scrape'])
+                            return
+                    yield lead
+            finally:
+                close = getattr(leads, 'close', None)
+                if close:
+                    close()
+
+    stages = [
+        Stage('scrape', scrape, workers=scrape_workers, queue_size=max(scrape_workers, 1), flat=True)
+    ]
+
+    if validator is not None:
+        def analyze(lead: Dict) -> Dict:
+            for attempt in range(validate_attempts):
+                if scheduler is not None:
+                    with scheduler.slot(campaign_id, COSTS['validate']):
+                        analysis = validator.analyze_business(lead, target_criteria or {})
+                else:
+                    analysis = validator.analyze_business(lead, target_criteria or {})
+                if not analysis.get('error'):
+                    return analysis
+            # LeadValidator swallows API errors into the result; don't save those as
+            # validated (and with a checkpoint, leave the lead for the next run)
+            raise RuntimeError(f"Validating {lead['business_name']} failed: {analysis['error']}")
+
+        def validate(lead: Dict) -> Optional[Tuple[Dict, Dict]]:
+            analysis = checkpoint.analysis_for(lead) if checkpoint is not None else None
+            if analysis is None:
+                analysis = analyze(lead)
+                if checkpoint is not None:
+                    checkpoint.record_analysis(lead, analysis)
+            if min_score is not None and (analysis.get('relevance_score') or 0) < min_score:
+                print(f"🚫 Below score {min_score}: {lead['business_name']}")
+                finish(lead)
+                return None
+            return lead, analysis
+        stages.append(Stage('validate', validate, workers=validate_workers, queue_size=queue_size))
+        persist = lambda item: persist_lead(client, *item)
+    else:
+        persist = lambda lead: persist_lead(client, lead)
+
+    def persist_and_finish(item) -> Dict:
+        result = persist(item)
+        if result['status'] != 'error':
+            finish(result['lead'])
+        if scheduler is not None and result['status'] == 'skipped':
+            # The campaign already had this place; don't bill it as a new lead
+            scheduler.refund(campaign_id, COSTS['scrape'])
+        return result
+
+    stages.append(Stage('persist', persist_and_finish, workers=persist_workers, queue_size=queue_size))
+    return StreamingPipeline(stages)
+
+def persist_lead(client, lead: Dict, analysis: Optional[Dict] = None) -> Dict:
+    """Insert a lead (and its AI analysis) unless its campaign already has its google_place_id"""
+    try:
+        row = dict(lead, status='validated') if analysis is not None else lead
+        if lead.get('google_place_id'):
+            # One statement, so concurrent persist workers can't both insert a place
+            # ((campaign_id, google_place_id) is unique); a duplicate comes back empty
+            inserted = client.table('leads').upsert(
+                row, on_conflict='campaign_id,google_place_id', ignore_duplicates=True
+            ).execute()
+        else:
+            # Nothing to tell this lead apart from another by
+            inserted = client.table('leads').insert(row).execute()
+
+        if not inserted.data:
+            print(f"⏭️  Skipped (already exists): {lead['business_name']}")
+            return {'lead': lead, 'status': 'skipped'}
+
+        if analysis is not None:
+            client.table('ai_analysis').insert({
+                'lead_id': inserted.data[0]['id'],
+                'business_description': analysis.get('business_description'),
+                'services': analysis.get('services'),
+                'target_market': analysis.get('target_market'),
+                'company_size': analysis.get('company_size'),
+                'relevance_score': analysis.get('relevance_score'),
+                'analysis_data': analysis
+            }).execute()
+        print(f"✅ Saved: {lead['business_name']}")
+        return {'lead': lead, 'status': 'saved'}
+    except Exception as e:
+        print(f"❌ Error saving {lead['business_name']}: {e}")
+        return {'lead': lead, 'status': 'error', 'error': str(e)}
+
+def summarize(results: Iterable[Dict]) -> Dict[str, int]:
+    counts = {'saved': 0, 'skipped': 0, 'error': 0}
+    for result in results:
+        counts[result['status']] += 1
+    return counts
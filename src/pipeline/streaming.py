@@ -0,0 +1,212 @@
+"""
+Streaming Pipeline
+Thread stages connected by bounded queues, with backpressure and per-stage stats
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+_END = object()
+
+class Stage:
+    def __init__(self, name: str, fn: Callable[[Any], Any], workers: int = 1, queue_size: int = 100,
+                 flat: bool = False):
+        """
+        fn runs on each item from the previous stage. Returning None drops the item;
+        with flat=True fn returns an iterable and each element is passed on.
+        queue_size bounds the stage's inbound queue: when it's full, upstream blocks.
+        """
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.queue_size = queue_size
+        self.flat = flat
+
+
+class StageStats:
+    def __init__(self, name: str, workers: int, queue_size: int):
+        self.name = name
+        self.workers = workers
+        self.queue_size = queue_size
+        self.items_in = 0
+        self.items_out = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.blocked_seconds = 0.0
+        self.max_queue_depth = 0
+        self.last_error = None
+        self.started = None
+        self.finished = None
+        self._lock = threading.Lock()
+
+    def as_dict(self, queue_depth: int) -> Dict:
+        elapsed = ((self.finished or time.monotonic()) - self.started) if self.started else 0.0
+        return {
+            'workers': self.workers,
+            'items_in': self.items_in,
+            'items_out': self.items_out,
+            'errors': self.errors,
+            'throughput_per_s': round(self.items_out / elapsed, 2) if elapsed else 0.0,
+            'queue_depth': queue_depth,
+            'queue_size': self.queue_size,
+            'max_queue_depth': self.max_queue_depth,
+            # Share of worker time spent waiting on a full downstream queue
+            'blocked_pct': round(self.blocked_seconds / (elapsed * self.workers) * 100, 1) if elapsed else 0.0,
+            'busy_pct': round(self.busy_seconds / (elapsed * self.workers) * 100, 1) if elapsed else 0.0,
+            'last_error': self.last_error,
+            'done': self.finished is not None
+        }
+
+
+class StreamingPipeline:
+    """
+    Threads connected by bounded queues. Every stage starts as soon as the first
+    item reaches it, and a slow stage fills its inbound queue, which blocks the
+    stage before it, and so on back to the source: memory stays bounded by the
+    queue sizes no matter how many items flow through.
+    """
+
+    def __init__(self, stages: List[Stage], on_error: Optional[Callable[[str, Any, Exception], None]] = None):
+        self.stages = stages
+        self.on_error = on_error
+        self.stats = [StageStats(s.name, s.workers, s.queue_size) for s in stages]
+        self._queues = []
+        self._source_error = None
+
+    def run(self, source: Iterable, report_every: Optional[float] = None,
+            report: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """Drain the pipeline, discarding final outputs; returns per-stage stats"""
+        for _ in self.iter(source, report_every, report):
+            pass
+        return self.report()
+
+    def iter(self, source: Iterable, report_every: Optional[float] = None,
+             report: Optional[Callable[[Dict], None]] = None) -> Iterator:
+        """Yield the last stage's outputs as they are produced"""
+        self._queues = [queue.Queue(maxsize=s.queue_size) for s in self.stages]
+        output = queue.Queue(maxsize=self.stages[-1].queue_size if self.stages else 100)
+        outbound = self._queues[1:] + [output]
+        remaining = [s.workers for s in self.stages]
+        remaining_lock = threading.Lock()
+
+        def finish_stage(index):
+            with remaining_lock:
+                remaining[index] -= 1
+                last = remaining[index] == 0
+            if last:
+                self.stats[index].finished = time.monotonic()
+                downstream = self.stages[index + 1].workers if index + 1 < len(self.stages) else 1
+                for _ in range(downstream):
+                    outbound[index].put(_END)
+
+        threads = [threading.Thread(target=self._feed, args=(source,), name='pipeline-source', daemon=True)]
+        for index, stage in enumerate(self.stages):
+            for n in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=self._work, args=(index, outbound[index], finish_stage),
+                    name=f'pipeline-{stage.name}-{n}', daemon=True
+                ))
+
+        stop_reporting = threading.Event()
+        if report_every:
+            threads.append(threading.Thread(
+                target=self._report_loop, args=(report_every, report or print_report, stop_reporting),
+                name='pipeline-report', daemon=True
+            ))
+
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                item = output.get()
+                if item is _END:
+                    break
+                yield item
+        finally:
+            stop_reporting.set()
+
+        if self._source_error is not None:
+            raise self._source_error
+
+    def report(self) -> Dict:
+        stages = {}
+        for index, stats in enumerate(self.stats):
+            depth = self._queues[index].qsize() if self._queues else 0
+            stages[stats.name] = stats.as_dict(depth)
+        return {'stages': stages}
+
+    def _feed(self, source: Iterable):
+        first = self._queues[0]
+        stats = self.stats[0]
+        try:
+            for item in source:
+                self._put(first, item, stats)
+        except Exception as e:
+            # Stop cleanly and surface the error to the caller once the stages drain
+            self._source_error = e
+        finally:
+            for _ in range(self.stages[0].workers):
+                first.put(_END)
+
+    def _work(self, index: int, outbound: queue.Queue, finish_stage: Callable[[int], None]):
+        stage = self.stages[index]
+        stats = self.stats[index]
+        inbound = self._queues[index]
+        next_stats = self.stats[index + 1] if index + 1 < len(self.stats) else None
+
+        while True:
+            item = inbound.get()
+            if item is _END:
+                break
+            if stats.started is None:
+                stats.started = time.monotonic()
+
+            started = time.monotonic()
+            blocked = 0.0
+            try:
+                result = stage.fn(item)
+                # A flat stage may return a generator; its elements stream out one by one
+                for out in (result if stage.flat else (result,)):
+                    if out is None:
+                        continue
+                    waited = self._put(outbound, out, next_stats)
+                    blocked += waited
+                    with stats._lock:
+                        stats.items_out += 1
+                        stats.blocked_seconds += waited
+            except Exception as e:
+                with stats._lock:
+                    stats.errors += 1
+                    stats.last_error = f"{type(e).__name__}: {e}"
+                if self.on_error:
+                    self.on_error(stage.name, item, e)
+            finally:
+                with stats._lock:
+                    stats.items_in += 1
+                    stats.busy_seconds += time.monotonic() - started - blocked
+
+        finish_stage(index)
+
+    def _put(self, target: queue.Queue, item: Any, target_stats: Optional[StageStats]) -> float:
+        """Blocking put (this is the backpressure); returns seconds spent waiting"""
+        started = time.monotonic()
+        target.put(item)
+        if target_stats is not None:
+            depth = target.qsize()
+            if depth > target_stats.max_queue_depth:
+                target_stats.max_queue_depth = depth
+        return time.monotonic() - started
+
+    def _report_loop(self, interval: float, report: Callable[[Dict], None], stop: threading.Event):
+        while not stop.wait(interval):
+            report(self.report())
+
+
+def print_report(report: Dict):
+    """One line per stage: counts, throughput, queue fill and backpressure"""
+    for name, s in report['stages'].items():
+        print(f"📊 {name:<10} in {s['items_in']:>6}  out {s['items_out']:>6}  err {s['errors']:>4}  "
+              f"{s['throughput_per_s']:>7.2f}/s  queue {s['queue_depth']:>4}/{s['queue_size']:<4}  "
+              f"blocked {s['blocked_pct']:>5.1f}%{'  ✓' if s['done'] else ''}")
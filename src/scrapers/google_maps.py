@@ -1,17 +1,32 @@
 import requests
 import time
-from typing import List, Dict
+from typing import Callable, Dict, Iterator, List, Optional
 from src.config import Config
+from src.integrations.rate_limiter import get_limiter
 
 class GoogleMapsScraper:
     def __init__(self):
         self.api_key = Config.APIFY_API_KEY
         self.base_url = "https://api.apify.com/v2"
+        self.limiter = get_limiter('apify')
     
     def search_businesses(self, search_query: str, location: str, max_results: int = 100) -> List[Dict]:
         """
         Search for businesses on Google Maps using Apify
         """
+        return list(self.stream_businesses(search_query, location, max_results))
+    
+    def stream_businesses(self, search_query: str, location: str, max_results: int = 100,
+                          page_size: int = 100, poll_interval: float = 5, run_id: Optional[str] = None,
+                          offset: int = 0, on_run: Optional[Callable[[Dict], None]] = None) -> Iterator[Dict]:
+        """
+        Yield businesses as the actor finds them: the run's dataset is paged with
+        offset/limit while the run is still in progress, so downstream work starts
+        long before scraping finishes.
+        Pass run_id (and the dataset offset to continue from) to resume an earlier
+        run instead of starting a new one. on_run gets the run record when the run
+        is started or resumed and again once it reaches a final status.
+        """
         actor_id = Config.GOOGLE_MAPS_EXTRACTOR
         
         input_data = {
@@ -24,59 +39,85 @@ class GoogleMapsScraper:
             "includeReviews": False
         }
         
-        print(f"🔍 Searching for '{search_query}' in {location}...")
-        
-        # Start the actor
-        run_url = f"{self.base_url}/acts/{actor_id}/runs?token={self.api_key}"
-        response = requests.post(run_url, json=input_data)
-        
-        if response.status_code != 201:
-            print(f"Error starting actor: {response.text}")
-            return []
+        if run_id:
+            print(f"♻️  Resuming run {run_id} at result {offset}...")
+            response = self._request('GET', f"{self.base_url}/actor-runs/{run_id}?token={self.api_key}")
+            if response.status_code != 200:
+                print(f"Error loading actor run: {response.text}")
+                return
+        else:
+            print(f"🔍 Searching for '{search_query}' in {location}...")
+            
+            # Start the actor
+            run_url = f"{self.base_url}/acts/{actor_id}/runs?token={self.api_key}"
+            response = self._request('POST', run_url, json=input_data)
+            
+            if response.status_code != 201:
+                print(f"Error starting actor: {response.text}")
+                return
         
-        run_id = response.json()['data']['id']
+        run = response.json()['data']
+        run_id = run['id']
+        dataset_id = run['defaultDatasetId']
+        if on_run:
+            on_run(run)
         
-        # Wait for completion
         print("⏳ Scraping in progress...")
         while True:
             status_url = f"{self.base_url}/acts/{actor_id}/runs/{run_id}?token={self.api_key}"
-            status_response = requests.get(status_url)
-            status = status_response.json()['data']['status']
+            run = self._request('GET', status_url).json()['data']
+            status = run['status']
+            
+            # Drain whatever the actor has written so far
+            while True:
+                results_url = (f"{self.base_url}/datasets/{dataset_id}/items"
+                               f"?token={self.api_key}&offset={offset}&limit={page_size}")
+                page = self._request('GET', results_url).json()
+                for place in page:
+                    yield self._format_place(place)
+                offset += len(page)
+                if len(page) < page_size:
+                    break
             
             if status == 'SUCCEEDED':
                 break
             elif status in ['FAILED', 'ABORTED']:
                 print(f"Actor run failed with status: {status}")
-                return []
+                if on_run:
+                    on_run(run)
+                return
             
-            time.sleep(5)
-        
-        # Get results
-        dataset_id = status_response.json()['data']['defaultDatasetId']
-        results_url = f"{self.base_url}/datasets/{dataset_id}/items?token={self.api_key}"
-        results_response = requests.get(results_url)
-        
-        results = results_response.json()
-        print(f"✅ Found {len(results)} businesses")
-        
-        # Format results
-        formatted_results = []
-        for place in results:
-            formatted_results.append({
-                'business_name': place.get('name', ''),
-                'address': place.get('address', ''),
-                'phone': place.get('phone', ''),
-                'website': place.get('website', ''),
-                'category': ', '.join(place.get('categories', [])),
-                'rating': place.get('rating'),
-                'reviews_count': place.get('totalScore'),
-                'latitude': place.get('location', {}).get('lat'),
-                'longitude': place.get('location', {}).get('lng'),
-                'google_place_id': place.get('placeId', ''),
-                'place_url': place.get('url', '')
-            })
+            time.sleep(poll_interval)
         
-        return formatted_results
+        if on_run:
+            on_run(run)
+        print(f"✅ Found {offset} businesses")
+    
+    def _request(self, method: str, url: str, retries: int = 3, **kwargs) -> requests.Response:
+        """Apify call under the shared rate limit; a 429 holds back every worker, then retries"""
+        for _ in range(retries):
+            self.limiter.acquire()
+            response = requests.request(method, url, **kwargs)
+            if response.status_code != 429:
+                return response
+            self.limiter.backoff(float(response.headers.get('Retry-After') or 1))
+        return response
+    
+    @staticmethod
+    def _format_place(place: Dict) -> Dict:
+        return {
+            'business_name': place.get('name', ''),
+            'address': place.get('address', ''),
+            'phone': place.get('phone', ''),
+            'website': place.get('website', ''),
+            'category': ', '.join(place.get('categories', [])),
+            'rating': place.get('rating'),
+            'reviews_count': place.get('totalScore'),
+            'latitude': place.get('location', {}).get('lat'),
+            'longitude': place.get('location', {}).get('lng'),
+            'google_place_id': place.get('placeId', ''),
+            'place_url': place.get('url', '')
+        }
 
 if __name__ == "__main__":
     scraper = GoogleMapsScraper()
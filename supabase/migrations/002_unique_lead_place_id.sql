@@ -0,0 +1,7 @@
+-- One lead per Google place within a campaign: concurrent pipeline writers
+-- upsert on this instead of checking for the place first. The same place may
+-- still be a lead in several campaigns, and leads without a place id (the
+-- scrapers default it to '') never collide.
+CREATE UNIQUE INDEX IF NOT EXISTS idx_leads_campaign_google_place_id
+  ON public.leads(campaign_id, google_place_id)
+  WHERE google_place_id IS NOT NULL AND google_place_id <> '';
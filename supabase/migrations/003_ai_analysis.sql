@@ -0,0 +1,28 @@
+-- AI analyses of validated leads, written by the Python lead pipeline
+-- (src/pipeline/leads.py persist_lead) next to the lead itself
+CREATE TABLE IF NOT EXISTS public.ai_analysis (
+  id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+  lead_id UUID NOT NULL REFERENCES public.leads(id) ON DELETE CASCADE,
+  business_description TEXT,
+  services JSONB,
+  target_market TEXT,
+  company_size TEXT,
+  relevance_score FLOAT,
+  analysis_data JSONB DEFAULT '{}'::JSONB,
+  created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_ai_analysis_lead_id ON public.ai_analysis(lead_id);
+
+ALTER TABLE public.ai_analysis ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view analyses of own leads" ON public.ai_analysis
+  FOR SELECT USING (
+    EXISTS (
+      SELECT 1 FROM public.leads
+      JOIN public.campaigns ON campaigns.id = leads.campaign_id
+      JOIN public.businesses ON businesses.id = campaigns.business_id
+      WHERE leads.id = ai_analysis.lead_id
+      AND businesses.user_id = auth.uid()
+    )
+  );
@@ -0,0 +1,17 @@
+import os
+import sys
+import tempfile
+
+# Tests import the app packages (src, agents) from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep state files the code writes by default out of the working tree; set
+# before src.config / agents modules read them at import time
+_state_dir = tempfile.mkdtemp(prefix='gb-tests-')
+os.environ.setdefault('AGENT_KNOWLEDGE_DIR', os.path.join(_state_dir, 'knowledge'))
+os.environ.setdefault('AGENT_BROKER_PATH', os.path.join(_state_dir, 'broker.db'))
+os.environ.setdefault('AGENT_MANIFEST_PATH', os.path.join(_state_dir, 'agent_manifest.json'))
+os.environ.setdefault('RATE_LIMIT_DIR', os.path.join(_state_dir, 'ratelimits'))
+os.environ.setdefault('AGENT_DAEMON_SOCKET', os.path.join(_state_dir, 'agents.sock'))
+os.environ.setdefault('LEAD_JOB_QUEUE', os.path.join(_state_dir, 'lead_jobs.db'))
+os.environ.setdefault('CAMPAIGN_CHECKPOINT_DIR', os.path.join(_state_dir, 'checkpoints'))
@@ -0,0 +1,101 @@
+"""In-memory stand-ins for the Supabase client and scrapers used by the pipeline"""
+
+import itertools
+import threading
+import time
+from types import SimpleNamespace
+
+
+class FakeQuery:
+    def __init__(self, run):
+        self._run = run
+
+    def execute(self):
+        return SimpleNamespace(data=self._run())
+
+
+class FakeFilter:
+    """select(...) / update(...) followed by eq and in_ filters"""
+
+    def __init__(self, table, values=None):
+        self.table = table
+        self.values = values
+        self.filters = []
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def in_(self, column, values):
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def execute(self):
+        with self.table.client.lock:
+            rows = [r for r in self.table.client.tables.get(self.table.name, [])
+                    if all(f(r) for f in self.filters)]
+            if self.values is not None:
+                for row in rows:
+                    row.update(self.values)
+            return SimpleNamespace(data=[dict(r) for r in rows])
+
+
+class FakeTable:
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+
+    def select(self, columns='*'):
+        # Every column comes back; embedded resources are stored on the rows
+        return FakeFilter(self)
+
+    def update(self, values):
+        return FakeFilter(self, values)
+
+    def insert(self, row):
+        return FakeQuery(lambda: [self.client._insert(self.name, row)])
+
+    def upsert(self, row, on_conflict=None, ignore_duplicates=False):
+        def run():
+            with self.client.lock:
+                rows = self.client.tables.setdefault(self.name, [])
+                columns = on_conflict.split(',') if on_conflict else []
+                if columns and any(all(r.get(c) == row.get(c) for c in columns) for r in rows):
+                    return []
+                return [self.client._insert(self.name, row)]
+        return FakeQuery(run)
+
+
+class FakeSupabase:
+    """Enough of the client for the pipeline and billing; upsert honours the unique columns"""
+
+    def __init__(self):
+        self.tables = {}
+        self.lock = threading.RLock()
+        self._ids = itertools.count(1)
+
+    def table(self, name):
+        return FakeTable(self, name)
+
+    def _insert(self, name, row):
+        with self.lock:
+            # Widen the window a check-then-insert would race in
+            time.sleep(0.001)
+            stored = dict(row, id=next(self._ids))
+            self.tables.setdefault(name, []).append(stored)
+            return stored
+
+
+class FakeScraper:
+    """stream_businesses yields `per_search` leads per search, place ids optionally shared"""
+
+    def __init__(self, per_search=3, delay=0.0, shared_ids=False):
+        self.per_search = per_search
+        self.delay = delay
+        self.shared_ids = shared_ids
+
+    def stream_businesses(self, query, location, max_results=None, **kwargs):
+        for n in range(self.per_search):
+            time.sleep(self.delay)
+            place = f"place-{n}" if self.shared_ids else f"{query}-{location}-{n}"
+            yield {'business_name': f"{query} {n}", 'google_place_id': place}
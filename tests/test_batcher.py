@@ -0,0 +1,39 @@
+from src.ai.batcher import PromptBatcher, TokenEstimator
+
+
+def test_estimate_is_calibrated_by_reported_counts():
+    estimator = TokenEstimator(smoothing=1.0)
+    text = 'word ' * 100
+    raw = estimator.estimate(text, 'gpt-4')
+    estimator.observe('gpt-4', text, raw * 2)
+    assert estimator.estimate(text, 'gpt-4') == raw * 2
+    # Other models keep their own calibration
+    assert estimator.estimate(text, 'gemini-1.5-pro') == raw
+    report = estimator.error_report()['gpt-4']
+    assert report['samples'] == 1 and report['mean_bias_tokens'] < 0
+
+
+def test_pack_respects_input_budget_and_keeps_indices():
+    batcher = PromptBatcher('gpt-4', estimator=TokenEstimator(), max_input_tokens=100,
+                            output_tokens_per_prompt=10, overhead_tokens_per_prompt=0)
+    prompts = ['x' * 200, 'y' * 120, 'z' * 80, 'w' * 40]
+    batches = batcher.pack(prompts)
+
+    assert sorted(i for b in batches for i in b['indices']) == [0, 1, 2, 3]
+    for batch in batches:
+        assert batch['prompts'] == [prompts[i] for i in batch['indices']]
+        assert batch['estimated_tokens'] <= 100
+        assert not batch['oversized']
+
+
+def test_oversized_prompt_gets_its_own_batch():
+    batcher = PromptBatcher('gpt-4', estimator=TokenEstimator(), max_input_tokens=10)
+    batches = batcher.pack(['a ' * 200, 'short'])
+    oversized = [b for b in batches if b['oversized']]
+    assert len(oversized) == 1 and oversized[0]['indices'] == [0]
+
+
+def test_batches_hold_only_as_many_prompts_as_answers_fit():
+    batcher = PromptBatcher('gpt-4', estimator=TokenEstimator(), output_tokens_per_prompt=2048)
+    assert batcher.max_prompts_per_batch == 2
+    assert [len(b['indices']) for b in batcher.pack(['hi'] * 5)] == [2, 2, 1]
@@ -0,0 +1,75 @@
+import threading
+import time
+
+import pytest
+
+from src.ai.chains import PromptChainExecutor, prompt_placeholders
+
+STEPS = [
+    {'step': 'research', 'prompt': 'Research {company}', 'output': 'facts'},
+    {'step': 'audience', 'prompt': 'Audience of {company}', 'output': 'audience'},
+    {'step': 'pitch', 'prompt': 'Pitch using {facts} for {audience}', 'output': 'pitch'},
+]
+
+
+def test_placeholders_in_order_without_duplicates():
+    assert prompt_placeholders('{a} and {b} then {a}') == ['a', 'b']
+
+
+def test_chain_runs_dependencies_first_and_independent_steps_together():
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def call(prompt):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return f"<{prompt}>"
+
+    result = PromptChainExecutor(call).run(STEPS, {'company': 'Acme'})
+    assert result['outputs']['pitch'] == '<Pitch using <Research Acme> for <Audience of Acme>>'
+    assert peak[0] == 2
+
+
+def test_repeated_steps_are_memoized():
+    calls = []
+    executor = PromptChainExecutor(lambda prompt: calls.append(prompt) or prompt.upper())
+    executor.run(STEPS, {'company': 'Acme'})
+    second = executor.run(STEPS, {'company': 'Acme'})
+    assert len(calls) == 3
+    assert all(step['cached'] for step in second['steps'].values())
+
+
+def test_invalid_chains_are_rejected():
+    executor = PromptChainExecutor(lambda prompt: prompt)
+    with pytest.raises(ValueError, match='Missing chain inputs: company'):
+        executor.run(STEPS, {})
+    with pytest.raises(ValueError, match='cycle'):
+        executor.run([
+            {'step': 'a', 'prompt': '{y}', 'output': 'x'},
+            {'step': 'b', 'prompt': '{x}', 'output': 'y'},
+        ], {})
+    with pytest.raises(ValueError, match='more than one step'):
+        executor.build_graph([
+            {'step': 'a', 'prompt': 'p', 'output': 'x'},
+            {'step': 'b', 'prompt': 'q', 'output': 'x'},
+        ])
+
+
+def test_agent_chain_memo_does_not_carry_over_to_another_call_fn():
+    from agents.AI.agent import AIExpertAgent
+
+    agent = AIExpertAgent()
+    inputs = {'content': 'We fix roofs'}
+    flash = lambda prompt: 'flash says'
+    agent.run_prompt_chain('full_lead_analysis', inputs, flash)
+    assert all(step['cached'] for step in agent.run_prompt_chain('full_lead_analysis', inputs, flash)['steps'].values())
+
+    calls = []
+    second = agent.run_prompt_chain('full_lead_analysis', inputs, lambda prompt: calls.append(prompt) or 'pro says')
+    assert len(calls) == 3
+    assert second['outputs']['final_score'] == 'pro says'
+    assert not any(step['cached'] for step in second['steps'].values())
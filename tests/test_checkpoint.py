@@ -0,0 +1,89 @@
+import pytest
+
+from src.pipeline.checkpoint import CampaignCheckpoint
+from src.pipeline.leads import build_lead_pipeline, summarize
+from tests.fakes import FakeSupabase
+
+
+def leads(n):
+    return [{'business_name': f"Biz {i}", 'google_place_id': f"p{i}"} for i in range(n)]
+
+
+def test_watermark_advances_only_over_contiguous_finished_leads(tmp_path):
+    checkpoint = CampaignCheckpoint.create('Spring Push', str(tmp_path), {'query': 'plumbers'})
+    tracked = list(checkpoint.track(iter(leads(4)), 0))
+
+    checkpoint.finish(tracked[1])
+    checkpoint.finish(tracked[2])
+    assert checkpoint.watermark == 0 and checkpoint.finished_above == {1, 2}
+    checkpoint.finish(tracked[0])
+    assert checkpoint.watermark == 3 and checkpoint.finished_above == set()
+
+
+def test_state_survives_reload(tmp_path):
+    checkpoint = CampaignCheckpoint.create('Spring Push', str(tmp_path), {'query': 'plumbers'})
+    checkpoint.record_run({'id': 'run-1', 'defaultDatasetId': 'ds-1', 'status': 'RUNNING'})
+    tracked = list(checkpoint.track(iter(leads(3)), 0))
+    checkpoint.record_analysis(tracked[2], {'relevance_score': 70})
+    checkpoint.finish(tracked[0])
+    checkpoint.save()
+
+    loaded = CampaignCheckpoint.load('Spring Push', str(tmp_path))
+    assert loaded.run_id == 'run-1' and loaded.dataset_id == 'ds-1'
+    assert loaded.watermark == 1 and loaded.dataset_offset == 3
+    assert loaded.analysis_for(tracked[2]) == {'relevance_score': 70}
+    assert CampaignCheckpoint.load('Other', str(tmp_path)) is None
+
+
+class RunScraper:
+    def __init__(self, total):
+        self.total = total
+        self.calls = []
+
+    def stream_businesses(self, query, location, max_results, run_id=None, offset=0, on_run=None):
+        self.calls.append((run_id, offset))
+        on_run({'id': run_id or 'run-1', 'defaultDatasetId': 'ds-1', 'status': 'SUCCEEDED'})
+        yield from leads(self.total)[offset:]
+
+
+class CountingValidator:
+    def __init__(self):
+        self.calls = 0
+
+    def analyze_business(self, lead, criteria):
+        self.calls += 1
+        return {'relevance_score': 90}
+
+
+def test_resumed_pipeline_continues_the_run_and_reuses_analyses(tmp_path):
+    checkpoint = CampaignCheckpoint.create('Spring Push', str(tmp_path), {'query': 'plumbers'})
+    checkpoint.record_run({'id': 'run-1', 'defaultDatasetId': 'ds-1', 'status': 'RUNNING'})
+    # A previous run saved two leads and validated a third before stopping
+    tracked = list(checkpoint.track(iter(leads(3)), 0))
+    checkpoint.finish(tracked[0])
+    checkpoint.finish(tracked[1])
+    checkpoint.record_analysis(tracked[2], {'relevance_score': 80})
+
+    scraper, validator, client = RunScraper(5), CountingValidator(), FakeSupabase()
+    pipeline = build_lead_pipeline(scraper, client, validator=validator, checkpoint=checkpoint)
+    counts = summarize(pipeline.iter([('plumbers', 'Austin', 5)]))
+    checkpoint.complete()
+
+    assert scraper.calls == [('run-1', 2)]
+    assert counts['saved'] == 3
+    assert validator.calls == 2
+    assert checkpoint.completed and checkpoint.watermark == 5
+
+
+def test_create_refuses_to_overwrite_an_existing_checkpoint(tmp_path):
+    checkpoint = CampaignCheckpoint.create('Spring Push', str(tmp_path), {'query': 'plumbers'})
+    checkpoint.record_run({'id': 'run-1', 'defaultDatasetId': 'ds-1'})
+    checkpoint.save()
+
+    with pytest.raises(FileExistsError):
+        CampaignCheckpoint.create('Spring Push', str(tmp_path), {'query': 'roofers'})
+    assert CampaignCheckpoint.load('Spring Push', str(tmp_path)).run_id == 'run-1'
+
+    fresh = CampaignCheckpoint.create('Spring Push', str(tmp_path), {'query': 'roofers'}, overwrite=True)
+    assert fresh.run_id is None
+    assert CampaignCheckpoint.load('Spring Push', str(tmp_path)).search == {'query': 'roofers'}
@@ -0,0 +1,52 @@
+import io
+import json
+
+import pytest
+
+import agents.orchestrator
+from agents.cli import run_batch
+from agents.orchestrator import AgentOrchestrator
+
+
+class Agent:
+    name = 'FE'
+
+    def create_component(self, name):
+        if name == 'Broken':
+            raise ValueError('cannot render')
+        return f"<{name} />"
+
+
+@pytest.fixture
+def orchestrator(monkeypatch):
+    orchestrator = AgentOrchestrator()
+    orchestrator.agents = {'FE': Agent()}
+    monkeypatch.setattr(agents.orchestrator, 'get_orchestrator', lambda: orchestrator)
+    return orchestrator
+
+
+def test_batch_writes_one_result_per_task(orchestrator):
+    lines = [
+        json.dumps({'agent': 'FE', 'action': 'create_component', 'data': {'name': 'Card'}}),
+        '',
+        json.dumps({'agent': 'FE', 'action': 'create_component', 'data': {'name': 'Broken'}}),
+        json.dumps({'agent': 'XX', 'action': 'create_component'}),
+        'not json',
+    ]
+    output = io.StringIO()
+    failed = run_batch(lines, output, workers=2)
+
+    results = {r['index']: r for r in map(json.loads, output.getvalue().splitlines())}
+    assert failed == 3
+    assert sorted(results) == [0, 2, 3, 4]
+    assert results[0]['output'] == '<Card />'
+    assert 'cannot render' in results[2]['error']
+    assert results[3]['error'].startswith('KeyError')
+
+
+def test_batch_streams_large_inputs(orchestrator):
+    lines = (json.dumps({'agent': 'FE', 'action': 'create_component', 'data': {'name': f"C{n}"}})
+             for n in range(200))
+    output = io.StringIO()
+    assert run_batch(lines, output, workers=4) == 0
+    assert len(output.getvalue().splitlines()) == 200
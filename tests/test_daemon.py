@@ -0,0 +1,85 @@
+import os
+import stat
+import threading
+import time
+
+import pytest
+
+from agents.daemon import AgentDaemon, is_running, request
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    def handler(payload):
+        if payload.get('fail'):
+            raise ValueError('bad task')
+        return {'echo': payload.get('task_data')}
+
+    daemon = AgentDaemon(handler, socket_path=str(tmp_path / 'agents.sock'))
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    for _ in range(100):
+        if is_running(daemon.socket_path):
+            break
+        time.sleep(0.01)
+    yield daemon
+    if thread.is_alive():
+        request({'op': 'shutdown'}, daemon.socket_path, timeout=1)
+        thread.join(2)
+
+
+def test_requests_are_handled_and_counted(daemon):
+    assert request({'task_data': {'a': 1}}, daemon.socket_path) == {'echo': {'a': 1}, 'ok': True}
+    assert request({'fail': True}, daemon.socket_path) == {'ok': False, 'error': 'bad task'}
+    assert request({'op': 'ping'}, daemon.socket_path)['requests_served'] == 2
+
+
+def test_socket_is_owner_only(daemon):
+    assert stat.S_IMODE(os.stat(daemon.socket_path).st_mode) & 0o077 == 0
+
+
+def test_concurrent_requests_are_all_counted(daemon):
+    threads = [threading.Thread(target=lambda: [request({}, daemon.socket_path) for _ in range(10)])
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert request({'op': 'ping'}, daemon.socket_path)['requests_served'] == 80
+
+
+def test_shutdown_always_replies_then_stops(tmp_path):
+    for i in range(5):
+        daemon = AgentDaemon(lambda payload: {}, socket_path=str(tmp_path / f'agents{i}.sock'))
+        thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+        thread.start()
+        while not is_running(daemon.socket_path):
+            time.sleep(0.005)
+        assert request({'op': 'shutdown'}, daemon.socket_path, timeout=2) == {'ok': True, 'shutdown': True}
+        thread.join(2)
+        assert not thread.is_alive()
+        assert not os.path.exists(daemon.socket_path)
+
+
+def test_socket_we_may_not_open_means_no_daemon(tmp_path, monkeypatch):
+    import socket
+
+    def denied(self, address):
+        raise PermissionError(13, 'Permission denied')
+
+    monkeypatch.setattr(socket.socket, 'connect', denied)
+    assert request({'op': 'ping'}, str(tmp_path / 'other-user.sock')) is None
+
+
+def test_daemon_that_never_replies_times_out(tmp_path):
+    import socket
+
+    path = str(tmp_path / 'wedged.sock')
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(1)
+    try:
+        with pytest.raises(TimeoutError):
+            request({'op': 'ping'}, path, timeout=0.2)
+    finally:
+        server.close()
@@ -0,0 +1,54 @@
+import json
+import os
+
+from agents.discovery import build_manifest, load_manifest
+
+
+def make_agents_dir(tmp_path):
+    agents_dir = tmp_path / 'agents'
+    (agents_dir / 'XY').mkdir(parents=True)
+    (agents_dir / 'XY' / 'agent.py').write_text(
+        "from agents.result_cache import pure\n"
+        "class Helper:\n"
+        "    pass\n"
+        "class XYAgent:\n"
+        "    @pure\n"
+        "    def render(self, name): ...\n"
+        "    async def deploy(self): ...\n"
+        "    def _private(self): ...\n"
+    )
+    (agents_dir / 'shared').mkdir()
+    (agents_dir / 'shared' / 'agent.py').write_text("class SharedAgent: pass\n")
+    config = tmp_path / 'agent_config.json'
+    config.write_text(json.dumps({'agents': {'XY': {'name': 'Example'}, 'ZZ': {'name': 'Missing'}}}))
+    return str(agents_dir), str(config)
+
+
+def test_manifest_lists_agent_classes_without_importing(tmp_path):
+    agents_dir, config = make_agents_dir(tmp_path)
+    manifest = build_manifest(config, agents_dir, entry_points=False)
+
+    assert list(manifest['agents']) == ['XY']
+    agent = manifest['agents']['XY']
+    assert agent['class'] == 'XYAgent'
+    assert agent['module'] == 'agents.XY.agent'
+    assert agent['methods'] == ['render', 'deploy']
+    assert agent['pure_methods'] == ['render']
+    assert agent['async_methods'] == ['deploy']
+    assert agent['metadata'] == {'name': 'Example'}
+    assert manifest['configured_only'] == ['ZZ']
+
+
+def test_cached_manifest_is_rebuilt_when_a_source_changes(tmp_path):
+    agents_dir, config = make_agents_dir(tmp_path)
+    manifest_path = str(tmp_path / 'manifest.json')
+    kwargs = dict(manifest_path=manifest_path, config_path=config, agents_dir=agents_dir, entry_points=False)
+
+    first = load_manifest(**kwargs)
+    assert load_manifest(**kwargs) == first
+
+    source = os.path.join(agents_dir, 'XY', 'agent.py')
+    with open(source, 'a') as f:
+        f.write("    def review(self): ...\n")
+    os.utime(source, ns=(0, os.stat(source).st_mtime_ns + 1_000_000))
+    assert load_manifest(**kwargs)['agents']['XY']['methods'] == ['render', 'deploy', 'review']
@@ -0,0 +1,158 @@
+import time
+
+import pytest
+
+from agents.distributed import DistributedOrchestrator, DistributedWorker, TaskBroker
+
+
+def make_task(task_id):
+    return {'id': task_id, 'type': 'create_frontend', 'data': {}, 'assigned_agents': ['FE'], 'results': {}}
+
+
+def test_lease_complete_and_purge(tmp_path):
+    broker = TaskBroker(str(tmp_path / 'broker.db'))
+    broker.enqueue(make_task('T1'), concurrent=True, agent_timeout=2.5)
+    broker.enqueue(make_task('T2'))
+
+    job = broker.lease('w1', lease_seconds=30)
+    assert job['task']['id'] == 'T1'
+    assert job['concurrent'] is True
+    assert job['agent_timeout'] == 2.5
+    assert broker.lease('w2', lease_seconds=30)['task']['id'] == 'T2'
+    assert broker.lease('w3', lease_seconds=30) is None
+
+    # Only the lease holder can complete a task
+    assert not broker.complete('T1', 'w2', {'results': {}})
+    assert broker.complete('T1', 'w1', {'results': {'FE': 'ok'}})
+    assert broker.job('T1')['result'] == {'results': {'FE': 'ok'}}
+    assert broker.purge(older_than_seconds=-1) == 1
+
+
+def test_broker_adds_agent_timeout_to_an_older_jobs_table(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / 'old.db')
+    with sqlite3.connect(path) as db:
+        db.execute("""CREATE TABLE jobs (
+            id TEXT PRIMARY KEY, task TEXT NOT NULL, concurrent INTEGER, status TEXT NOT NULL,
+            worker TEXT, lease_expires REAL, attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL, result TEXT, error TEXT, created REAL NOT NULL,
+            updated REAL NOT NULL)""")
+    broker = TaskBroker(path)
+    assert 'agent_timeout' in broker._job_columns()
+    # Opening it again doesn't try to add the column twice
+    TaskBroker(path)
+
+
+def test_broker_setup_errors_are_not_swallowed(tmp_path, monkeypatch):
+    import sqlite3
+
+    path = str(tmp_path / 'locked.db')
+    monkeypatch.setattr(TaskBroker, '_job_columns', lambda self: set())
+    real_connect = sqlite3.connect
+
+    class Locked:
+        def __init__(self, db):
+            self._db = db
+
+        def execute(self, sql, *args):
+            if sql.startswith('ALTER'):
+                raise sqlite3.OperationalError('database is locked')
+            return self._db.execute(sql, *args)
+
+        def __getattr__(self, name):
+            return getattr(self._db, name)
+
+    monkeypatch.setattr(sqlite3, 'connect', lambda *a, **k: Locked(real_connect(*a, **k)))
+    with pytest.raises(sqlite3.OperationalError, match='locked'):
+        TaskBroker(path)
+
+
+def test_expired_lease_is_retried_then_failed(tmp_path):
+    broker = TaskBroker(str(tmp_path / 'broker.db'))
+    broker.enqueue(make_task('T1'), max_attempts=2)
+
+    assert broker.lease('w1', lease_seconds=0)
+    time.sleep(0.01)
+    assert broker.lease('w2', lease_seconds=0)['task']['id'] == 'T1'
+    time.sleep(0.01)
+    assert broker.lease('w3', lease_seconds=30) is None
+    job = broker.job('T1')
+    assert job['status'] == 'failed'
+    assert job['attempts'] == 2
+
+
+def test_fail_requeues_until_attempts_are_used(tmp_path):
+    broker = TaskBroker(str(tmp_path / 'broker.db'))
+    broker.enqueue(make_task('T1'), max_attempts=2)
+    broker.lease('w1', 30)
+    broker.fail('T1', 'w1', 'boom')
+    assert broker.job('T1')['status'] == 'queued'
+    broker.lease('w1', 30)
+    broker.fail('T1', 'w1', 'boom')
+    assert broker.job('T1')['status'] == 'failed'
+
+
+class Agent:
+    name = 'FE'
+
+    def create_frontend(self):
+        time.sleep(0.2)
+        return 'done'
+
+
+def start_thread_workers(broker_path, count):
+    import threading
+
+    workers = []
+    for n in range(count):
+        worker = DistributedWorker(broker_path, worker_id=f"w{n}", heartbeat_interval=0.1, poll_interval=0.01)
+        worker.orchestrator.agents = {'FE': Agent()}
+        threading.Thread(target=worker.run, daemon=True).start()
+        workers.append(worker)
+    return workers
+
+
+def test_submitted_tasks_reach_workers_in_parallel(tmp_path):
+    broker_path = str(tmp_path / 'broker.db')
+    orchestrator = DistributedOrchestrator(broker_path, concurrent=True, agent_timeout=5, poll_interval=0.01)
+    orchestrator.agents = {'FE': Agent()}
+    workers = start_thread_workers(broker_path, 4)
+    try:
+        started = time.monotonic()
+        handles = [orchestrator.submit('create_frontend', {}) for _ in range(4)]
+        tasks = [h.result(timeout=10) for h in handles]
+        # One at a time would take 0.8s
+        assert time.monotonic() - started < 0.7
+    finally:
+        for worker in workers:
+            worker.stop()
+
+    assert [t['results']['FE']['status'] for t in tasks] == ['completed'] * 4
+    # The coordinator's concurrent setting reached the workers
+    assert all(t.get('timing') for t in tasks)
+
+
+def test_wait_fails_when_no_worker_is_alive(tmp_path):
+    orchestrator = DistributedOrchestrator(str(tmp_path / 'broker.db'), worker_timeout=0.2, poll_interval=0.01)
+    orchestrator.agents = {'FE': Agent()}
+    task = orchestrator.delegate_task('create_frontend', {})
+    assert task['results']['FE']['status'] == 'failed'
+    assert 'No live workers' in task['results']['FE']['error']
+
+
+def test_start_local_workers_rejects_unknown_options(tmp_path):
+    orchestrator = DistributedOrchestrator(str(tmp_path / 'broker.db'))
+    with pytest.raises(TypeError):
+        orchestrator.start_local_workers(1, poll_intreval=0.1)
+
+
+def test_start_local_workers_waits_for_heartbeats(tmp_path):
+    orchestrator = DistributedOrchestrator(str(tmp_path / 'broker.db'))
+    try:
+        workers = orchestrator.start_local_workers(1, poll_interval=0.05, heartbeat_interval=0.5)
+        assert len(workers) == 1 and workers[0].poll() is None
+        assert len(orchestrator.broker.workers()) == 1
+    finally:
+        orchestrator.stop_local_workers()
+    assert orchestrator._workers == []
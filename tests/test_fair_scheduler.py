@@ -0,0 +1,205 @@
+import threading
+import time
+
+import pytest
+
+from src.pipeline.fair_scheduler import COSTS, BudgetExceeded, FairScheduler, load_campaigns, record_spend
+from src.pipeline.leads import build_lead_pipeline, summarize
+from tests.fakes import FakeScraper, FakeSupabase
+
+
+def hold_slots(scheduler, campaign_id, count, release):
+    """Start `count` threads that each hold a slot until release is set"""
+    entered = []
+
+    def hold():
+        with scheduler.slot(campaign_id):
+            entered.append(campaign_id)
+            release.wait()
+
+    for _ in range(count):
+        threading.Thread(target=hold, daemon=True).start()
+    return entered
+
+
+def test_caps_bound_concurrency():
+    scheduler = FairScheduler(max_concurrency=4)
+    scheduler.add_tenant('t1', max_concurrency=3)
+    scheduler.add_campaign('a', 't1', max_concurrency=2)
+    scheduler.add_campaign('b', 't1')
+    release = threading.Event()
+
+    entered = hold_slots(scheduler, 'a', 3, release) + hold_slots(scheduler, 'b', 3, release)
+    time.sleep(0.1)
+    stats = scheduler.stats()
+    assert stats['a']['running'] == 2
+    assert stats['a']['running'] + stats['b']['running'] == 3
+    release.set()
+
+
+def test_weighted_share_between_tenants():
+    scheduler = FairScheduler(max_concurrency=1)
+    scheduler.add_tenant('big', weight=3)
+    scheduler.add_tenant('small', weight=1)
+    scheduler.add_campaign('a', 'big')
+    scheduler.add_campaign('b', 'small')
+    order = []
+    gate = threading.Event()
+
+    def work(campaign_id):
+        with scheduler.slot(campaign_id):
+            gate.wait()
+            order.append(campaign_id)
+
+    threads = [threading.Thread(target=work, args=(c,)) for c in ['a'] * 8 + ['b'] * 8]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    gate.set()
+    for thread in threads:
+        thread.join()
+    # While both are waiting, 'big' gets about three slots for each of 'small's
+    assert 5 <= order[:8].count('a') <= 7
+
+
+def test_budget_stops_campaign():
+    stopped = []
+    scheduler = FairScheduler(max_concurrency=2, on_stop=lambda c, reason: stopped.append(c))
+    scheduler.add_campaign('a', 't1', budget={'credits': 2})
+
+    for _ in range(2):
+        with scheduler.slot('a', {'credits': 1}):
+            pass
+    with pytest.raises(BudgetExceeded):
+        with scheduler.slot('a', {'credits': 1}):
+            pass
+    # Free work still runs
+    with scheduler.slot('a', {}):
+        pass
+    assert stopped == ['a']
+    assert scheduler.stats()['a']['spent'] == {'credits': 2}
+
+
+def test_failed_work_is_refunded():
+    scheduler = FairScheduler(max_concurrency=1)
+    scheduler.add_campaign('a', 't1', budget={'credits': 1})
+    with pytest.raises(RuntimeError):
+        with scheduler.slot('a', {'credits': 1}):
+            raise RuntimeError('scrape failed')
+    assert scheduler.stats()['a']['budget_left'] == {'credits': 1}
+
+
+def test_stop_fails_waiters():
+    scheduler = FairScheduler(max_concurrency=1)
+    scheduler.add_campaign('a', 't1')
+    release = threading.Event()
+    hold_slots(scheduler, 'a', 1, release)
+    time.sleep(0.05)
+    errors = []
+
+    def wait():
+        try:
+            with scheduler.slot('a'):
+                pass
+        except BudgetExceeded as e:
+            errors.append(e.reason)
+
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    time.sleep(0.05)
+    scheduler.stop('a', 'paused by user')
+    waiter.join(1)
+    release.set()
+    assert errors == ['paused by user']
+
+
+class Validator:
+    def analyze_business(self, lead, criteria):
+        time.sleep(0.005)
+        return {'relevance_score': 90, 'recommendation': 'YES'}
+
+
+def run_with_timeout(fn, timeout):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(fn()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "pipeline deadlocked"
+    return result[0]
+
+
+def test_campaign_with_more_searches_than_its_concurrency_finishes():
+    scheduler = FairScheduler(max_concurrency=8)
+    scheduler.add_campaign('c1', 't1', max_concurrency=2)
+    searches = [(f"target{n}", 'Austin', 10) for n in range(6)]
+    # Same sizing as scripts/run_campaigns.py, with small queues so scrapes block on them
+    pipeline = build_lead_pipeline(
+        FakeScraper(per_search=10), FakeSupabase(), validator=Validator(),
+        scrape_workers=min(len(searches), 2), validate_workers=2, queue_size=2,
+        scheduler=scheduler, campaign_id='c1'
+    )
+    counts = run_with_timeout(lambda: summarize(pipeline.iter(searches)), 20)
+    assert counts['saved'] == 60
+    assert scheduler.stats()['c1']['spent']['credits'] == 60
+
+
+def test_scrape_stops_when_budget_runs_out():
+    scheduler = FairScheduler(max_concurrency=4)
+    scheduler.add_campaign('c1', 't1', budget={'credits': 3})
+    pipeline = build_lead_pipeline(FakeScraper(per_search=10), FakeSupabase(),
+                                   scheduler=scheduler, campaign_id='c1')
+    counts = run_with_timeout(lambda: summarize(pipeline.iter([('plumbers', 'Austin', 10)])), 10)
+    assert counts['saved'] == 3
+    assert scheduler.stats()['c1']['stopped']
+
+
+def test_leads_the_campaign_already_had_are_refunded():
+    scheduler = FairScheduler(max_concurrency=4)
+    scheduler.add_campaign('c1', 't1', budget={'credits': 10})
+    pipeline = build_lead_pipeline(FakeScraper(per_search=3, shared_ids=True), FakeSupabase(),
+                                   scheduler=scheduler, campaign_id='c1')
+    counts = run_with_timeout(lambda: summarize(pipeline.iter([('plumbers', 'Austin', 3)] * 2)), 10)
+    assert counts == {'saved': 3, 'skipped': 3, 'error': 0}
+    assert scheduler.stats()['c1']['spent']['credits'] == 3
+    assert scheduler.stats()['c1']['budget_left']['credits'] == 7
+
+
+def billing_client():
+    client = FakeSupabase()
+    client.tables = {
+        'users': [{'id': 'u1', 'credits': 100}],
+        'campaigns': [{'id': 'c1', 'budget_limit': 10, 'credits_allocated': 20, 'total_spent': 2.0,
+                       'businesses': {'user_id': 'u1'}}],
+        'billing_transactions': [{'campaign_id': 'c1', 'credits_used': 5}],
+    }
+    return client
+
+
+def test_load_campaigns_subtracts_earlier_spend():
+    scheduler = FairScheduler(max_concurrency=1)
+    assert load_campaigns(billing_client(), scheduler, ['c1']) == ['c1']
+    assert scheduler.stats()['c1']['budget_left'] == {'credits': 15, 'usd': 8.0}
+
+
+def test_spend_is_recorded_for_the_next_run():
+    client = billing_client()
+    scheduler = FairScheduler(max_concurrency=1)
+    load_campaigns(client, scheduler, ['c1'])
+    for _ in range(3):
+        with scheduler.slot('c1', COSTS['scrape']):
+            pass
+
+    recorded = record_spend(client, scheduler)
+    transaction = client.tables['billing_transactions'][-1]
+    assert (transaction['user_id'], transaction['type'], transaction['credits_used'], transaction['amount']) == (
+        'u1', 'lead_scraped', 3, 0.6
+    )
+    assert client.tables['campaigns'][0]['total_spent'] == 2.6
+
+    # Only what was spent since is billed the next time
+    assert record_spend(client, scheduler, recorded) == recorded
+    assert len(client.tables['billing_transactions']) == 2
+
+    rerun = FairScheduler(max_concurrency=1)
+    load_campaigns(client, rerun, ['c1'])
+    assert rerun.stats()['c1']['budget_left'] == {'credits': 12, 'usd': 7.4}
@@ -0,0 +1,32 @@
+from src.ai.html_extract import HTMLExtractor, html_to_text
+
+PAGE = b"""<html><head><style>body { color: red }</style><script>var x = 1;</script></head>
+<body><h1>Acme   Plumbing</h1>
+<p>Emergency repairs</p>
+<p>Licensed  and insured</p></body></html>"""
+
+
+def test_visible_text_is_collapsed_and_limited():
+    assert html_to_text(PAGE) == 'Acme Plumbing Emergency repairs Licensed and insured'
+    assert html_to_text(PAGE, limit=4) == 'Acme'
+
+
+def test_encoding_is_honoured():
+    page = '<p>Café Olé</p>'.encode('latin-1')
+    assert html_to_text(page, 'latin-1') == 'Café Olé'
+
+
+def test_small_pages_stay_in_thread():
+    extractor = HTMLExtractor(processes=2, min_pool_bytes=len(PAGE) + 1)
+    assert extractor.extract(PAGE).startswith('Acme')
+    assert extractor._pool is None
+
+
+def test_large_pages_use_the_process_pool():
+    extractor = HTMLExtractor(processes=1, min_pool_bytes=0)
+    try:
+        assert extractor.extract(PAGE) == html_to_text(PAGE)
+        assert extractor._pool is not None
+    finally:
+        extractor.shutdown()
+    assert extractor._pool is None
@@ -0,0 +1,50 @@
+import json
+from types import SimpleNamespace
+
+from src.ai import instrumentation
+from src.ai.instrumentation import AICallRecorder
+
+
+def test_call_records_provider_usage_and_cost():
+    recorder = AICallRecorder()
+    usage = SimpleNamespace(prompt_token_count=1000, candidates_token_count=500)
+    response = SimpleNamespace(text='{"ok": true}', usage_metadata=usage)
+
+    assert recorder.call('gemini-1.5-pro', lambda prompt: response, 'hello', template='t') is response
+
+    totals = recorder.summary()['totals']
+    assert totals['calls'] == 1
+    assert totals['prompt_tokens'] == 1000
+    assert totals['response_tokens'] == 500
+    assert totals['cost'] == round(0.00125 + 0.0025, 6)
+
+
+def test_errors_are_recorded_and_reraised():
+    recorder = AICallRecorder()
+
+    def fail(prompt):
+        raise RuntimeError('boom')
+
+    try:
+        recorder.call('gemini-1.5-pro', fail, 'hello')
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError('error was swallowed')
+    assert recorder.summary()['totals']['errors'] == 1
+
+
+def test_log_file_only_written_when_configured(tmp_path):
+    log = tmp_path / 'calls.jsonl'
+    AICallRecorder().record('m', 'p', 1, 1, 1.0)
+    assert not log.exists()
+
+    AICallRecorder(log_path=str(log)).record('m', 'p', 1, 1, 1.0)
+    entry = json.loads(log.read_text())
+    assert entry['model'] == 'm' and 'prompt' not in entry
+
+
+def test_default_recorder_does_not_log_unless_opted_in(monkeypatch):
+    monkeypatch.setattr(instrumentation.Config, 'AI_CALL_LOG', None)
+    monkeypatch.setattr(instrumentation, '_default_recorder', None)
+    assert instrumentation.get_recorder().log_path is None
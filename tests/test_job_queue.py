@@ -0,0 +1,157 @@
+import time
+
+from src.pipeline.job_queue import JobQueue, JobWorker
+from src.pipeline.lead_jobs import enqueue_search, lead_handlers
+from tests.fakes import FakeSupabase
+
+
+def test_claim_complete_and_fail_with_backoff(tmp_path):
+    jobs = JobQueue(str(tmp_path / 'jobs.db'))
+    first = jobs.enqueue('scrape', {'n': 1})
+    jobs.enqueue('scrape', {'n': 2}, delay=60)
+
+    job = jobs.claim(['scrape'], 'w1')
+    assert job['id'] == first and job['attempt'] == 1 and job['worker'] == 'w1'
+    # Delayed and claimed jobs are invisible
+    assert jobs.claim(['scrape'], 'w2') is None
+
+    assert jobs.fail(first, 'w1', 'boom', backoff_base=0) == 'ready'
+    job = jobs.claim(['scrape'], 'w2')
+    assert job['attempt'] == 2
+    assert not jobs.complete(job['id'], 'w1')
+    assert jobs.complete(job['id'], 'w2', {'ok': True})
+    assert jobs.stats()['scrape'] == {'done': 1, 'ready': 1}
+
+
+def test_dead_letter_and_retry(tmp_path):
+    jobs = JobQueue(str(tmp_path / 'jobs.db'))
+    job_id = jobs.enqueue('persist', {}, max_attempts=1)
+    jobs.claim(['persist'], 'w1')
+    assert jobs.fail(job_id, 'w1', 'bad row') == 'dead'
+    assert jobs.dead_letters('persist')[0]['error'] == 'bad row'
+    assert jobs.retry_dead('persist') == 1
+    assert jobs.claim(['persist'], 'w1')['id'] == job_id
+
+
+def test_expired_visibility_makes_job_claimable(tmp_path):
+    jobs = JobQueue(str(tmp_path / 'jobs.db'))
+    jobs.enqueue('scrape', {})
+    jobs.claim(['scrape'], 'w1', visibility_timeout=0)
+    time.sleep(0.01)
+    assert jobs.claim(['scrape'], 'w2')['attempt'] == 2
+
+
+def test_key_is_one_shot_by_default(tmp_path):
+    jobs = JobQueue(str(tmp_path / 'jobs.db'))
+    job_id = jobs.enqueue('validate', {'run': 1}, key='place-1')
+    jobs.claim(['validate'], 'w1')
+    jobs.complete(job_id, 'w1')
+
+    assert jobs.enqueue('validate', {'run': 2}, key='place-1') is None
+    assert jobs.claim(['validate'], 'w1') is None
+
+
+def test_rearmed_key_dedupes_only_while_pending(tmp_path):
+    jobs = JobQueue(str(tmp_path / 'jobs.db'))
+    job_id = jobs.enqueue('scrape', {'run': 1}, key='plumbers', rearm=True)
+    assert jobs.enqueue('scrape', {'run': 2}, key='plumbers', rearm=True) is None
+
+    jobs.claim(['scrape'], 'w1')
+    assert jobs.enqueue('scrape', {'run': 2}, key='plumbers', rearm=True) is None
+    jobs.complete(job_id, 'w1')
+
+    assert jobs.enqueue('scrape', {'run': 2}, key='plumbers', rearm=True) == job_id
+    job = jobs.claim(['scrape'], 'w1')
+    assert job['payload'] == {'run': 2} and job['attempt'] == 1
+
+
+def test_worker_drains_queues(tmp_path):
+    jobs = JobQueue(str(tmp_path / 'jobs.db'))
+    for n in range(3):
+        jobs.enqueue('double', {'n': n})
+    results = []
+    worker = JobWorker(jobs, {'double': lambda payload, job: results.append(payload['n'] * 2)},
+                       poll_interval=0.01)
+    worker.run(until_empty=True)
+    assert sorted(results) == [0, 2, 4]
+    assert worker.processed['done'] == 3
+
+
+class ResumableScraper:
+    """Actor run whose dataset has `total` leads; the first attempt dies after `fail_after`"""
+
+    def __init__(self, total=5, fail_after=None):
+        self.total = total
+        self.fail_after = fail_after
+        self.runs_started = 0
+        self.calls = []
+
+    def stream_businesses(self, query, location, max_results, run_id=None, offset=0, on_run=None):
+        self.calls.append((run_id, offset))
+        if run_id is None:
+            self.runs_started += 1
+            run_id = f"run-{self.runs_started}"
+        on_run({'id': run_id, 'defaultDatasetId': 'ds'})
+        for index in range(offset, self.total):
+            if self.fail_after is not None and index == self.fail_after:
+                self.fail_after = None
+                raise ConnectionError('connection reset')
+            yield {'business_name': f"{query} {index}", 'google_place_id': f"{run_id}-{index}"}
+
+
+def test_retried_scrape_resumes_its_actor_run(tmp_path):
+    jobs = JobQueue(str(tmp_path / 'jobs.db'))
+    scraper = ResumableScraper(total=5, fail_after=3)
+    handlers = lead_handlers(jobs, lambda: scraper, FakeSupabase)
+    enqueue_search(jobs, 'plumbers', 'Austin', 5)
+
+    worker = JobWorker(jobs, {'scrape': handlers['scrape']}, poll_interval=0.01, backoff_base=0)
+    worker.run(until_empty=True)
+
+    assert scraper.runs_started == 1
+    assert scraper.calls == [(None, 0), ('run-1', 3)]
+    assert jobs.stats()['persist'] == {'ready': 5}
+
+
+def test_completed_search_can_run_again(tmp_path):
+    jobs = JobQueue(str(tmp_path / 'jobs.db'))
+    client = FakeSupabase()
+    scraper = ResumableScraper(total=2)
+    handlers = lead_handlers(jobs, lambda: scraper, lambda: client)
+    worker = JobWorker(jobs, handlers, poll_interval=0.01)
+
+    assert enqueue_search(jobs, 'plumbers', 'Austin', 2) is not None
+    assert enqueue_search(jobs, 'plumbers', 'Austin', 2) is None
+    worker.run(until_empty=True)
+    assert enqueue_search(jobs, 'plumbers', 'Austin', 2) is not None
+    worker.run(until_empty=True)
+
+    # The second run starts a fresh actor run rather than resuming the finished one
+    assert scraper.calls == [(None, 0), (None, 0)]
+    assert len(client.tables['leads']) == 4
+
+
+def test_repeated_search_does_not_revalidate_leads(tmp_path):
+    jobs = JobQueue(str(tmp_path / 'jobs.db'))
+    analyzed = []
+
+    class Validator:
+        def analyze_business(self, lead, criteria):
+            analyzed.append(lead['google_place_id'])
+            return {'relevance_score': 90}
+
+    class SamePlaces:
+        def stream_businesses(self, query, location, max_results, run_id=None, offset=0, on_run=None):
+            on_run({'id': 'run', 'defaultDatasetId': 'ds'})
+            for index in range(offset, 2):
+                yield {'business_name': f"{query} {index}", 'google_place_id': f"place-{index}"}
+
+    client = FakeSupabase()
+    handlers = lead_handlers(jobs, SamePlaces, lambda: client, Validator)
+    worker = JobWorker(jobs, handlers, poll_interval=0.01)
+    for _ in range(2):
+        assert enqueue_search(jobs, 'plumbers', 'Austin', 2, validate=True) is not None
+        worker.run(until_empty=True)
+
+    assert analyzed == ['place-0', 'place-1']
+    assert len(client.tables['leads']) == 2
@@ -0,0 +1,107 @@
+import multiprocessing
+import threading
+
+from agents.knowledge_store import KnowledgeStore
+
+
+def entry(i, task_type='create_frontend', agents=('FE',), success=True):
+    return {
+        'task_type': task_type,
+        'timestamp': f"2026-01-01T00:00:{i:02d}",
+        'agents_involved': list(agents),
+        'success': success,
+        'n': i
+    }
+
+
+def test_query_filters_by_index(tmp_path):
+    store = KnowledgeStore(str(tmp_path))
+    store.append(entry(1))
+    store.append(entry(2, 'deploy', ('BE', 'QA'), success=False))
+    store.append(entry(3))
+
+    assert [e['n'] for e in store.query(task_type='create_frontend')] == [3, 1]
+    assert [e['n'] for e in store.query(agent='QA')] == [2]
+    assert [e['n'] for e in store.query(success=True, newest_first=False)] == [1, 3]
+    assert [e['n'] for e in store.query(limit=1)] == [3]
+    assert store.counts() == {'create_frontend': 2, 'deploy': 1}
+
+
+def test_index_survives_reopen_and_torn_write(tmp_path):
+    store = KnowledgeStore(str(tmp_path))
+    store.append(entry(1))
+    with open(store.log_path, 'ab') as f:
+        f.write(b'{"task_type": "half')
+
+    reopened = KnowledgeStore(str(tmp_path))
+    reopened.append(entry(2))
+    assert [e['n'] for e in reopened.query()] == [2, 1]
+
+
+def test_compaction_keeps_newest_per_type(tmp_path):
+    store = KnowledgeStore(str(tmp_path), keep_per_type=2, compact_every=0)
+    for i in range(5):
+        store.append(entry(i))
+    store.append(entry(9, 'deploy'))
+    store.compact()
+
+    assert [e['n'] for e in store.query(task_type='create_frontend')] == [4, 3]
+    assert len(store) == 3
+
+
+class CompactAfterLookup:
+    """Index connection that has another store compact right after a query's offset lookup"""
+
+    def __init__(self, db, other):
+        self.db = db
+        self.other = other
+
+    def execute(self, sql, *args):
+        cursor = self.db.execute(sql, *args)
+        if sql.startswith('SELECT e.offset'):
+            rows = cursor.fetchall()
+            self.compaction = threading.Thread(target=self.other.compact)
+            self.compaction.start()
+            # Blocked while the query holds the lock; otherwise finishes here
+            self.compaction.join(0.2)
+            return iter_rows(rows)
+        return cursor
+
+    def __getattr__(self, name):
+        return getattr(self.db, name)
+
+
+class iter_rows(list):
+    def fetchall(self):
+        return list(self)
+
+
+def test_compaction_between_lookup_and_read_keeps_offsets_valid(tmp_path):
+    store = KnowledgeStore(str(tmp_path), keep_per_type=1, compact_every=0)
+    for i in range(5):
+        store.append(entry(i))
+    other = KnowledgeStore(str(tmp_path), keep_per_type=1, compact_every=0)
+
+    store._db = CompactAfterLookup(store._db, other)
+    assert [e['n'] for e in store.query(newest_first=False)] == [0, 1, 2, 3, 4]
+    store._db.compaction.join()
+    store._db = store._db.db
+    assert [e['n'] for e in store.query()] == [4]
+
+
+def _append_many(directory, start):
+    store = KnowledgeStore(directory, keep_per_type=None, compact_every=7)
+    for i in range(start, start + 40):
+        store.append(entry(i % 60))
+
+
+def test_processes_share_one_log(tmp_path):
+    workers = [multiprocessing.Process(target=_append_many, args=(str(tmp_path), n * 40)) for n in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    store = KnowledgeStore(str(tmp_path), keep_per_type=None)
+    assert len(store) == 120
+    assert len(list(store.query())) == 120
@@ -0,0 +1,83 @@
+from src.pipeline.leads import build_lead_pipeline, persist_lead, summarize
+from tests.fakes import FakeScraper, FakeSupabase
+
+
+class Validator:
+    def __init__(self, failures=0, score=80):
+        self.failures = failures
+        self.score = score
+        self.calls = 0
+
+    def analyze_business(self, lead, criteria):
+        self.calls += 1
+        if self.calls <= self.failures:
+            return {'relevance_score': 0, 'recommendation': 'NO', 'error': 'quota exceeded'}
+        return {'relevance_score': self.score, 'recommendation': 'YES'}
+
+
+def test_pipeline_saves_validated_leads():
+    client = FakeSupabase()
+    pipeline = build_lead_pipeline(FakeScraper(per_search=3), client, validator=Validator())
+    counts = summarize(pipeline.iter([('plumbers', 'Austin', 3), ('roofers', 'Austin', 3)]))
+
+    assert counts == {'saved': 6, 'skipped': 0, 'error': 0}
+    assert len(client.tables['ai_analysis']) == 6
+    assert all(row['status'] == 'validated' for row in client.tables['leads'])
+
+
+def test_min_score_drops_leads():
+    client = FakeSupabase()
+    pipeline = build_lead_pipeline(FakeScraper(), client, validator=Validator(score=10), min_score=50)
+    assert summarize(pipeline.iter([('plumbers', 'Austin', 3)]))['saved'] == 0
+
+
+def test_failed_analysis_is_retried():
+    client = FakeSupabase()
+    validator = Validator(failures=1)
+    pipeline = build_lead_pipeline(FakeScraper(per_search=1), client, validator=validator)
+    assert summarize(pipeline.iter([('plumbers', 'Austin', 1)]))['saved'] == 1
+    assert validator.calls == 2
+    assert 'error' not in client.tables['ai_analysis'][0]['analysis_data']
+
+
+def test_analysis_that_keeps_failing_is_not_saved():
+    client = FakeSupabase()
+    pipeline = build_lead_pipeline(FakeScraper(per_search=1), client, validator=Validator(failures=5),
+                                   validate_attempts=2)
+    assert summarize(pipeline.iter([('plumbers', 'Austin', 1)]))['saved'] == 0
+    assert 'leads' not in client.tables
+    assert pipeline.report()['stages']['validate']['errors'] == 1
+
+
+def test_concurrent_persist_saves_each_place_once():
+    client = FakeSupabase()
+    pipeline = build_lead_pipeline(FakeScraper(per_search=5, shared_ids=True), client,
+                                   scrape_workers=4, persist_workers=4)
+    searches = [(f"query{n}", 'Austin', 5) for n in range(4)]
+    counts = summarize(pipeline.iter(searches))
+
+    assert counts == {'saved': 5, 'skipped': 15, 'error': 0}
+    assert len(client.tables['leads']) == 5
+
+
+def test_place_is_unique_per_campaign_and_blank_ids_never_collide():
+    client = FakeSupabase()
+    for campaign in ('c1', 'c1', 'c2'):
+        persist_lead(client, {'business_name': 'A', 'google_place_id': 'p', 'campaign_id': campaign})
+    for _ in range(2):
+        persist_lead(client, {'business_name': 'B', 'google_place_id': '', 'campaign_id': 'c1'})
+
+    rows = client.tables['leads']
+    assert sorted((r['campaign_id'], r['google_place_id']) for r in rows) == [
+        ('c1', ''), ('c1', ''), ('c1', 'p'), ('c2', 'p')
+    ]
+
+
+def test_persist_reports_errors():
+    class Broken(FakeSupabase):
+        def table(self, name):
+            raise ConnectionError('db down')
+
+    result = persist_lead(Broken(), {'business_name': 'A', 'google_place_id': 'p'})
+    assert result['status'] == 'error'
+    assert 'db down' in result['error']
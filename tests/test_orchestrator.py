@@ -0,0 +1,163 @@
+import asyncio
+import time
+
+import pytest
+
+from agents.orchestrator import AgentOrchestrator
+
+
+class SlowAgent:
+    name = 'FE'
+
+    def __init__(self, seconds=0.0, fail=False):
+        self.seconds = seconds
+        self.fail = fail
+
+    def create_frontend(self, name='Widget'):
+        if self.fail:
+            raise RuntimeError('agent broke')
+        time.sleep(self.seconds)
+        return f"<{name} />"
+
+
+def make_orchestrator(agent, **kwargs):
+    orchestrator = AgentOrchestrator(**kwargs)
+    orchestrator.agents = {'FE': agent}
+    return orchestrator
+
+
+def test_delegate_task_runs_assigned_agent():
+    orchestrator = make_orchestrator(SlowAgent())
+    task = orchestrator.delegate_task('create_frontend', {'name': 'Card'})
+    assert task['status'] == 'completed'
+    assert task['results']['FE']['output'] == '<Card />'
+    assert task['id'] not in orchestrator.task_queue
+
+
+def test_failed_processing_does_not_leak_tracked_task(monkeypatch):
+    orchestrator = make_orchestrator(SlowAgent())
+
+    def explode(task, concurrent=None):
+        raise RuntimeError('processing failed')
+
+    monkeypatch.setattr(orchestrator, '_process_task', explode)
+    with pytest.raises(RuntimeError):
+        orchestrator.delegate_task('create_frontend', {})
+    assert len(orchestrator.task_queue) == 0
+
+
+def test_dispatch_workers_default_to_max_workers():
+    assert AgentOrchestrator(max_workers=6).dispatch_workers == 6
+    assert AgentOrchestrator(max_workers=6, dispatch_workers=2).dispatch_workers == 2
+
+
+def test_submit_runs_tasks_in_parallel():
+    orchestrator = make_orchestrator(SlowAgent(0.2), max_workers=4)
+    started = time.monotonic()
+    handles = [orchestrator.submit('create_frontend', {}) for _ in range(4)]
+    assert all(h.result(timeout=5)['status'] == 'completed' for h in handles)
+    # Serial dispatch would take 0.8s
+    assert time.monotonic() - started < 0.6
+
+
+def test_submit_respects_priority_and_cancel():
+    orchestrator = make_orchestrator(SlowAgent(), dispatch_workers=1)
+    deferred = orchestrator.submit('create_frontend', {}, delay=5)
+    assert deferred.cancel()
+    assert deferred.status == 'cancelled'
+    assert orchestrator.submit('create_frontend', {}, priority=5).result(timeout=5)['status'] == 'completed'
+
+
+class CoroutineAgent:
+    name = 'FE'
+
+    async def create_frontend(self, name='Widget'):
+        return f"<{name} />"
+
+
+def test_async_timeout_does_not_count_queued_time():
+    orchestrator = make_orchestrator(SlowAgent(0.05), max_workers=4, agent_timeout=0.3)
+    requests = [{'task_type': 'create_frontend', 'task_data': {}} for _ in range(40)]
+    tasks = asyncio.run(orchestrator.delegate_many(requests))
+    assert [t['results']['FE']['status'] for t in tasks] == ['completed'] * 40
+    assert len(orchestrator.task_queue) == 0
+
+
+def test_async_timeout_applies_to_running_call():
+    orchestrator = make_orchestrator(SlowAgent(0.3), max_workers=1, agent_timeout=0.05)
+    task = asyncio.run(orchestrator.delegate_task_async('create_frontend', {}))
+    assert task['results']['FE']['status'] == 'timeout'
+
+
+def test_async_delegation_awaits_coroutine_agents():
+    orchestrator = make_orchestrator(CoroutineAgent())
+    task = asyncio.run(orchestrator.delegate_task_async('create_frontend', {'name': 'Nav'}))
+    assert task['results']['FE']['output'] == '<Nav />'
+
+
+def test_sync_delegation_of_coroutine_agent_inside_running_loop_fails_clearly():
+    orchestrator = make_orchestrator(CoroutineAgent())
+
+    async def from_loop():
+        return orchestrator.delegate_task('create_frontend', {})
+
+    task = asyncio.run(from_loop())
+    assert task['results']['FE']['status'] == 'failed'
+    assert 'delegate_task_async' in task['results']['FE']['error']
+    # Without a running loop the coroutine is simply run
+    assert orchestrator.delegate_task('create_frontend', {})['results']['FE']['output'] == '<Widget />'
+
+
+def test_async_dependency_cycle_untracks_task():
+    orchestrator = AgentOrchestrator(concurrent=True)
+    orchestrator.agents = {'FE': SlowAgent(), 'BE': SlowAgent()}
+    orchestrator.agent_dependencies['create_frontend'] = {'FE': ['BE'], 'BE': ['FE']}
+    orchestrator._create_task = lambda task_type, task_data: {
+        'id': 'T1', 'type': task_type, 'data': task_data, 'assigned_agents': ['FE', 'BE'],
+        'status': 'pending', 'results': {}
+    }
+    with pytest.raises(ValueError):
+        asyncio.run(orchestrator.delegate_task_async('create_frontend', {}))
+    assert len(orchestrator.task_queue) == 0
+
+
+class RecordingAgent:
+    def __init__(self, name, log, seconds=0.1):
+        self.name = name
+        self.log = log
+        self.seconds = seconds
+
+    def full_feature(self):
+        start = time.monotonic()
+        time.sleep(self.seconds)
+        self.log[self.name] = (start, time.monotonic())
+        return self.name
+
+
+def test_concurrent_task_runs_independent_agents_together_and_dependents_after():
+    log = {}
+    orchestrator = AgentOrchestrator(concurrent=True)
+    orchestrator.agents = {name: RecordingAgent(name, log) for name in ('FE', 'BE', 'AP', 'QA')}
+
+    started = time.monotonic()
+    task = orchestrator.delegate_task('full_feature', {})
+    assert all(r['status'] == 'completed' for r in task['results'].values())
+    # FE, BE and AP overlap; QA waits for all three
+    assert time.monotonic() - started < 0.35
+    assert log['QA'][0] >= max(log[name][1] for name in ('FE', 'BE', 'AP'))
+    assert task['timing']['critical_path'][-1] == 'QA'
+
+
+def test_history_is_bounded_but_counters_cover_every_task():
+    orchestrator = make_orchestrator(SlowAgent(), history_size=3)
+    for _ in range(4):
+        orchestrator.delegate_task('create_frontend', {})
+    orchestrator.agents['FE'] = SlowAgent(fail=True)
+    orchestrator.delegate_task('create_frontend', {})
+
+    status = orchestrator.generate_project_status()
+    assert len(orchestrator.completed_tasks) == 3
+    assert status['tasks_completed'] == 5
+    assert status['success_rate'] == 80.0
+    assert status['task_type_performance']['create_frontend']['tasks_completed'] == 5
+    assert status['agent_performance']['FE']['tasks_assigned'] == 5
@@ -0,0 +1,62 @@
+import json
+
+import pandas as pd
+import pytest
+
+from src.ai.quality import QualityScorer
+
+ANALYSIS = json.dumps({
+    'business_description': 'A family run plumbing company serving the metro area.',
+    'services': ['repairs'], 'target_market': 'homeowners', 'company_size': 'small',
+    'relevance_score': 80, 'recommendation': 'YES'
+})
+
+
+def test_json_template_is_scored_for_fields_and_format():
+    df = pd.DataFrame({
+        'tmpl': ['analyze_business', 'analyze_business', 'analyze_business'],
+        'model': ['gemini-1.5-pro'] * 3,
+        'response': [ANALYSIS, '```json\n' + ANALYSIS + '\n```', 'relevance_score: 80'],
+    })
+    scored = QualityScorer().score(df)
+
+    assert list(scored['completeness']) == [1.0, 1.0, pytest.approx(1 / 6)]
+    assert list(scored['format_compliance']) == [1.0, 1.0, 0.0]
+
+
+def test_empty_responses_score_zero():
+    df = pd.DataFrame({'tmpl': ['email_generation'], 'response': [None]})
+    scored = QualityScorer().score(df)
+    assert scored.loc[0, 'non_empty'] == 0.0
+    assert scored.loc[0, 'format_compliance'] == 0.0
+    assert scored.loc[0, 'completeness'] == 0.0
+
+
+def test_coherence_penalizes_fragments():
+    df = pd.DataFrame({'response': [
+        'This response has one full sentence of reasonable length.',
+        'Too short. Ok.',
+        'no sentence at all'
+    ]})
+    assert list(QualityScorer().score(df)['coherence']) == [0.8, 0.5, 0.0]
+
+
+def test_campaign_report_groups_a_log(tmp_path):
+    path = tmp_path / 'ai_calls.jsonl'
+    rows = [
+        {'tmpl': 'analyze_business', 'model': 'gemini-1.5-pro', 'response': ANALYSIS, 'cost': 0.01, 'ms': 900},
+        {'tmpl': 'analyze_business', 'model': 'gemini-1.5-flash', 'response': '', 'cost': 0.001, 'ms': 200},
+    ]
+    path.write_text(''.join(json.dumps(r) + '\n' for r in rows))
+
+    reports = QualityScorer().campaign_report(str(path))
+    assert reports['by_template'].loc['analyze_business', 'calls'] == 2
+    assert reports['by_model'].index[0] == 'gemini-1.5-flash'
+    assert reports['by_template'].loc['analyze_business', 'cost'] == pytest.approx(0.011)
+
+
+def test_log_without_response_text_is_rejected(tmp_path):
+    path = tmp_path / 'ai_calls.jsonl'
+    path.write_text(json.dumps({'tmpl': 'x', 'model': 'gpt-4'}) + '\n')
+    with pytest.raises(ValueError, match='AI_CALL_LOG_TEXT'):
+        QualityScorer().load_log(str(path))
@@ -0,0 +1,86 @@
+import multiprocessing
+import time
+
+import pytest
+
+from src.integrations.rate_limiter import RateLimiter, RateLimitTimeout, get_limiter
+
+
+def test_burst_is_immediate_then_refill_paces(tmp_path):
+    limiter = RateLimiter('svc', per_minute=1200, burst=5, state_dir=str(tmp_path))
+    assert sum(limiter.acquire() for _ in range(5)) == 0
+    # Refill is (1200 - 5) per minute, about 20 per second
+    waited = limiter.acquire()
+    assert 0.02 < waited < 0.1
+
+
+def test_timeout_raises_without_reserving(tmp_path):
+    limiter = RateLimiter('svc', per_minute=61, burst=1, state_dir=str(tmp_path))
+    limiter.acquire()
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire(timeout=0.1)
+    assert limiter.available() > -0.5
+
+
+def test_backoff_pushes_waiters_back(tmp_path):
+    limiter = RateLimiter('svc', per_minute=1200, burst=5, state_dir=str(tmp_path))
+    limiter.backoff(0.2)
+    started = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - started >= 0.2
+
+
+def test_limit_wraps_calls(tmp_path):
+    limiter = RateLimiter('svc', per_minute=600, burst=3, state_dir=str(tmp_path))
+    double = limiter.limit(lambda n: n * 2)
+    assert [double(n) for n in range(3)] == [0, 2, 4]
+    assert limiter.available() < 1
+
+
+def _take(state_dir, count):
+    limiter = RateLimiter('shared', per_minute=1200, burst=4, state_dir=state_dir)
+    for _ in range(count):
+        limiter.acquire()
+
+
+def test_processes_share_one_bucket(tmp_path):
+    started = time.monotonic()
+    workers = [multiprocessing.Process(target=_take, args=(str(tmp_path), 6)) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    # 12 tokens from a burst of 4 refilling ~19.9/s: the other 8 take about 0.4s
+    assert time.monotonic() - started >= 0.35
+
+
+def test_get_limiter_is_shared_per_service():
+    assert get_limiter('apify') is get_limiter('apify')
+
+
+
+def run_python(code, env):
+    import os
+    import subprocess
+    import sys
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return subprocess.run([sys.executable, '-c', code], cwd=root, env=env,
+                          capture_output=True, text=True, check=True).stdout.strip()
+
+
+def test_ap_agent_reads_its_limits_without_the_app_config():
+    import os
+
+    out = run_python("import sys; from agents.AP.agent import APAgent; "
+                     "print('src.config' in sys.modules, APAgent().api_configs['gemini']['rate_limit'])",
+                     dict(os.environ, GEMINI_RATE_LIMIT='7'))
+    assert out == 'False 7'
+
+
+def test_state_dir_defaults_to_the_temp_dir(tmp_path):
+    import os
+
+    env = {k: v for k, v in os.environ.items() if k != 'RATE_LIMIT_DIR'}
+    out = run_python('from src.config import Config; print(Config.RATE_LIMIT_DIR)', dict(env, TMPDIR=str(tmp_path)))
+    assert out == os.path.join(str(tmp_path), 'gb-ratelimits')
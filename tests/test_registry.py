@@ -0,0 +1,21 @@
+import pytest
+
+from agents.registry import AgentRegistry
+
+
+def test_agents_are_listed_without_importing_and_loaded_once(tmp_path):
+    registry = AgentRegistry(manifest_path=str(tmp_path / 'manifest.json'))
+    assert 'FE' in registry and len(registry) == len(list(registry))
+    assert registry.loaded() == []
+    assert registry.metadata('FE')['name'] == 'Front End Developer'
+
+    agent = registry['FE']
+    assert registry['FE'] is agent
+    assert registry.loaded() == ['FE']
+
+
+def test_unknown_agent_is_a_key_error(tmp_path):
+    registry = AgentRegistry(manifest_path=str(tmp_path / 'manifest.json'))
+    assert 'XX' not in registry
+    with pytest.raises(KeyError):
+        registry['XX']
@@ -0,0 +1,45 @@
+from agents.result_cache import ResultCache, is_pure, pure
+
+
+def test_pure_marks_methods():
+    @pure
+    def render(name):
+        return name
+
+    assert is_pure(render)
+    assert not is_pure(lambda: None)
+
+
+def test_hits_return_copies_and_argument_order_does_not_matter():
+    cache = ResultCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {'files': ['a.tsx']}
+
+    first = cache.get_or_call('FE', 'create_component', {'name': 'Card', 'props': 1}, compute)
+    first['files'].append('mutated')
+    second = cache.get_or_call('FE', 'create_component', {'props': 1, 'name': 'Card'}, compute)
+
+    assert second == {'files': ['a.tsx']}
+    assert len(calls) == 1
+    assert cache.stats()['hits'] == 1 and cache.stats()['hit_rate'] == 50.0
+
+
+def test_lru_eviction():
+    cache = ResultCache(max_entries=2)
+    for name in ('a', 'b'):
+        cache.get_or_call('FE', 'm', {'n': name}, lambda: name)
+    cache.get_or_call('FE', 'm', {'n': 'a'}, lambda: 'a')
+    cache.get_or_call('FE', 'm', {'n': 'c'}, lambda: 'c')
+
+    assert cache.stats()['evictions'] == 1
+    assert cache.get_or_call('FE', 'm', {'n': 'a'}, lambda: 'recomputed') == 'a'
+    assert cache.get_or_call('FE', 'm', {'n': 'b'}, lambda: 'recomputed') == 'recomputed'
+
+
+def test_unserializable_arguments_are_not_cached():
+    cache = ResultCache()
+    assert cache.get_or_call('FE', 'm', {'obj': object()}, lambda: 1) == 1
+    assert cache.stats() == dict(cache.stats(), entries=0, uncacheable=1)
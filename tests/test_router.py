@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.ai.instrumentation import AICallRecorder
+from src.ai.router import ModelRouter, PromptCache
+
+
+def test_select_model_prefers_cheapest_capable():
+    router = ModelRouter(recorder=AICallRecorder())
+    assert router.select_model('simple') == 'gemini-1.5-flash'
+    assert router.select_model('complex') in ('gpt-4', 'claude-3-opus')
+
+
+def test_models_restriction_keeps_choice_within_provider():
+    router = ModelRouter(recorder=AICallRecorder())
+    # 'complex' wants quality 4, which no Gemini model has: fall back to the strongest Gemini
+    assert router.select_model('complex', models=['gemini-1.5-flash', 'gemini-1.5-pro']) == 'gemini-1.5-pro'
+    with pytest.raises(ValueError):
+        router.select_model('simple', models=['not-a-model'])
+
+
+def test_call_uses_cache_on_repeat():
+    router = ModelRouter(models=['gemini-1.5-flash'], recorder=AICallRecorder())
+    calls = []
+
+    def call_fn(model, prompt):
+        calls.append(model)
+        return SimpleNamespace(text='ok')
+
+    first = router.call('hi', call_fn)
+    assert router.call('hi', call_fn) is first
+    assert calls == ['gemini-1.5-flash']
+    assert router.recorder.summary()['totals']['cache_hits'] == 1
+
+
+def test_observed_latency_replaces_prior():
+    recorder = AICallRecorder()
+    router = ModelRouter(models=['gemini-1.5-flash'], recorder=recorder)
+    recorder.record('gemini-1.5-flash', 'p', 100, 100, latency_ms=50.0)
+    assert router.expected_latency_ms('gemini-1.5-flash') == 50.0
+
+
+def test_close_detaches_from_recorder():
+    recorder = AICallRecorder()
+    router = ModelRouter(models=['gemini-1.5-flash'], recorder=recorder)
+    router.close()
+    recorder.record('gemini-1.5-flash', 'p', 100, 100, latency_ms=50.0)
+    assert router.model_stats()['gemini-1.5-flash']['observed_calls'] == 0
+
+
+def test_prompt_cache_evicts_lru_and_expires():
+    cache = PromptCache(max_entries=2, ttl_seconds=None)
+    for key in 'abc':
+        cache.put(key, key)
+    assert cache.get('a') is None and cache.get('c') == 'c'
+
+    expiring = PromptCache(ttl_seconds=0)
+    expiring.put('k', 'v')
+    assert expiring.get('k') is None
@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+from agents.scheduler import DAGScheduler
+
+
+def sleeper(seconds, value=None, fail=False):
+    def fn(inputs):
+        time.sleep(seconds)
+        if fail:
+            raise RuntimeError('node failed')
+        return value if value is not None else inputs
+    return fn
+
+
+def test_independent_nodes_run_in_parallel_and_pass_outputs():
+    nodes = {
+        'a': {'fn': sleeper(0.1, 'A')},
+        'b': {'fn': sleeper(0.1, 'B')},
+        'c': {'fn': lambda inputs: inputs, 'depends_on': ['a', 'b']},
+    }
+    started = time.monotonic()
+    run = DAGScheduler(max_workers=2).run(nodes)
+    assert time.monotonic() - started < 0.18
+    assert run['results']['c']['output'] == {'a': 'A', 'b': 'B'}
+    assert run['timing']['critical_path'][-1] == 'c'
+    assert run['timing']['sum_ms'] > run['timing']['wall_ms']
+
+
+def test_failures_skip_dependents_unless_configured():
+    nodes = {
+        'a': {'fn': sleeper(0, fail=True)},
+        'b': {'fn': sleeper(0, 'B'), 'depends_on': ['a']},
+    }
+    run = DAGScheduler().run(nodes)
+    assert run['results']['a'] == dict(run['results']['a'], status='failed', error='node failed')
+    assert run['results']['b']['status'] == 'skipped'
+
+    run = DAGScheduler(skip_dependents_on_failure=False).run(nodes)
+    assert run['results']['b']['output'] == 'B'
+
+
+def test_slow_node_times_out_and_releases_dependents():
+    nodes = {
+        'slow': {'fn': sleeper(0.5, 'late')},
+        'next': {'fn': sleeper(0, 'ran'), 'depends_on': ['slow']},
+    }
+    started = time.monotonic()
+    run = DAGScheduler(node_timeout=0.05, skip_dependents_on_failure=False).run(nodes)
+    assert time.monotonic() - started < 0.4
+    assert run['results']['slow']['status'] == 'timeout'
+    assert run['results']['next']['output'] == 'ran'
+
+
+def test_invalid_graphs_are_rejected():
+    with pytest.raises(ValueError, match='unknown nodes: x'):
+        DAGScheduler().run({'a': {'fn': sleeper(0), 'depends_on': ['x']}})
+    with pytest.raises(ValueError):
+        DAGScheduler().run({'a': {'fn': sleeper(0), 'depends_on': ['b']},
+                            'b': {'fn': sleeper(0), 'depends_on': ['a']}})
@@ -0,0 +1,67 @@
+import threading
+import time
+
+import pytest
+
+from src.pipeline.streaming import Stage, StreamingPipeline
+
+
+def test_items_flow_through_all_stages():
+    pipeline = StreamingPipeline([
+        Stage('split', lambda n: range(n), flat=True),
+        Stage('double', lambda n: n * 2, workers=3),
+        Stage('odd', lambda n: n if n % 4 else None)
+    ])
+    assert sorted(pipeline.iter([2, 3])) == [2, 2]
+    stats = pipeline.report()['stages']
+    assert stats['split']['items_out'] == 5
+    assert stats['odd']['done']
+
+
+def test_errors_are_counted_and_reported():
+    errors = []
+
+    def check(n):
+        if n == 2:
+            raise ValueError('bad item')
+        return n
+
+    pipeline = StreamingPipeline([Stage('check', check)], on_error=lambda *args: errors.append(args))
+    assert list(pipeline.iter([1, 2, 3])) == [1, 3]
+    assert pipeline.report()['stages']['check']['errors'] == 1
+    assert errors[0][:2] == ('check', 2)
+
+
+def test_source_errors_surface_after_draining():
+    def source():
+        yield 1
+        raise IOError('source broke')
+
+    pipeline = StreamingPipeline([Stage('id', lambda n: n)])
+    results = []
+    with pytest.raises(IOError):
+        for item in pipeline.iter(source()):
+            results.append(item)
+    assert results == [1]
+
+
+def test_slow_stage_applies_backpressure():
+    produced = []
+    lock = threading.Lock()
+
+    def source():
+        for n in range(50):
+            with lock:
+                produced.append(n)
+            yield n
+
+    pipeline = StreamingPipeline([
+        Stage('fast', lambda n: n, queue_size=2),
+        Stage('slow', lambda n: time.sleep(0.01) or n, queue_size=2)
+    ])
+    results = pipeline.iter(source())
+    next(results)
+    time.sleep(0.05)
+    # Only the queues' worth of items got ahead of the slow stage
+    assert len(produced) < 15
+    assert len(list(results)) == 49
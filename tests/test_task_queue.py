@@ -0,0 +1,62 @@
+import threading
+import time
+
+import pytest
+
+from agents.task_queue import TaskQueue
+
+
+def task(task_id):
+    return {'id': task_id}
+
+
+def test_priority_then_deadline_then_fifo():
+    queue = TaskQueue()
+    queue.push(task('low'), priority=0)
+    queue.push(task('late'), priority=5, deadline=time.time() + 60)
+    queue.push(task('soon'), priority=5, deadline=time.time() + 10)
+    queue.push(task('first-high'), priority=5)
+    queue.push(task('second-high'), priority=5)
+    order = [queue.pop(block=False)['task']['id'] for _ in range(5)]
+    # Tasks without a deadline sort after those with one at the same priority
+    assert order == ['soon', 'late', 'first-high', 'second-high', 'low']
+
+
+def test_deferred_task_waits_for_its_start_time():
+    queue = TaskQueue()
+    queue.push(task('later'), run_at=time.time() + 0.1)
+    assert queue.pop(block=False) is None
+    started = time.monotonic()
+    assert queue.pop(timeout=1)['task']['id'] == 'later'
+    assert time.monotonic() - started >= 0.08
+
+
+def test_removed_task_is_never_popped():
+    queue = TaskQueue()
+    for n in range(100):
+        queue.push(task(n))
+    for n in range(99):
+        assert queue.remove(n)
+    assert not queue.remove(0)
+    assert len(queue) == 1
+    assert queue.pop(block=False)['task']['id'] == 99
+
+
+def test_tracked_tasks_count_but_are_not_popped():
+    queue = TaskQueue()
+    queue.track(task('inline'))
+    assert 'inline' in queue and len(queue) == 1
+    assert queue.pop(block=False) is None
+    with pytest.raises(ValueError):
+        queue.push(task('inline'))
+
+
+def test_blocked_pop_wakes_on_push():
+    queue = TaskQueue()
+    popped = []
+    consumer = threading.Thread(target=lambda: popped.append(queue.pop(timeout=2)))
+    consumer.start()
+    time.sleep(0.05)
+    queue.push(task('new'), extra_field=1)
+    consumer.join(1)
+    assert popped[0]['task']['id'] == 'new' and popped[0]['extra_field'] == 1
@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+
+import pytest
+
+from agents.templates import Template, TemplateError, TemplateRegistry
+
+
+@pytest.mark.parametrize('source, params', [
+    ('export function {name}() {{ return <div /> }}', {'name': 'Card'}),
+    ('{user.name} has {items[0]} and {count:>4}', {'user': SimpleNamespace(name='Ada'),
+                                                  'items': ['one'], 'count': 7}),
+    ('{value!r} {value}', {'value': 'x'}),
+    ('no placeholders', {}),
+])
+def test_render_matches_str_format(source, params):
+    assert Template(source).render(**params) == source.format(**params)
+
+
+def test_render_checks_parameters():
+    template = Template('{a}{b}', name='pair')
+    with pytest.raises(TemplateError, match='missing b; unexpected c'):
+        template.render(a=1, c=2)
+    assert template.render_many([{'a': 1, 'b': 2}, {'a': 3, 'b': 4}]) == ['12', '34']
+
+
+@pytest.mark.parametrize('source', ['{}', '{0}', '{a:{width}}', '{a'])
+def test_unsupported_templates_are_rejected(source):
+    with pytest.raises(TemplateError):
+        Template(source)
+
+
+def test_registry_allows_identical_reregistration_only():
+    registry = TemplateRegistry()
+    first = registry.register('component', '<{name} />', fields=['name'])
+    assert registry.register('component', '<{name} />') is first
+    with pytest.raises(TemplateError):
+        registry.register('component', '<{other} />')
+    with pytest.raises(TemplateError, match="don't match"):
+        registry.register('page', '{title}', fields=['name'])
+    assert registry.render('component', name='Card') == '<Card />'
+    assert registry.names() == ['component']
+    with pytest.raises(TemplateError):
+        registry.get('missing')
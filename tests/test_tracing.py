@@ -0,0 +1,48 @@
+import json
+import time
+
+import pytest
+
+from agents.tracing import AgentTracer
+
+TASK = {'id': 'T1', 'type': 'create_frontend'}
+
+
+def test_spans_record_timing_and_feed_percentiles():
+    tracer = AgentTracer()
+    for seconds in (0.01, 0.02, 0.03):
+        with tracer.span('FE', 'create_component', TASK):
+            time.sleep(seconds)
+
+    span = tracer.spans[-1]
+    assert span['trace_id'] == 'T1' and span['status'] == 'completed'
+    assert span['wall_ms'] >= 30 and span['cpu_ms'] is not None
+
+    stats = tracer.percentiles('method')['FE.create_component']
+    assert stats['count'] == 3
+    assert stats['p50_ms'] <= stats['p90_ms'] <= stats['max_ms']
+
+
+def test_errors_are_recorded_and_reraised():
+    tracer = AgentTracer()
+    with pytest.raises(ValueError):
+        with tracer.span('BE', 'create_api_endpoint', TASK):
+            raise ValueError('bad route')
+    assert tracer.spans[-1]['exception'] == 'ValueError'
+    assert tracer.percentiles('agent')['BE']['errors'] == 1
+
+
+def test_hooks_and_export(tmp_path):
+    path = tmp_path / 'spans.jsonl'
+    tracer = AgentTracer(export_path=str(path))
+    seen = []
+    tracer.add_hook(pre=lambda span: seen.append(('pre', span['agent'])),
+                    post=lambda span: seen.append(('post', span['status'])))
+    with tracer.span('QA', 'run_tests', TASK, measure_cpu=False):
+        pass
+
+    assert seen == [('pre', 'QA'), ('post', 'completed')]
+    assert json.loads(path.read_text())['cpu_ms'] is None
+    assert tracer.export_jsonl(str(tmp_path / 'all.jsonl')) == 1
+    tracer.reset()
+    assert tracer.percentiles() == {}
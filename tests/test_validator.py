@@ -0,0 +1,100 @@
+import importlib
+import sys
+import types
+from types import SimpleNamespace
+
+import pytest
+
+from src.ai.instrumentation import AICallRecorder
+from src.ai.router import ModelRouter
+from src.integrations.rate_limiter import RateLimiter
+
+
+class FakeModel:
+    """Stands in for genai.GenerativeModel; replies with whatever the test queued"""
+
+    replies = []
+
+    def __init__(self, name):
+        self.name = name
+
+    def generate_content(self, prompt):
+        reply = FakeModel.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return SimpleNamespace(text=reply)
+
+
+class ResourceExhausted(Exception):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def validator_module(monkeypatch):
+    """Import src.ai.validator against a stub Gemini SDK, so it runs without google-generativeai"""
+    genai = types.ModuleType('google.generativeai')
+    genai.configure = lambda **kwargs: None
+    genai.GenerativeModel = FakeModel
+    exceptions = types.ModuleType('google.api_core.exceptions')
+    exceptions.ResourceExhausted = ResourceExhausted
+    api_core = types.ModuleType('google.api_core')
+    api_core.exceptions = exceptions
+    google = types.ModuleType('google')
+    google.generativeai = genai
+    google.api_core = api_core
+    for name, module in [('google', google), ('google.generativeai', genai),
+                         ('google.api_core', api_core), ('google.api_core.exceptions', exceptions)]:
+        monkeypatch.setitem(sys.modules, name, module)
+    monkeypatch.delitem(sys.modules, 'src.ai.validator', raising=False)
+    FakeModel.replies = []
+    module = importlib.import_module('src.ai.validator')
+    yield module
+    sys.modules.pop('src.ai.validator', None)
+
+
+@pytest.fixture
+def limiter(tmp_path):
+    return RateLimiter('gemini-test', per_minute=6000, state_dir=str(tmp_path))
+
+
+def test_router_is_restricted_to_gemini_models(validator_module, limiter):
+    router = ModelRouter(recorder=AICallRecorder())
+    validator = validator_module.LeadValidator(recorder=router.recorder, router=router,
+                                               task_complexity='complex', limiter=limiter)
+    assert validator.router_models == ['gemini-1.5-flash', 'gemini-1.5-pro']
+
+
+def test_router_without_gemini_models_is_rejected(validator_module, limiter):
+    with pytest.raises(ValueError):
+        validator_module.LeadValidator(router=ModelRouter(models=['gpt-4'], recorder=AICallRecorder()),
+                                       limiter=limiter)
+
+
+def test_limiter_can_be_injected(validator_module, limiter):
+    assert validator_module.LeadValidator(limiter=limiter).limiter is limiter
+
+
+def test_analysis_is_parsed_from_the_reply(validator_module, limiter):
+    FakeModel.replies = ['Sure: {"relevance_score": 80, "recommendation": "YES"}']
+    validator = validator_module.LeadValidator(recorder=AICallRecorder(), limiter=limiter)
+    analysis = validator.analyze_business({'business_name': 'Acme'}, {})
+    assert analysis == {'relevance_score': 80, 'recommendation': 'YES'}
+
+
+def test_complex_tasks_route_to_a_gemini_model(validator_module, limiter):
+    FakeModel.replies = ['{"relevance_score": 55}']
+    router = ModelRouter(recorder=AICallRecorder())
+    validator = validator_module.LeadValidator(recorder=router.recorder, router=router,
+                                               task_complexity='complex', limiter=limiter)
+    assert validator.analyze_business({'business_name': 'Acme'}, {})['relevance_score'] == 55
+    assert set(validator._models) <= {'gemini-1.5-flash', 'gemini-1.5-pro'}
+
+
+def test_rate_limited_reply_backs_off_the_shared_limiter(validator_module, limiter, monkeypatch):
+    backoffs = []
+    monkeypatch.setattr(limiter, 'backoff', backoffs.append)
+    FakeModel.replies = [ResourceExhausted('429')]
+    validator = validator_module.LeadValidator(recorder=AICallRecorder(), limiter=limiter)
+    analysis = validator.analyze_business({'business_name': 'Acme'}, {})
+    assert analysis['error'] == '429'
+    assert backoffs == [10]